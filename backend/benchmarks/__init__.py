@@ -0,0 +1,4 @@
+"""
+Performance Benchmarks
+Run individual benchmarks from backend/, e.g. python -m benchmarks.bench_preamble_format
+"""
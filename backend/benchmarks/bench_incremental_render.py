@@ -0,0 +1,53 @@
+"""
+Incremental Render Benchmark
+Compares a full re-render with the section-level regenerate_latex after editing
+the bullets of a single experience
+
+Usage (from backend/): python -m benchmarks.bench_incremental_render [experiences] [renders]
+"""
+
+import sys
+import copy
+
+from services.latex_generator import RESUME_GENERATORS
+from benchmarks.sample_data import make_profile, make_tailored_content
+from benchmarks.bench_template_render import time_per_call
+
+
+def main(experiences: int, renders: int) -> None:
+    profile = make_profile(experiences=experiences)
+    profile["updatedAt"] = "2026-01-01T00:00:00"
+    tailored = make_tailored_content(profile)
+
+    edited = copy.deepcopy(tailored)
+    edited["tailored_experience"][0]["tailored_bullets"] = ["Rewrote the ingestion service in 40% fewer lines"]
+
+    for template_id, generator_class in sorted(RESUME_GENERATORS.items()):
+        generator = generator_class()
+        previous_version = {
+            "latexContent": generator.generate_latex(profile, tailored),
+            "tailoredData": tailored,
+            "templateId": template_id,
+            "profileUpdatedAt": profile["updatedAt"],
+        }
+
+        full = lambda: generator.generate_latex(profile, edited)
+        incremental = lambda: generator.regenerate_latex(profile, edited, previous_version)
+
+        if full() != incremental():
+            print(f"{template_id}: outputs differ; incremental render is not equivalent")
+            sys.exit(1)
+
+        full_time = time_per_call(full, renders)
+        incremental_time = time_per_call(incremental, renders)
+        print(
+            f"{template_id:<10} {experiences} experiences  full {full_time * 1e6:8.1f} us  "
+            f"incremental {incremental_time * 1e6:8.1f} us  ({full_time / incremental_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    )
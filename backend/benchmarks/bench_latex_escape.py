@@ -0,0 +1,80 @@
+"""
+LaTeX Escaping Benchmark
+Checks the table-driven escaper against the previous chained str.replace
+escaper on randomized input, then compares their throughput
+
+Usage (from backend/): python -m benchmarks.bench_latex_escape [cases]
+"""
+
+import sys
+import time
+import random
+import string
+from typing import Callable, List
+
+from services.latex_escape import LATEX_ESCAPES, escape_latex, escape_latex_batch
+from benchmarks.sample_data import make_profile
+
+# Characters random cases are drawn from: every special character, plus
+# plain text, whitespace, the batch separator and some non-ASCII
+ALPHABET = "".join(LATEX_ESCAPES) + string.ascii_letters + string.digits + " \n\t\0éü—•"
+
+
+def legacy_escape_latex(text: str) -> str:
+    """The previous escaper: backslash first, then one str.replace per character"""
+    if not text:
+        return ''
+    text = text.replace('\\', r'\textbackslash{}')
+    for char in '&%$#_{}~^':
+        text = text.replace(char, LATEX_ESCAPES[char])
+    return text
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+
+
+def check_equivalence(cases: int) -> None:
+    """Property check: single and batch output equal the legacy output"""
+    rng = random.Random(14)
+    for _ in range(cases):
+        texts = [random_text(rng) for _ in range(rng.randint(0, 8))]
+        expected = [legacy_escape_latex(text) for text in texts]
+        for text, escaped in zip(texts, expected):
+            assert escape_latex(text) == escaped, repr(text)
+        assert escape_latex_batch(texts) == expected, repr(texts)
+    print(f"Equivalent to the legacy escaper on {cases} random batches")
+
+
+def throughput(fn: Callable[[List[str]], List[str]], texts: List[str], seconds: float = 1.0) -> float:
+    """Strings escaped per second"""
+    rounds = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(texts)
+        rounds += 1
+    return rounds * len(texts) / (time.perf_counter() - start)
+
+
+def main(cases: int) -> None:
+    check_equivalence(cases)
+
+    profile = make_profile(experiences=10, bullets=10)
+    texts = [
+        bullet
+        for experience in profile["workExperience"]
+        for bullet in experience["responsibilities"]
+    ] + [skill["name"] for skill in profile["skills"]]
+
+    legacy = throughput(lambda batch: [legacy_escape_latex(text) for text in batch], texts)
+    single = throughput(lambda batch: [escape_latex(text) for text in batch], texts)
+    batched = throughput(escape_latex_batch, texts)
+
+    print(f"{len(texts)} profile strings")
+    print(f"legacy    {legacy:12,.0f} strings/s")
+    print(f"single    {single:12,.0f} strings/s  ({single / legacy:.2f}x)")
+    print(f"batch     {batched:12,.0f} strings/s  ({batched / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,78 @@
+"""
+Preamble Format Benchmark
+Compares pdflatex compile latency and CPU time with and without the
+precompiled template preamble formats
+
+Usage (from backend/): python -m benchmarks.bench_preamble_format [runs]
+"""
+
+import sys
+import time
+import asyncio
+import resource
+import statistics
+import tempfile
+from pathlib import Path
+
+from services.latex_generator import LaTeXResumeGenerator
+from services.latex_local_compiler import LaTeXLocalCompiler
+from services.latex_formats import get_format_store
+from benchmarks.sample_data import make_profile, make_tailored_content
+
+
+def children_cpu_seconds() -> float:
+    """CPU time consumed by finished child processes"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def time_compiles(compiler: LaTeXLocalCompiler, latex_source: str, runs: int):
+    """Compile latex_source sequentially, returning wall and CPU seconds per run"""
+    wall, cpu = [], []
+    for _ in range(runs):
+        cpu_start = children_cpu_seconds()
+        start = time.perf_counter()
+        await compiler.compile_to_pdf(latex_source)
+        wall.append(time.perf_counter() - start)
+        cpu.append(children_cpu_seconds() - cpu_start)
+    return wall, cpu
+
+
+def report(label: str, wall, cpu) -> None:
+    print(
+        f"{label:<12} wall median {statistics.median(wall) * 1000:7.1f} ms"
+        f"  min {min(wall) * 1000:7.1f} ms"
+        f"  cpu median {statistics.median(cpu) * 1000:7.1f} ms"
+    )
+
+
+async def main(runs: int) -> None:
+    profile = make_profile()
+    latex_source = LaTeXResumeGenerator().generate_latex(profile, make_tailored_content(profile))
+    compiler = LaTeXLocalCompiler()
+
+    # Point the store at a scratch directory so no existing format is reused
+    format_store = get_format_store()
+    format_store.format_dir = Path(tempfile.mkdtemp(prefix="bench_formats_"))
+    format_store._formats.clear()
+
+    cold = await time_compiles(compiler, latex_source, runs)
+
+    start = time.perf_counter()
+    await compiler.build_formats([LaTeXResumeGenerator().template_path])
+    print(f"Format build took {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if format_store.lookup(latex_source) is None:
+        print("Format was not built; is mylatexformat installed?")
+        return
+
+    preloaded = await time_compiles(compiler, latex_source, runs)
+
+    report("cold", *cold)
+    report("preloaded", *preloaded)
+    speedup = statistics.median(cold[0]) / statistics.median(preloaded[0])
+    print(f"Median wall-time speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
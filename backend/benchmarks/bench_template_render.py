@@ -0,0 +1,74 @@
+"""
+Template Render Benchmark
+Compares per-render time and peak allocation of the compiled template render plan
+against the previous read-the-file-and-replace-each-placeholder approach
+
+Usage (from backend/): python -m benchmarks.bench_template_render [renders]
+"""
+
+import sys
+import time
+import statistics
+import tracemalloc
+from typing import Callable, Dict
+
+from services.latex_generator import LaTeXResumeGenerator
+from benchmarks.sample_data import make_profile, make_tailored_content
+
+
+def legacy_render(template_path: str, values: Dict[str, str]) -> str:
+    """The previous approach: read the template, then one str.replace per placeholder"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        latex_content = f.read()
+    for name, value in values.items():
+        latex_content = latex_content.replace('{{' + name + '}}', value)
+    return latex_content
+
+
+def time_per_call(fn: Callable[[], str], renders: int) -> float:
+    """Median seconds per call over `renders` calls, in batches of 100"""
+    batches = []
+    for _ in range(max(renders // 100, 1)):
+        start = time.perf_counter()
+        for _ in range(100):
+            fn()
+        batches.append((time.perf_counter() - start) / 100)
+    return statistics.median(batches)
+
+
+def peak_allocation(fn: Callable[[], str]) -> int:
+    """Peak memory traced while making one call, in bytes"""
+    fn()  # warm up caches outside the trace
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(label: str, seconds: float, peak: int) -> None:
+    print(f"{label:<10} {seconds * 1e6:8.1f} us/render  peak allocation {peak / 1024:7.1f} KiB")
+
+
+def main(renders: int) -> None:
+    generator = LaTeXResumeGenerator()
+    profile = make_profile()
+    values = generator._template_values(profile, make_tailored_content(profile))
+
+    legacy = lambda: legacy_render(generator.template_path, values)
+    compiled = lambda: generator.template.render(values)
+
+    if legacy() != compiled():
+        print("Outputs differ; compiled template is not equivalent")
+        sys.exit(1)
+
+    print(f"Template {generator.template_path} ({len(compiled())} chars, {len(values)} placeholders)")
+    results = {}
+    for label, fn in (("legacy", legacy), ("compiled", compiled)):
+        results[label] = time_per_call(fn, renders)
+        report(label, results[label], peak_allocation(fn))
+    print(f"Render speedup: {results['legacy'] / results['compiled']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,80 @@
+"""
+Synthetic Benchmark Data
+Builds master profiles and tailored content shaped like the real documents
+"""
+
+from typing import Dict, Any
+
+
+def make_profile(experiences: int = 4, bullets: int = 5) -> Dict[str, Any]:
+    """
+    Build a synthetic master profile.
+
+    Args:
+        experiences: Number of work experience entries
+        bullets: Number of responsibilities per experience
+
+    Returns:
+        Master profile dictionary
+    """
+    return {
+        "userId": "bench_user",
+        "personalInfo": {
+            "firstName": "Ada",
+            "lastName": "Lovelace",
+            "email": "ada@example.com",
+            "phone": "+1 555 0100",
+            "location": {"city": "Toronto", "country": "Canada"},
+            "linkedinUrl": "https://linkedin.com/in/ada_lovelace",
+            "portfolioUrl": "https://example.com/~ada"
+        },
+        "professionalHeadline": "Senior Software Engineer",
+        "summary": "Engineer with 10+ years building data & ML platforms at 100% uptime.",
+        "workExperience": [
+            {
+                "jobTitle": f"Software Engineer {i}",
+                "companyName": f"Company #{i} & Sons",
+                "location": "Remote",
+                "startDate": "2018-01",
+                "endDate": "2021-06",
+                "responsibilities": [
+                    f"Cut p99 latency by {10 + j}% for service_{j} using C++ & {{templates}}"
+                    for j in range(bullets)
+                ],
+                "achievements": [],
+                "technologies": ["Python", "Go", "Kubernetes"]
+            }
+            for i in range(experiences)
+        ],
+        "education": [
+            {
+                "institution": "University of London",
+                "degree": "BSc",
+                "fieldOfStudy": "Mathematics",
+                "location": "London, UK",
+                "startYear": "2008",
+                "endYear": "2012"
+            }
+        ],
+        "skills": [{"name": name, "level": ""} for name in ["Python", "C#", "SQL", "AWS", "R&D"]],
+        "certifications": [
+            {"name": "AWS Solutions Architect", "issuingOrganization": "Amazon", "issueYear": "2020"}
+        ]
+    }
+
+
+def make_tailored_content(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Build AI-tailored content matching the experiences of a profile"""
+    return {
+        "tailored_summary": "Platform engineer who ships reliable, cost-efficient ML infrastructure.",
+        "tailored_experience": [
+            {
+                "jobTitle": exp["jobTitle"],
+                "companyName": exp["companyName"],
+                "tailored_bullets": [f"Led {bullet}" for bullet in exp["responsibilities"]]
+            }
+            for exp in profile["workExperience"]
+        ],
+        "keyword_matches": ["Python", "Kubernetes", "ML"],
+        "recommendations": ""
+    }
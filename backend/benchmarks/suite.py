@@ -0,0 +1,329 @@
+"""
+Resume Generation Benchmark Suite
+Times the resume generation hot path on synthetic profiles from small to
+pathological and compares the results against stored baselines
+
+Usage (from backend/):
+    python -m benchmarks.suite                 run everything, compare with baselines.json
+    python -m benchmarks.suite -k escape       only cases whose name contains "escape"
+    python -m benchmarks.suite --sizes small,large
+    python -m benchmarks.suite --save          run and store the results as the new baselines
+
+The compile_to_pdf cases need pdflatex and are skipped without it. Timings
+depend on the machine: refresh the baselines with --save on the reference
+machine when a change is expected to move them, and commit baselines.json
+with the change so the shift shows up in review.
+"""
+
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from services.ai_provider import TailoredResume
+from services.ats_score import calculate_resume_ats_score, calculate_cover_letter_ats_score
+from services.claude_provider import ClaudeProvider
+from services.openai_provider import OpenAIProvider
+from services.latex_generator import LaTeXResumeGenerator
+from services.latex_local_compiler import LaTeXLocalCompiler
+from services.html_preview import HTMLPreviewRenderer
+from services.json_stream import JSONObjectStream
+from services.resume_sections import ResumeSections
+from benchmarks.sample_data import make_profile, make_tailored_content
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+
+# Profile shapes: (experiences, bullets per experience)
+SIZES: Dict[str, Tuple[int, int]] = {
+    "small": (2, 3),
+    "medium": (6, 5),
+    "large": (40, 8),
+    "pathological": (300, 12),
+}
+
+JOB_DESCRIPTION = (
+    "We are hiring a Senior Platform Engineer to build reliable ML infrastructure. "
+    "You will own Python & Go services on Kubernetes, drive p99 latency down, "
+    "and mentor engineers. 5+ years of experience with AWS, SQL and CI/CD required.\n"
+) * 20
+
+COVER_LETTER = (
+    "I am excited to apply for the Senior Platform Engineer role.\n\n"
+    "Over the past decade I have built data & ML platforms that serve millions of requests "
+    "a day, cutting p99 latency by 40% and infrastructure spend by a third.\n\n"
+    "I would welcome the chance to bring that experience to your team."
+)
+
+
+class Fixture(NamedTuple):
+    """Synthetic inputs for one profile size"""
+    profile: Dict[str, Any]
+    tailored_content: Dict[str, Any]
+    tailored_resume: TailoredResume
+    claude_response: Dict[str, Any]
+    openai_response: Dict[str, Any]
+
+
+class Case(NamedTuple):
+    """A benchmark: builds the timed call for a fixture"""
+    name: str
+    setup: Callable[[Fixture], Callable[[], Any]]
+    # Upper bound on rounds, for cases too slow to repeat many times
+    max_rounds: Optional[int] = None
+    available: Callable[[], bool] = lambda: True
+
+
+def make_fixture(experiences: int, bullets: int) -> Fixture:
+    """Build the profile, tailored content and raw AI responses for a size"""
+    profile = make_profile(experiences=experiences, bullets=bullets)
+    tailored_content = make_tailored_content(profile)
+    response_json = json.dumps(tailored_content, indent=2)
+    return Fixture(
+        profile=profile,
+        tailored_content=tailored_content,
+        tailored_resume=TailoredResume(**tailored_content),
+        # Claude tends to wrap the JSON in a markdown code block
+        claude_response={"content": [{"type": "text", "text": f"```json\n{response_json}\n```"}]},
+        openai_response={"choices": [{"message": {"content": response_json}}]},
+    )
+
+
+def _generate(template_id: str) -> Callable[[Fixture], Callable[[], Any]]:
+    def setup(fixture: Fixture) -> Callable[[], Any]:
+        generator = LaTeXResumeGenerator.for_template(template_id)
+        return lambda: generator.generate_latex(fixture.profile, fixture.tailored_content)
+    return setup
+
+
+def _preview_html(fixture: Fixture) -> Callable[[], Any]:
+    renderer = HTMLPreviewRenderer()
+    return lambda: renderer.render(ResumeSections.from_profile(fixture.profile, fixture.tailored_content))
+
+
+def _escape(fixture: Fixture) -> Callable[[], Any]:
+    generator = LaTeXResumeGenerator()
+    texts = [
+        bullet
+        for exp in fixture.tailored_content["tailored_experience"]
+        for bullet in exp["tailored_bullets"]
+    ]
+    return lambda: [generator._escape_latex(text) for text in texts]
+
+
+def _ats_scores(fixture: Fixture) -> Callable[[], Any]:
+    def run():
+        calculate_resume_ats_score(fixture.tailored_resume, fixture.profile)
+        calculate_cover_letter_ats_score(fixture.tailored_resume, COVER_LETTER)
+    return run
+
+
+def _tailoring_prompt(provider_class) -> Callable[[Fixture], Callable[[], Any]]:
+    def setup(fixture: Fixture) -> Callable[[], Any]:
+        provider = provider_class("bench-key")
+        return lambda: provider._build_tailoring_prompt(
+            fixture.profile, JOB_DESCRIPTION, "Acme Corp", "Senior Platform Engineer"
+        )
+    return setup
+
+
+def _combined_prompt(provider_class) -> Callable[[Fixture], Callable[[], Any]]:
+    def setup(fixture: Fixture) -> Callable[[], Any]:
+        provider = provider_class("bench-key")
+        return lambda: provider._build_tailoring_prompt(
+            fixture.profile, JOB_DESCRIPTION, "Acme Corp", "Senior Platform Engineer",
+            with_cover_letter=True
+        )
+    return setup
+
+
+def _cover_letter_prompt(provider_class) -> Callable[[Fixture], Callable[[], Any]]:
+    def setup(fixture: Fixture) -> Callable[[], Any]:
+        provider = provider_class("bench-key")
+        return lambda: provider._build_cover_letter_prompt(
+            fixture.profile, JOB_DESCRIPTION, "Acme Corp", "Senior Platform Engineer",
+            fixture.tailored_resume
+        )
+    return setup
+
+
+def _parse_response(provider_class, field: str) -> Callable[[Fixture], Callable[[], Any]]:
+    def setup(fixture: Fixture) -> Callable[[], Any]:
+        provider = provider_class("bench-key")
+        response = getattr(fixture, field)
+        return lambda: provider._parse_tailoring_response(response)
+    return setup
+
+
+def _stream_parse(fixture: Fixture) -> Callable[[], Any]:
+    # Streaming APIs send a few tokens per event
+    text = fixture.claude_response["content"][0]["text"]
+    chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+
+    def run():
+        parser = JSONObjectStream()
+        for chunk in chunks:
+            parser.feed(chunk)
+    return run
+
+
+def _compile(fixture: Fixture) -> Callable[[], Any]:
+    compiler = LaTeXLocalCompiler()
+    latex_source = LaTeXResumeGenerator().generate_latex(fixture.profile, fixture.tailored_content)
+    return lambda: asyncio.run(compiler.compile_to_pdf(latex_source))
+
+
+CASES: List[Case] = [
+    Case("generate_latex/template1", _generate("template1")),
+    Case("generate_latex/template2", _generate("template2")),
+    Case("preview_html", _preview_html),
+    Case("escape_latex/bullets", _escape),
+    Case("ats_scores", _ats_scores),
+    Case("prompt/claude_tailoring", _tailoring_prompt(ClaudeProvider)),
+    Case("prompt/claude_cover_letter", _cover_letter_prompt(ClaudeProvider)),
+    Case("prompt/claude_combined", _combined_prompt(ClaudeProvider)),
+    Case("prompt/openai_tailoring", _tailoring_prompt(OpenAIProvider)),
+    Case("prompt/openai_cover_letter", _cover_letter_prompt(OpenAIProvider)),
+    Case("prompt/openai_combined", _combined_prompt(OpenAIProvider)),
+    Case("parse/claude_tailoring", _parse_response(ClaudeProvider, "claude_response")),
+    Case("parse/openai_tailoring", _parse_response(OpenAIProvider, "openai_response")),
+    Case("parse/json_stream", _stream_parse),
+    Case("compile_to_pdf", _compile, max_rounds=3, available=lambda: shutil.which("pdflatex") is not None),
+]
+
+
+def measure(fn: Callable[[], Any], rounds: int, min_round_time: float) -> Dict[str, float]:
+    """
+    Time fn like pytest-benchmark: calibrate the iterations per round so a
+    round takes at least min_round_time, then time `rounds` rounds.
+
+    Returns:
+        Per-call seconds: min, median, mean and stddev over the rounds
+    """
+    fn()  # warm up caches (templates, formats) outside the timed rounds
+
+    # Double the batch until one batch takes min_round_time
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        if time.perf_counter() - start >= min_round_time:
+            break
+        iterations *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        per_call.append((time.perf_counter() - start) / iterations)
+
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.mean(per_call),
+        "stddev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": iterations,
+    }
+
+
+def load_baselines() -> Dict[str, Dict[str, float]]:
+    """Stored results by benchmark id, or {} if none were saved"""
+    if not BASELINE_FILE.exists():
+        return {}
+    return json.loads(BASELINE_FILE.read_text(encoding='utf-8')).get("results", {})
+
+
+def save_baselines(results: Dict[str, Dict[str, float]]) -> None:
+    """Store results (merged over the existing baselines) in baselines.json"""
+    merged = {**load_baselines(), **results}
+    BASELINE_FILE.write_text(json.dumps({
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "system": f"{platform.system()} {platform.machine()}",
+        },
+        "results": {key: merged[key] for key in sorted(merged)},
+    }, indent=2) + "\n", encoding='utf-8')
+    print(f"Saved {len(results)} results to {BASELINE_FILE}")
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.2f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.1f} us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resume generation benchmark suite")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated profile sizes")
+    parser.add_argument("--rounds", type=int, default=15, help="timed rounds per case")
+    parser.add_argument("--min-round-time", type=float, default=0.02, help="minimum seconds per round")
+    parser.add_argument("--compare", choices=("min", "median", "mean"), default="min",
+                        help="statistic compared against the baseline (min is the least noisy)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown against the baseline that counts as a regression")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    args = parser.parse_args()
+
+    # The services log every generation and compile at INFO
+    logging.disable(logging.INFO)
+
+    sizes = [size for size in args.sizes.split(",") if size]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)} (choose from {', '.join(SIZES)})")
+
+    baselines = load_baselines()
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+
+    print(f"{'benchmark':<44} {'median':>11} {'min':>11} {'stddev':>11}  vs baseline")
+    for size in sizes:
+        fixture = make_fixture(*SIZES[size])
+        for case in CASES:
+            if args.pattern not in case.name:
+                continue
+            benchmark_id = f"{case.name}[{size}]"
+            if not case.available():
+                print(f"{benchmark_id:<44} skipped (unavailable here)")
+                continue
+
+            rounds = min(args.rounds, case.max_rounds or args.rounds)
+            result = measure(case.setup(fixture), rounds, args.min_round_time)
+            results[benchmark_id] = result
+
+            comparison = ""
+            baseline = baselines.get(benchmark_id)
+            if baseline:
+                change = result[args.compare] / baseline[args.compare] - 1
+                comparison = f"{change:+7.1%}"
+                if change > args.threshold:
+                    comparison += "  REGRESSION"
+                    regressions.append(benchmark_id)
+
+            print(
+                f"{benchmark_id:<44} {format_seconds(result['median'])} {format_seconds(result['min'])} "
+                f"{format_seconds(result['stddev'])}  {comparison}"
+            )
+
+    if args.save:
+        save_baselines(results)
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@ AI-powered resume and cover letter generation
 """
 
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any
 import os
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -19,12 +21,33 @@ from auth import verify_clerk_token  # Import authentication
 
 # Import AI services
 from services.ai_factory import AIProviderFactory
+from services.ai_cache import CachedAIProvider
+from services.ai_resilience import FailoverAIProvider
+from services.latex_local_compiler import LaTeXLocalCompiler
+from services.compile_scheduler import get_compile_scheduler
+from services.compile_metrics import get_compile_metrics
+from services.ai_usage import get_ai_usage_metrics
+from services.latex_workspace import close_workspace_pool
+from services.template_registry import get_template_registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def precompile_latex_formats():
+    """Build preamble formats for all LaTeX templates (runs in the background)"""
+    try:
+        compiler = LaTeXLocalCompiler()
+    except Exception as e:
+        logger.warning(f"Skipping LaTeX format precompilation: {str(e)}")
+        return
+
+    registry = get_template_registry()
+    templates = [str(registry.path(template_id)) for template_id in registry.template_ids()]
+    await compiler.build_formats(templates)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
@@ -51,11 +74,36 @@ async def lifespan(app: FastAPI):
         print("⚠ AI provider validation failed - check configuration")
         print("  Resume generation will use fallback mode")
 
+    # TTL and eviction indexes for the AI response cache
+    try:
+        provider = AIProviderFactory.get_provider()
+        if isinstance(provider, FailoverAIProvider):
+            # Both providers share one cache store
+            provider = provider.primary
+        if isinstance(provider, CachedAIProvider):
+            await provider.cache.create_indexes()
+    except Exception as e:
+        logger.warning(f"AI response cache setup failed: {str(e)}")
+
+    # Parse LaTeX templates into render plans once, up front
+    template_ids = get_template_registry().preload()
+    print(f"✓ LaTeX templates loaded: {', '.join(template_ids)}")
+
+    # Precompile template preambles without delaying startup; compiles that
+    # start before a format is ready simply run without it
+    format_task = None
+    if os.getenv("LATEX_PRECOMPILE_FORMATS", "true").lower() != "false":
+        format_task = asyncio.create_task(precompile_latex_formats())
+
     yield
 
+    if format_task and not format_task.done():
+        format_task.cancel()
+
     # Shutdown
     print("Shutting down Resume Vault Backend...")
     await close_mongo_connection()
+    close_workspace_pool()
 
 
 app = FastAPI(title="Resume Vault Spike", lifespan=lifespan)
@@ -68,6 +116,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser PDF viewers read range and validator headers cross-origin
+    expose_headers=["Accept-Ranges", "Content-Range", "Content-Length", "ETag"],
 )
 
 # Include routers
@@ -213,6 +263,38 @@ async def get_my_ip():
         return {"error": str(e)}
 
 
+@app.get("/debug/compile-stats")
+async def get_compile_stats():
+    """Debug endpoint exposing PDF compile queue depth, wait and run times per priority class"""
+    return get_compile_scheduler().stats()
+
+
+@app.get("/debug/compile-metrics")
+async def get_compile_metrics_endpoint(format: str = "json"):
+    """
+    Debug endpoint exposing compile telemetry histograms (stage timings, child
+    CPU and memory, page counts, log warnings) per template.
+    Pass format=prometheus for the Prometheus text exposition format.
+    """
+    metrics = get_compile_metrics()
+    if format == "prometheus":
+        return PlainTextResponse(metrics.render_prometheus())
+    return metrics.snapshot()
+
+
+@app.get("/debug/ai-usage")
+async def get_ai_usage_endpoint(format: str = "json"):
+    """
+    Debug endpoint exposing AI token usage per provider and operation,
+    including prompt tokens read from the provider's prompt cache.
+    Pass format=prometheus for the Prometheus text exposition format.
+    """
+    metrics = get_ai_usage_metrics()
+    if format == "prometheus":
+        return PlainTextResponse(metrics.render_prometheus())
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
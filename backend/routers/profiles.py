@@ -9,6 +9,8 @@ from auth import verify_clerk_token
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
+from services.latex_generator import build_profile_fragments
+from services.profile_fragments import FRAGMENTS_FIELD
 import logging
 
 logger = logging.getLogger(__name__)
@@ -278,6 +280,18 @@ async def update_my_profile(
             detail="Invalid token: user_id not found"
         )
     
+    # Fragments are derived server-side only; never accept LaTeX from the
+    # client, including through dotted paths or update operators in $set
+    rejected = [
+        key for key in profile_update
+        if key == FRAGMENTS_FIELD or key.startswith(f"{FRAGMENTS_FIELD}.") or "." in key or key.startswith("$")
+    ]
+    if rejected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fields cannot be updated: {', '.join(sorted(rejected))}"
+        )
+
     # Update timestamp
     profile_update["updatedAt"] = datetime.utcnow()
     
@@ -298,6 +312,17 @@ async def update_my_profile(
     # Return updated profile
     updated_profile = await db.master_profiles.find_one({"userId": user_id})
     updated_profile.pop("_id", None)
+
+    # Pre-render the LaTeX for sections that don't depend on the job, so
+    # resume generation only renders the tailored ones
+    try:
+        await db.master_profiles.update_one(
+            {"userId": user_id, "updatedAt": updated_profile.get("updatedAt")},
+            {"$set": {FRAGMENTS_FIELD: build_profile_fragments(updated_profile)}}
+        )
+    except Exception as e:
+        # Generation renders the sections itself when fragments are stale
+        logger.warning(f"Failed to store LaTeX fragments for user {user_id}: {str(e)}")
     
     return MasterProfileResponse(
         status="updated",
@@ -3,17 +3,37 @@ Resume Generation Router
 Handles LaTeX resume generation, editing, version management, and PDF conversion
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Response, Header
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime
 from auth import verify_clerk_token
 from database import get_database
 from services.ai_factory import AIProviderFactory
+from services.ai_provider import TailoredResume
+from services.ai_resilience import AIServiceError
+from services.ats_score import calculate_resume_ats_score, calculate_cover_letter_ats_score
 from services.latex_generator import LaTeXResumeGenerator
-from services.latex_local_compiler import LaTeXLocalCompiler
+from services.cover_letter_generator import CoverLetterGenerator
+from services.template_registry import DEFAULT_RESUME_TEMPLATE, TemplateNotFound, get_template_registry
+from services.latex_local_compiler import LaTeXLocalCompiler, LaTeXCompilerBusy
+from services.compile_scheduler import CompilePriority
+from services.latex_validator import validate_latex, LaTeXValidationError
+from services.pdf_prerender import get_pdf_prerenderer
+from services.html_preview import HTMLPreviewRenderer
+from services.resume_sections import ResumeSections
+from services.pdf_response import build_pdf_response, etag_matches
+from services.pdf_rasterizer import (
+    get_pdf_rasterizer, PDFRasterizer, PageNotFound, PREVIEW_DPI, THUMBNAIL_DPI, MAX_DPI
+)
+import io
+import json
+import math
 import logging
 import uuid
+import hashlib
+import zipfile
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +47,11 @@ class GenerateLatexResumeRequest(BaseModel):
     position: str = Field(..., min_length=1)
     job_id: str = ""
     posting_link: str = ""
+    template_id: str = DEFAULT_RESUME_TEMPLATE
+    # Ignore cached AI responses for this posting and ask the model again
+    fresh_take: bool = False
+    # Tailor the resume and write the cover letter in one model call
+    single_call: bool = False
 
 
 class GenerateLatexResumeResponse(BaseModel):
@@ -41,6 +66,12 @@ class GenerateLatexResumeResponse(BaseModel):
 
 class EditContentRequest(BaseModel):
     edited_content: Dict[str, Any]
+    template_id: Optional[str] = None  # defaults to the current version's template
+
+
+class PreviewRequest(BaseModel):
+    edited_content: Optional[Dict[str, Any]] = None  # unsaved edits to lay out
+    version: Optional[int] = None  # defaults to the current version
 
 
 class RegenerateResponse(BaseModel):
@@ -66,37 +97,133 @@ class GetResumeResponse(BaseModel):
     job_info: Dict[str, str]
 
 
-# Helper function to calculate ATS scores (copied from main.py)
-def calculate_resume_ats_score(tailored_resume: Any, profile: Dict[str, Any]) -> int:
-    """Calculate estimated ATS score for resume"""
-    base_score = 60
-    keyword_count = len(tailored_resume.keyword_matches) if hasattr(tailored_resume, 'keyword_matches') else 0
-    experience_count = len(tailored_resume.tailored_experience) if hasattr(tailored_resume, 'tailored_experience') else 0
-
-    keyword_bonus = min(keyword_count * 2, 15)
-    experience_bonus = min(experience_count * 3, 15)
+def apply_edits(tailored_data: Dict[str, Any], edited_content: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a version's tailored data with the edit form's content merged in"""
+    tailored_data = dict(tailored_data)
+    if "summary" in edited_content:
+        tailored_data["tailored_summary"] = edited_content["summary"]
+    if "experiences" in edited_content:
+        tailored_data["tailored_experience"] = edited_content["experiences"]
+    return tailored_data
 
-    has_summary = bool(tailored_resume.tailored_summary) if hasattr(tailored_resume, 'tailored_summary') else False
-    summary_bonus = 5 if has_summary else 0
 
-    total_score = base_score + keyword_bonus + experience_bonus + summary_bonus
-    return min(total_score, 95)
+def build_cover_letter_latex(
+    profile: Dict[str, Any],
+    doc: Dict[str, Any],
+    version_data: Dict[str, Any]
+) -> Optional[str]:
+    """
+    LaTeX for a version's cover letter, or None if it has no cover letter.
 
+    Dated with the application's creation date, so versions that keep the same
+    letter produce the same source and share its cached PDF.
+    """
+    cover_letter_text = version_data.get("coverLetterContent", "")
+    if not cover_letter_text:
+        return None
+
+    return CoverLetterGenerator().generate_cover_letter_latex(
+        profile=profile,
+        cover_letter_text=cover_letter_text,
+        company_name=doc["jobInfo"]["companyName"],
+        position=doc["jobInfo"]["position"],
+        date=datetime.fromisoformat(doc["createdAt"])
+    )
+
+
+async def _generation_inputs(
+    db,
+    user_id: str,
+    request: GenerateLatexResumeRequest
+) -> Tuple[LaTeXResumeGenerator, Dict[str, Any]]:
+    """Resolve the template and fetch the master profile, before any AI call is made"""
+    try:
+        latex_generator = LaTeXResumeGenerator.for_template(request.template_id)
+    except TemplateNotFound as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-def calculate_cover_letter_ats_score(tailored_resume: Any, cover_letter: str) -> int:
-    """Calculate estimated ATS score for cover letter"""
-    base_score = 65
-    keyword_count = len(tailored_resume.keyword_matches[:8]) if hasattr(tailored_resume, 'keyword_matches') else 0
-    keyword_bonus = min(keyword_count * 2, 16)
+    # Fetch master profile
+    profile = await db["master_profiles"].find_one({"userId": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Master profile not found. Please complete your profile first.")
 
-    has_content = len(cover_letter) > 100
-    content_bonus = 8 if has_content else 0
+    # Convert MongoDB _id to string for JSON serialization
+    return latex_generator, {k: str(v) if k == "_id" else v for k, v in profile.items()}
 
-    is_proper_length = 200 <= len(cover_letter) <= 600
-    length_bonus = 3 if is_proper_length else 0
 
-    total_score = base_score + keyword_bonus + content_bonus + length_bonus
-    return min(total_score, 92)
+async def _store_generation(
+    db,
+    user_id: str,
+    request: GenerateLatexResumeRequest,
+    profile_dict: Dict[str, Any],
+    latex_generator: LaTeXResumeGenerator,
+    tailored_resume: TailoredResume,
+    latex_content: str,
+    cover_letter_text: str
+) -> GenerateLatexResumeResponse:
+    """Score and store a new generation as version 1, and start compiling its PDFs"""
+    # Calculate ATS scores
+    resume_ats_score = calculate_resume_ats_score(tailored_resume, profile_dict)
+    cover_letter_ats_score = calculate_cover_letter_ats_score(tailored_resume, cover_letter_text)
+
+    # Create job application ID
+    job_application_id = str(uuid.uuid4())
+
+    # Store in database
+    resume_generation_doc = {
+        "userId": user_id,
+        "jobApplicationId": job_application_id,
+        "jobInfo": {
+            "companyName": request.company_name,
+            "position": request.position,
+            "jobId": request.job_id,
+            "postingLink": request.posting_link,
+            "jobDescription": request.job_description
+        },
+        "versions": [
+            {
+                "versionNumber": 1,
+                "createdAt": datetime.utcnow().isoformat(),
+                "latexContent": latex_content,
+                "templateId": latex_generator.template_id,
+                "profileUpdatedAt": profile_dict.get("updatedAt"),
+                "coverLetterContent": cover_letter_text,
+                "tailoredData": {
+                    "tailored_summary": tailored_resume.tailored_summary,
+                    "tailored_experience": [exp.dict() for exp in tailored_resume.tailored_experience],
+                    "keyword_matches": tailored_resume.keyword_matches,
+                    "recommendations": tailored_resume.recommendations
+                },
+                "atsScores": {
+                    "resume": resume_ats_score,
+                    "coverLetter": cover_letter_ats_score
+                },
+                "isEdited": False
+            }
+        ],
+        "currentVersion": 1,
+        "createdAt": datetime.utcnow().isoformat(),
+        "updatedAt": datetime.utcnow().isoformat()
+    }
+
+    await db["resume_generations"].insert_one(resume_generation_doc)
+    logger.info(f"Stored resume generation with ID: {job_application_id}")
+
+    # Compile the resume and cover letter PDFs while the user reviews the result
+    cover_letter_latex = build_cover_letter_latex(
+        profile_dict, resume_generation_doc, resume_generation_doc["versions"][0]
+    )
+    get_pdf_prerenderer().schedule(latex_content, cover_letter_latex, user_id=user_id)
+
+    return GenerateLatexResumeResponse(
+        job_application_id=job_application_id,
+        version_number=1,
+        latex_content=latex_content,
+        cover_letter_content=cover_letter_text,
+        resume_ats_score=resume_ats_score,
+        cover_letter_ats_score=cover_letter_ats_score,
+        tailored_data=tailored_resume.dict()
+    )
 
 
 @router.post("/generate-latex", response_model=GenerateLatexResumeResponse)
@@ -109,7 +236,8 @@ async def generate_latex_resume(
 
     Process:
     1. Fetch user's master profile from database
-    2. AI tailors content for the job
+    2. AI tailors content for the job (and writes the cover letter in the
+       same call when single_call is set)
     3. Fill LaTeX template with tailored content
     4. Store in database with version history
     5. Return LaTeX source and metadata
@@ -120,104 +248,163 @@ async def generate_latex_resume(
 
         # Get database and AI provider
         db = get_database()
-        ai_provider = AIProviderFactory.get_provider()
+        ai_provider = AIProviderFactory.get_provider(bypass_cache=request.fresh_take)
 
-        # Fetch master profile
-        profile = await db["master_profiles"].find_one({"userId": user_id})
-        if not profile:
-            raise HTTPException(status_code=404, detail="Master profile not found. Please complete your profile first.")
+        latex_generator, profile_dict = await _generation_inputs(db, user_id, request)
 
-        # Convert MongoDB _id to string for JSON serialization
-        profile_dict = {k: str(v) if k == "_id" else v for k, v in profile.items()}
-
-        # AI tailoring (existing flow)
-        tailored_resume = await ai_provider.tailor_resume(
-            master_profile=profile_dict,
-            job_description=request.job_description,
-            company_name=request.company_name,
-            position=request.position
-        )
-        logger.info("Resume tailoring completed")
+        if request.single_call:
+            # AI tailoring and cover letter from one structured response
+            application = await ai_provider.tailor_resume_and_cover_letter(
+                master_profile=profile_dict,
+                job_description=request.job_description,
+                company_name=request.company_name,
+                position=request.position
+            )
+            tailored_resume = application.tailored_resume
+            cover_letter_text = application.cover_letter
+            logger.info("Resume tailoring and cover letter generation completed")
+        else:
+            # AI tailoring (existing flow)
+            tailored_resume = await ai_provider.tailor_resume(
+                master_profile=profile_dict,
+                job_description=request.job_description,
+                company_name=request.company_name,
+                position=request.position
+            )
+            cover_letter_text = None
+            logger.info("Resume tailoring completed")
 
         # Generate LaTeX resume using template
-        latex_generator = LaTeXResumeGenerator()
         latex_content = latex_generator.generate_latex(
             profile=profile_dict,
             tailored_content=tailored_resume.dict()
         )
+        validate_latex(latex_content)
         logger.info("LaTeX resume generation completed")
 
         # Generate cover letter (text)
-        cover_letter_text = await ai_provider.generate_cover_letter(
-            master_profile=profile_dict,
-            job_description=request.job_description,
-            company_name=request.company_name,
-            position=request.position,
-            tailored_resume=tailored_resume
+        if cover_letter_text is None:
+            cover_letter_text = await ai_provider.generate_cover_letter(
+                master_profile=profile_dict,
+                job_description=request.job_description,
+                company_name=request.company_name,
+                position=request.position,
+                tailored_resume=tailored_resume
+            )
+            logger.info("Cover letter generation completed")
+
+        return await _store_generation(
+            db, user_id, request, profile_dict, latex_generator,
+            tailored_resume, latex_content, cover_letter_text
         )
-        logger.info("Cover letter generation completed")
 
-        # Calculate ATS scores
-        resume_ats_score = calculate_resume_ats_score(tailored_resume, profile_dict)
-        cover_letter_ats_score = calculate_cover_letter_ats_score(tailored_resume, cover_letter_text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Resume generation failed: {str(e)}", exc_info=True)
+        retry_after = _ai_retry_after(e)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Failed to generate resume: {str(e)}",
+                headers={"Retry-After": str(retry_after)}
+            )
+        raise HTTPException(status_code=500, detail=f"Failed to generate resume: {str(e)}")
+
 
-        # Create job application ID
-        job_application_id = str(uuid.uuid4())
+def _ai_retry_after(e: Exception) -> Optional[int]:
+    """Seconds to suggest before retrying if the AI service is temporarily unavailable, else None"""
+    if isinstance(e, AIServiceError) and e.retryable:
+        return max(math.ceil(e.retry_after or 5), 1)
+    return None
 
-        # Store in database
-        resume_generation_doc = {
-            "userId": user_id,
-            "jobApplicationId": job_application_id,
-            "jobInfo": {
-                "companyName": request.company_name,
-                "position": request.position,
-                "jobId": request.job_id,
-                "postingLink": request.posting_link,
-                "jobDescription": request.job_description
-            },
-            "versions": [
-                {
-                    "versionNumber": 1,
-                    "createdAt": datetime.utcnow().isoformat(),
-                    "latexContent": latex_content,
-                    "coverLetterContent": cover_letter_text,
-                    "tailoredData": {
-                        "tailored_summary": tailored_resume.tailored_summary,
-                        "tailored_experience": [exp.dict() for exp in tailored_resume.tailored_experience],
-                        "keyword_matches": tailored_resume.keyword_matches,
-                        "recommendations": tailored_resume.recommendations
-                    },
-                    "atsScores": {
-                        "resume": resume_ats_score,
-                        "coverLetter": cover_letter_ats_score
-                    },
-                    "isEdited": False
-                }
-            ],
-            "currentVersion": 1,
-            "createdAt": datetime.utcnow().isoformat(),
-            "updatedAt": datetime.utcnow().isoformat()
-        }
 
-        await db["resume_generations"].insert_one(resume_generation_doc)
-        logger.info(f"Stored resume generation with ID: {job_application_id}")
+def _ndjson_line(event: str, **fields: Any) -> bytes:
+    return (json.dumps({"event": event, **fields}) + "\n").encode("utf-8")
 
-        return GenerateLatexResumeResponse(
-            job_application_id=job_application_id,
-            version_number=1,
-            latex_content=latex_content,
-            cover_letter_content=cover_letter_text,
-            resume_ats_score=resume_ats_score,
-            cover_letter_ats_score=cover_letter_ats_score,
-            tailored_data=tailored_resume.dict()
-        )
 
+@router.post("/generate-latex/stream")
+async def stream_generate_latex_resume(
+    request: GenerateLatexResumeRequest,
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Generate LaTeX resume (initial version), streaming progress as NDJSON.
+
+    Tailoring and the cover letter come from one streamed AI call. Each line
+    is a JSON object whose "event" says what it carries, sent as soon as
+    that part is written:
+    - {"event": "summary", "summary": ...}
+    - {"event": "experience", "index": n, "experience": {jobTitle, companyName, tailored_bullets}}
+    - {"event": "cover_letter", "cover_letter": ...}
+    - {"event": "complete", ...the generate-latex response fields} once stored
+    - {"event": "error", "detail": ...} if generation fails after streaming began,
+      with "retry_after" (seconds) if the AI service is temporarily unavailable
+
+    Missing templates and profiles are reported as HTTP errors before the stream starts.
+    """
+    user_id = token_payload.get("sub")
+    logger.info(f"Streaming LaTeX resume generation for user {user_id}, company: {request.company_name}")
+
+    try:
+        db = get_database()
+        ai_provider = AIProviderFactory.get_provider(bypass_cache=request.fresh_take)
+        latex_generator, profile_dict = await _generation_inputs(db, user_id, request)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Resume generation failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to generate resume: {str(e)}")
 
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            application = None
+            async for event in ai_provider.stream_tailor_resume_and_cover_letter(
+                master_profile=profile_dict,
+                job_description=request.job_description,
+                company_name=request.company_name,
+                position=request.position
+            ):
+                if event.kind == "summary":
+                    yield _ndjson_line("summary", summary=event.data)
+                elif event.kind == "experience":
+                    yield _ndjson_line("experience", index=event.index, experience=event.data.dict())
+                elif event.kind == "cover_letter":
+                    yield _ndjson_line("cover_letter", cover_letter=event.data)
+                elif event.kind == "complete":
+                    application = event.data
+            if application is None:
+                raise Exception("AI response ended before it was complete")
+            logger.info("Resume tailoring and cover letter generation completed")
+
+            tailored_resume = application.tailored_resume
+            latex_content = latex_generator.generate_latex(
+                profile=profile_dict,
+                tailored_content=tailored_resume.dict()
+            )
+            validate_latex(latex_content)
+            logger.info("LaTeX resume generation completed")
+
+            result = await _store_generation(
+                db, user_id, request, profile_dict, latex_generator,
+                tailored_resume, latex_content, application.cover_letter
+            )
+            yield _ndjson_line("complete", **result.dict())
+        except Exception as e:
+            logger.error(f"Resume generation failed: {str(e)}", exc_info=True)
+            retry_after = _ai_retry_after(e)
+            if retry_after is not None:
+                yield _ndjson_line("error", detail=f"Failed to generate resume: {str(e)}", retry_after=retry_after)
+            else:
+                yield _ndjson_line("error", detail=f"Failed to generate resume: {str(e)}")
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
+
 
 @router.get("/{job_application_id}", response_model=GetResumeResponse)
 async def get_resume(
@@ -377,25 +564,32 @@ async def regenerate_with_edits(
         
         profile_dict = {k: str(v) if k == "_id" else v for k, v in profile.items()}
 
-        # Merge edited content with existing tailored data
-        tailored_data = current_version_data.get("tailoredData", {})
-        edited_content = request.edited_content
-        
-        # Update tailored data with edits
-        if "summary" in edited_content:
-            tailored_data["tailored_summary"] = edited_content["summary"]
-        if "experiences" in edited_content:
-            tailored_data["tailored_experience"] = edited_content["experiences"]
+        # Merge edited content with a copy of the existing tailored data; the
+        # original is diffed against to find the sections that changed
+        tailored_data = apply_edits(current_version_data.get("tailoredData", {}), request.edited_content)
 
         # Regenerate LaTeX with updated content
         logger.info(f"Regenerating LaTeX for {job_application_id} with edited content")
-        latex_generator = LaTeXResumeGenerator()
-        new_latex = latex_generator.generate_latex(
+        try:
+            latex_generator = LaTeXResumeGenerator.for_template(
+                request.template_id or current_version_data.get("templateId", DEFAULT_RESUME_TEMPLATE)
+            )
+        except TemplateNotFound as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        new_latex = latex_generator.regenerate_latex(
             profile=profile_dict,
-            tailored_content=tailored_data
+            tailored_content=tailored_data,
+            previous_version=current_version_data
         )
         logger.info("LaTeX regeneration completed")
 
+        # Reject broken edits now rather than when the PDF is first requested
+        try:
+            validate_latex(new_latex)
+        except LaTeXValidationError as e:
+            logger.warning(f"Regenerated LaTeX for {job_application_id} is invalid: {str(e)}")
+            raise HTTPException(status_code=422, detail=f"Edited content produces invalid LaTeX: {str(e)}")
+
         # Create new version
         new_version_number = len(doc["versions"]) + 1
 
@@ -403,6 +597,8 @@ async def regenerate_with_edits(
             "versionNumber": new_version_number,
             "createdAt": datetime.utcnow().isoformat(),
             "latexContent": new_latex,
+            "templateId": latex_generator.template_id,
+            "profileUpdatedAt": profile_dict.get("updatedAt"),
             "coverLetterContent": current_version_data.get("coverLetterContent", ""),
             "tailoredData": tailored_data,
             "atsScores": current_version_data["atsScores"],  # Keep same scores for now
@@ -423,6 +619,9 @@ async def regenerate_with_edits(
 
         logger.info(f"Created new version {new_version_number} for resume {job_application_id}")
 
+        cover_letter_latex = build_cover_letter_latex(profile_dict, doc, new_version)
+        get_pdf_prerenderer().schedule(new_latex, cover_letter_latex, user_id=user_id)
+
         return RegenerateResponse(
             job_application_id=job_application_id,
             version_number=new_version_number,
@@ -437,65 +636,376 @@ async def regenerate_with_edits(
         raise HTTPException(status_code=500, detail=f"Failed to regenerate resume: {str(e)}")
 
 
+async def _find_resume_version(
+    job_application_id: str,
+    user_id: str,
+    version: Optional[int]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Fetch a resume and one of its versions (the current one by default).
+
+    Raises:
+        HTTPException: 404 if either is missing, 500 if the version has no LaTeX
+    """
+    db = get_database()
+
+    doc = await db["resume_generations"].find_one({
+        "jobApplicationId": job_application_id,
+        "userId": user_id
+    })
+
+    if not doc:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    version_to_get = version if version else doc["currentVersion"]
+    version_data = None
+    for v in doc["versions"]:
+        if v["versionNumber"] == version_to_get:
+            version_data = v
+            break
+
+    if not version_data:
+        raise HTTPException(status_code=404, detail=f"Version {version_to_get} not found")
+
+    if not version_data.get("latexContent"):
+        raise HTTPException(status_code=500, detail="No LaTeX content found")
+
+    return doc, version_data
+
+
 @router.get("/{job_application_id}/pdf")
 async def download_resume_pdf(
     job_application_id: str,
     version: Optional[int] = None,
+    purpose: str = "download",
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
     token_payload: dict = Depends(verify_clerk_token)
 ):
     """
     Convert LaTeX resume to PDF and return for download.
+
+    Pass purpose=preview for on-screen previews; they are compiled ahead of
+    downloads and background work when the compiler is busy.
+
+    Compiled PDFs are cached by a hash of the LaTeX source, which also serves
+    as a strong ETag so unchanged versions can be revalidated with a 304. New
+    versions are usually pre-rendered in the background by the time this runs.
+    The PDF is streamed and single byte ranges (Range/If-Range) are supported.
     """
     try:
         user_id = token_payload.get("sub")
-        db = get_database()
+        doc, version_data = await _find_resume_version(job_application_id, user_id, version)
+        version_to_get = version_data["versionNumber"]
+        latex_content = version_data["latexContent"]
 
-        # Fetch resume
-        doc = await db["resume_generations"].find_one({
-            "jobApplicationId": job_application_id,
-            "userId": user_id
-        })
+        cache_key = LaTeXLocalCompiler.cache_key(latex_content)
+        etag = f'"{cache_key}"'
+        # Versions are immutable, but the URL without ?version follows the
+        # current version, so clients must revalidate on every use
+        cache_headers = {"Cache-Control": "private, no-cache"}
 
-        if not doc:
-            raise HTTPException(status_code=404, detail="Resume not found")
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={**cache_headers, "ETag": etag})
 
-        # Get version
-        version_to_get = version if version else doc["currentVersion"]
-        version_data = None
-        for v in doc["versions"]:
-            if v["versionNumber"] == version_to_get:
-                version_data = v
-                break
+        # Served from the cache or a pending background render when possible,
+        # otherwise compiled on demand using local pdflatex
+        priority = CompilePriority.INTERACTIVE if purpose == "preview" else CompilePriority.DOWNLOAD
+        pdf_bytes = await get_pdf_prerenderer().get_pdf(latex_content, priority=priority, user_id=user_id)
 
-        if not version_data:
-            raise HTTPException(status_code=404, detail=f"Version {version_to_get} not found")
+        logger.info(f"Converted resume {job_application_id} v{version_to_get} to PDF")
 
-        # Get LaTeX content
-        latex_content = version_data.get("latexContent", "")
+        # Stream PDF as downloadable file
+        return build_pdf_response(
+            pdf_bytes,
+            etag=etag,
+            headers={
+                "Content-Disposition": f"attachment; filename=resume_{doc['jobInfo']['companyName'].replace(' ', '_')}.pdf",
+                **cache_headers
+            },
+            range_header=range_header,
+            if_range=if_range
+        )
 
-        if not latex_content:
-            raise HTTPException(status_code=500, detail="No LaTeX content found")
+    except HTTPException:
+        raise
+    except LaTeXCompilerBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Failed to convert to PDF: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to convert to PDF: {str(e)}")
 
-        # Compile LaTeX to PDF using local pdflatex
-        compiler = LaTeXLocalCompiler()
-        pdf_bytes = await compiler.compile_to_pdf(latex_content)
 
-        logger.info(f"Converted resume {job_application_id} v{version_to_get} to PDF")
+async def _find_cover_letter_latex(
+    doc: Dict[str, Any],
+    version_data: Dict[str, Any],
+    user_id: str
+) -> str:
+    """
+    Build the cover letter LaTeX for a version.
+
+    Raises:
+        HTTPException: 404 if the version has no cover letter or the profile is missing
+    """
+    if not version_data.get("coverLetterContent"):
+        raise HTTPException(status_code=404, detail="No cover letter for this version")
+
+    profile = await get_database()["master_profiles"].find_one({"userId": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Master profile not found")
+
+    return build_cover_letter_latex(profile, doc, version_data)
+
+
+@router.get("/{job_application_id}/cover-letter/pdf")
+async def download_cover_letter_pdf(
+    job_application_id: str,
+    version: Optional[int] = None,
+    purpose: str = "download",
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Render a version's cover letter to PDF and return it for download.
+
+    Cached, revalidated and streamed like the resume PDF. The cover letter is
+    pre-rendered together with its resume when a version is created.
+    """
+    try:
+        user_id = token_payload.get("sub")
+        doc, version_data = await _find_resume_version(job_application_id, user_id, version)
+        latex_content = await _find_cover_letter_latex(doc, version_data, user_id)
+
+        etag = f'"{LaTeXLocalCompiler.cache_key(latex_content)}"'
+        cache_headers = {"Cache-Control": "private, no-cache"}
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={**cache_headers, "ETag": etag})
+
+        priority = CompilePriority.INTERACTIVE if purpose == "preview" else CompilePriority.DOWNLOAD
+        pdf_bytes = await get_pdf_prerenderer().get_pdf(latex_content, priority=priority, user_id=user_id)
+
+        logger.info(f"Converted cover letter {job_application_id} v{version_data['versionNumber']} to PDF")
+
+        return build_pdf_response(
+            pdf_bytes,
+            etag=etag,
+            headers={
+                "Content-Disposition": f"attachment; filename=cover_letter_{doc['jobInfo']['companyName'].replace(' ', '_')}.pdf",
+                **cache_headers
+            },
+            range_header=range_header,
+            if_range=if_range
+        )
+
+    except HTTPException:
+        raise
+    except LaTeXCompilerBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Failed to convert cover letter to PDF: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to convert cover letter to PDF: {str(e)}")
+
+
+@router.get("/{job_application_id}/packet")
+async def download_application_packet(
+    job_application_id: str,
+    version: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Download a version's resume and cover letter PDFs as one zip archive.
+
+    Both documents are fetched from the cache, and whatever is missing is
+    compiled as a single job rather than as two separate cold compiles.
+    """
+    try:
+        user_id = token_payload.get("sub")
+        doc, version_data = await _find_resume_version(job_application_id, user_id, version)
+        resume_latex = version_data["latexContent"]
+        cover_letter_latex = await _find_cover_letter_latex(doc, version_data, user_id)
+
+        packet_key = hashlib.sha256(
+            f"{LaTeXLocalCompiler.cache_key(resume_latex)}\0{LaTeXLocalCompiler.cache_key(cover_letter_latex)}".encode('utf-8')
+        ).hexdigest()
+        etag = f'"{packet_key}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        resume_pdf, cover_letter_pdf = await get_pdf_prerenderer().get_pdfs(
+            [resume_latex, cover_letter_latex], priority=CompilePriority.DOWNLOAD, user_id=user_id
+        )
+
+        company = doc['jobInfo']['companyName'].replace(' ', '_')
+        archive = io.BytesIO()
+        # PDFs are already compressed; store them as-is
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as packet:
+            packet.writestr(f"resume_{company}.pdf", resume_pdf)
+            packet.writestr(f"cover_letter_{company}.pdf", cover_letter_pdf)
+
+        logger.info(f"Built application packet for {job_application_id} v{version_data['versionNumber']}")
 
-        # Return PDF as downloadable file
         return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
+            content=archive.getvalue(),
+            media_type="application/zip",
             headers={
-                "Content-Disposition": f"attachment; filename=resume_{doc['jobInfo']['companyName'].replace(' ', '_')}.pdf"
+                "Content-Disposition": f"attachment; filename=application_{company}.zip",
+                **cache_headers
             }
         )
 
     except HTTPException:
         raise
+    except LaTeXCompilerBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
-        logger.error(f"Failed to convert to PDF: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to convert to PDF: {str(e)}")
+        logger.error(f"Failed to build application packet: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to build application packet: {str(e)}")
+
+
+async def _page_image_response(
+    job_application_id: str,
+    user_id: str,
+    version: Optional[int],
+    page: int,
+    dpi: int,
+    if_none_match: Optional[str]
+) -> Response:
+    """Render (or fetch from cache) one page of a resume version as PNG"""
+    if page < 1:
+        raise HTTPException(status_code=404, detail=f"Page {page} not found")
+
+    _, version_data = await _find_resume_version(job_application_id, user_id, version)
+    latex_content = version_data["latexContent"]
+
+    pdf_key = LaTeXLocalCompiler.cache_key(latex_content)
+    etag = f'"{PDFRasterizer.image_key(pdf_key, page, dpi)}"'
+    # Explicit versions are immutable and can be cached for good; the URL
+    # without ?version follows the current version and must be revalidated
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable" if version else "private, no-cache"
+    }
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    pdf_bytes = await get_pdf_prerenderer().get_pdf(
+        latex_content, priority=CompilePriority.INTERACTIVE, user_id=user_id
+    )
+    png_bytes = await get_pdf_rasterizer().render_png(
+        pdf_key, pdf_bytes, page, dpi, priority=CompilePriority.INTERACTIVE, user_id=user_id
+    )
+    return Response(content=png_bytes, media_type="image/png", headers=cache_headers)
+
+
+@router.get("/{job_application_id}/preview.png")
+async def get_resume_preview_image(
+    job_application_id: str,
+    version: Optional[int] = None,
+    dpi: int = PREVIEW_DPI,
+    if_none_match: Optional[str] = Header(None),
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Get the first page of a resume version as a PNG image.
+
+    Rendered once per version and DPI and then served from cache. With
+    ?version the response is cacheable indefinitely.
+    """
+    if not 1 <= dpi <= MAX_DPI:
+        raise HTTPException(status_code=400, detail=f"dpi must be between 1 and {MAX_DPI}")
+
+    try:
+        return await _page_image_response(
+            job_application_id, token_payload.get("sub"), version, 1, dpi, if_none_match
+        )
+    except HTTPException:
+        raise
+    except LaTeXCompilerBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Failed to render preview: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to render preview: {str(e)}")
+
+
+@router.post("/{job_application_id}/preview.html", response_class=HTMLResponse)
+async def get_resume_preview_html(
+    job_application_id: str,
+    request: PreviewRequest,
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Lay out a resume version, optionally with unsaved edits, as an HTML page.
+
+    Rendered in-process in milliseconds for live previews while editing; it
+    approximates template1 and is not stored. The PDF endpoints remain the
+    source of truth for what gets downloaded.
+    """
+    user_id = token_payload.get("sub")
+    doc, version_data = await _find_resume_version(job_application_id, user_id, request.version)
+
+    profile = await get_database()["master_profiles"].find_one({"userId": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Master profile not found")
+
+    tailored_data = version_data.get("tailoredData", {})
+    if request.edited_content:
+        tailored_data = apply_edits(tailored_data, request.edited_content)
+
+    html = HTMLPreviewRenderer().render(ResumeSections.from_profile(profile, tailored_data))
+    return HTMLResponse(html, headers={
+        "Cache-Control": "no-store",
+        # Static markup and inline styles only
+        "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'",
+    })
+
+
+@router.get("/{job_application_id}/thumbnail/{page}.png")
+async def get_resume_thumbnail(
+    job_application_id: str,
+    page: int,
+    version: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """
+    Get a small PNG thumbnail of one page (1-based) of a resume version.
+
+    Rendered once per version and then served from cache. With ?version the
+    response is cacheable indefinitely.
+    """
+    try:
+        return await _page_image_response(
+            job_application_id, token_payload.get("sub"), version, page, THUMBNAIL_DPI, if_none_match
+        )
+    except HTTPException:
+        raise
+    except PageNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except LaTeXCompilerBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Failed to render thumbnail: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to render thumbnail: {str(e)}")
+
+
+@router.get("/templates/all")
+async def list_resume_templates(
+    token_payload: dict = Depends(verify_clerk_token)
+):
+    """List the ids of the resume templates generate-latex and regenerate accept"""
+    registry = get_template_registry()
+    return {
+        "templates": registry.resume_template_ids(),
+        "default": DEFAULT_RESUME_TEMPLATE
+    }
 
 
 @router.get("/list/all")
@@ -0,0 +1,363 @@
+"""
+AI Response Cache
+Persistent cache for tailoring and cover letter responses, wrapping any AI provider
+
+A user who regenerates for the same posting, or resubmits after a frontend
+timeout, gets the stored response instead of paying for another model call.
+Entries are keyed by a hash of everything that shapes the response: the
+normalized profile, the job details, the model and the provider's prompt
+version. They expire after a TTL and the oldest are evicted past a size bound.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .ai_provider import (
+    BaseAIProvider, TailoredResume, TailoredApplication,
+    ApplicationStreamEvent, application_stream_events
+)
+
+logger = logging.getLogger(__name__)
+
+# Profile fields that never reach the prompts; they change without changing the response
+VOLATILE_PROFILE_FIELDS = frozenset({"_id", "createdAt", "updatedAt", "latexFragments"})
+
+
+def _normalize_text(text: str) -> str:
+    """Collapse whitespace, so a re-pasted job description hits the same entry"""
+    return " ".join((text or "").split())
+
+
+def _normalize_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in profile.items() if key not in VOLATILE_PROFILE_FIELDS}
+
+
+def cache_key(
+    kind: str,
+    provider: BaseAIProvider,
+    master_profile: Dict[str, Any],
+    job_description: str,
+    company_name: str,
+    position: str,
+    **extra: Any
+) -> str:
+    """
+    Canonical hash of a request.
+
+    Args:
+        kind: Response kind ('tailoring' or 'cover_letter')
+        provider: Provider that would answer (its class, model and prompt version are keyed)
+        master_profile: Complete user profile dictionary
+        job_description: Full text of the job posting
+        company_name: Name of the company
+        position: Job title/position
+        extra: Further inputs to the prompt (e.g. the tailored resume for a cover letter)
+
+    Returns:
+        Hex sha256 digest
+    """
+    canonical = json.dumps({
+        "kind": kind,
+        "provider": provider.__class__.__name__,
+        "model": provider.model,
+        "prompt_version": provider.PROMPT_VERSION,
+        "profile": _normalize_profile(master_profile),
+        "job_description": _normalize_text(job_description),
+        "company_name": _normalize_text(company_name),
+        "position": _normalize_text(position),
+        **extra,
+    }, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MongoResponseCache:
+    """Cache entries in a MongoDB collection, expired by a TTL index"""
+
+    COLLECTION = "ai_response_cache"
+
+    def __init__(self, get_database: Callable[[], Any], ttl_seconds: float, max_entries: int):
+        """
+        Initialize Mongo-backed cache.
+
+        Args:
+            get_database: Returns the database (resolved on use, after startup connects)
+            ttl_seconds: Lifetime of an entry
+            max_entries: Entries kept before the oldest are evicted
+        """
+        self._get_database = get_database
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @property
+    def _collection(self):
+        return self._get_database()[self.COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """TTL index on expiresAt, and createdAt for evicting the oldest"""
+        await self._collection.create_index("expiresAt", expireAfterSeconds=0)
+        await self._collection.create_index("createdAt")
+
+    async def get(self, key: str) -> Optional[Any]:
+        # The TTL monitor only runs once a minute, so check expiry here too
+        entry = await self._collection.find_one({"_id": key, "expiresAt": {"$gt": datetime.utcnow()}})
+        return entry["value"] if entry else None
+
+    async def put(self, key: str, kind: str, value: Any) -> None:
+        now = datetime.utcnow()
+        await self._collection.replace_one(
+            {"_id": key},
+            {"kind": kind, "value": value, "createdAt": now,
+             "expiresAt": now + timedelta(seconds=self.ttl_seconds)},
+            upsert=True
+        )
+
+        excess = await self._collection.estimated_document_count() - self.max_entries
+        if excess > 0:
+            oldest = self._collection.find({}, {"_id": 1}).sort("createdAt", 1).limit(excess)
+            keys = [entry["_id"] async for entry in oldest]
+            await self._collection.delete_many({"_id": {"$in": keys}})
+
+
+def _last_used(path: Path) -> float:
+    """mtime of an entry file, or 0 if a concurrent eviction already removed it"""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class DiskResponseCache:
+    """Cache entries as JSON files in a local directory"""
+
+    def __init__(self, directory: str, ttl_seconds: float, max_entries: int):
+        """
+        Initialize disk-backed cache.
+
+        Args:
+            directory: Directory for the entry files (created if missing)
+            ttl_seconds: Lifetime of an entry
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    async def create_indexes(self) -> None:
+        pass
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def put(self, key: str, kind: str, value: Any) -> None:
+        await asyncio.to_thread(self._write, key, kind, value)
+
+    def _read(self, key: str) -> Optional[Any]:
+        path = self.directory / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+        if entry["expiresAt"] <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        # mtime is the last use, for eviction
+        os.utime(path)
+        return entry["value"]
+
+    def _write(self, key: str, kind: str, value: Any) -> None:
+        path = self.directory / f"{key}.json"
+        # Write then rename, so a concurrent reader never sees half an entry;
+        # the temp file is unique per call, as writer threads may share a key
+        descriptor, partial = tempfile.mkstemp(dir=self.directory, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({
+                    "kind": kind,
+                    "value": value,
+                    "expiresAt": time.time() + self.ttl_seconds,
+                }, file)
+            os.replace(partial, path)
+        except BaseException:
+            Path(partial).unlink(missing_ok=True)
+            raise
+
+        entries = list(self.directory.glob("*.json"))
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            entries.sort(key=_last_used)
+            for entry in entries[:excess]:
+                entry.unlink(missing_ok=True)
+
+
+class CachedAIProvider(BaseAIProvider):
+    """
+    AI provider that answers from the response cache when it can.
+
+    Delegates to the wrapped provider on a miss and stores the response.
+    Cache failures are logged and never fail a generation.
+    """
+
+    def __init__(self, provider: BaseAIProvider, cache, read: bool = True):
+        """
+        Wrap a provider.
+
+        Args:
+            provider: Provider that makes the actual model calls
+            cache: MongoResponseCache or DiskResponseCache
+            read: Whether cached responses are returned (False still stores new ones)
+        """
+        super().__init__(provider.api_key, provider.model)
+        self.provider = provider
+        self.cache = cache
+        self.read = read
+
+    def bypassing_cache(self) -> "CachedAIProvider":
+        """
+        A view of this provider for a fresh take: always calls the model, and
+        the new response replaces the cached one.
+        """
+        return CachedAIProvider(self.provider, self.cache, read=False)
+
+    async def tailor_resume(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredResume:
+        key = cache_key(
+            "tailoring", self.provider, master_profile, job_description, company_name, position
+        )
+        cached = await self._get(key)
+        if cached is not None:
+            logger.info(f"Using cached resume tailoring for {company_name} - {position}")
+            return TailoredResume(**cached)
+
+        tailored = await self.provider.tailor_resume(
+            master_profile, job_description, company_name, position
+        )
+        await self._put(key, "tailoring", tailored.dict())
+        return tailored
+
+    async def generate_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str,
+        tailored_resume: TailoredResume
+    ) -> str:
+        key = cache_key(
+            "cover_letter", self.provider, master_profile, job_description, company_name, position,
+            tailored_resume=tailored_resume.dict()
+        )
+        cached = await self._get(key)
+        if cached is not None:
+            logger.info(f"Using cached cover letter for {company_name} - {position}")
+            return cached
+
+        cover_letter = await self.provider.generate_cover_letter(
+            master_profile, job_description, company_name, position, tailored_resume
+        )
+        await self._put(key, "cover_letter", cover_letter)
+        return cover_letter
+
+    async def tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredApplication:
+        key = cache_key(
+            "application", self.provider, master_profile, job_description, company_name, position
+        )
+        cached = await self._get(key)
+        if cached is not None:
+            logger.info(f"Using cached resume tailoring and cover letter for {company_name} - {position}")
+            return TailoredApplication(**cached)
+
+        application = await self.provider.tailor_resume_and_cover_letter(
+            master_profile, job_description, company_name, position
+        )
+        await self._put(key, "application", application.dict())
+        return application
+
+    async def stream_tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> AsyncIterator[ApplicationStreamEvent]:
+        # Same prompt as tailor_resume_and_cover_letter, so the same entry
+        key = cache_key(
+            "application", self.provider, master_profile, job_description, company_name, position
+        )
+        cached = await self._get(key)
+        if cached is not None:
+            logger.info(f"Using cached resume tailoring and cover letter for {company_name} - {position}")
+            for event in application_stream_events(TailoredApplication(**cached)):
+                yield event
+            return
+
+        async for event in self.provider.stream_tailor_resume_and_cover_letter(
+            master_profile, job_description, company_name, position
+        ):
+            if event.kind == 'complete':
+                await self._put(key, "application", event.data.dict())
+            yield event
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+    async def _get(self, key: str) -> Optional[Any]:
+        if not self.read:
+            return None
+        try:
+            return await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"AI response cache read failed: {str(e)}")
+            return None
+
+    async def _put(self, key: str, kind: str, value: Any) -> None:
+        try:
+            await self.cache.put(key, kind, value)
+        except Exception as e:
+            logger.warning(f"AI response cache write failed: {str(e)}")
+
+
+def create_response_cache():
+    """
+    Create the response cache configured by the environment, or None.
+
+    AI_CACHE_BACKEND selects 'mongo' (default), 'disk' (AI_CACHE_DIR) or 'none';
+    AI_CACHE_TTL_HOURS and AI_CACHE_MAX_ENTRIES bound it.
+    """
+    backend = os.getenv("AI_CACHE_BACKEND", "mongo").lower()
+    ttl_seconds = float(os.getenv("AI_CACHE_TTL_HOURS", "72")) * 3600
+    max_entries = int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000"))
+
+    if backend == "none":
+        return None
+    if backend == "mongo":
+        # Imported here so the services don't require a database connection at import
+        from database import get_database
+        return MongoResponseCache(get_database, ttl_seconds, max_entries)
+    if backend == "disk":
+        directory = os.getenv("AI_CACHE_DIR", "/tmp/resume_vault/ai_cache")
+        return DiskResponseCache(directory, ttl_seconds, max_entries)
+    raise ValueError(
+        f"Unknown AI cache backend: {backend}. "
+        f"Supported backends: 'mongo', 'disk', 'none'"
+    )
@@ -7,6 +7,8 @@ import os
 from typing import Optional
 from dotenv import load_dotenv
 from .ai_provider import BaseAIProvider
+from .ai_cache import CachedAIProvider, create_response_cache
+from .ai_resilience import FailoverAIProvider
 from .claude_provider import ClaudeProvider
 import logging
 
@@ -27,12 +29,18 @@ class AIProviderFactory:
     _instance: Optional[BaseAIProvider] = None
 
     @classmethod
-    def get_provider(cls) -> BaseAIProvider:
+    def get_provider(cls, bypass_cache: bool = False) -> BaseAIProvider:
         """
         Get AI provider instance (singleton pattern).
 
         The provider is determined by the AI_PROVIDER environment variable.
-        Supported providers: 'claude', 'openai'
+        Supported providers: 'claude', 'openai'. If AI_FALLBACK_PROVIDER names
+        the other one and it is configured too, it takes over while the first
+        is unavailable. Responses are cached unless AI_CACHE_BACKEND is 'none'.
+
+        Args:
+            bypass_cache: Skip cached responses ("give me a fresh take"); new
+                responses still replace the cached ones
 
         Returns:
             AI provider instance
@@ -42,6 +50,8 @@ class AIProviderFactory:
         """
         if cls._instance is None:
             cls._instance = cls._create_provider()
+        if bypass_cache and isinstance(cls._instance, (CachedAIProvider, FailoverAIProvider)):
+            return cls._instance.bypassing_cache()
         return cls._instance
 
     @classmethod
@@ -58,16 +68,44 @@ class AIProviderFactory:
         provider_name = os.getenv("AI_PROVIDER", "claude").lower()
 
         logger.info(f"Creating AI provider: {provider_name}")
+        cache = create_response_cache()
+        if cache is not None:
+            logger.info(f"Caching AI responses ({cache.__class__.__name__})")
+        provider = cls._with_cache(cls._create_named_provider(provider_name), cache)
+
+        fallback_name = os.getenv("AI_FALLBACK_PROVIDER", "").lower()
+        if fallback_name and fallback_name != provider_name:
+            try:
+                fallback = cls._create_named_provider(fallback_name)
+            except ValueError as e:
+                # Failover needs both providers configured; the primary still works alone
+                logger.warning(f"AI failover disabled, fallback provider {fallback_name} unavailable: {str(e)}")
+            else:
+                logger.info(f"Using fallback AI provider: {fallback_name}")
+                # Each provider gets its own cache view, so answers are keyed by
+                # the provider that actually gave them
+                provider = FailoverAIProvider(provider, cls._with_cache(fallback, cache))
+
+        return provider
+
+    @classmethod
+    def _with_cache(cls, provider: BaseAIProvider, cache) -> BaseAIProvider:
+        """Wrap provider in the response cache, if one is configured"""
+        if cache is None:
+            return provider
+        return CachedAIProvider(provider, cache)
 
+    @classmethod
+    def _create_named_provider(cls, provider_name: str) -> BaseAIProvider:
+        """Create the provider called provider_name ('claude' or 'openai')"""
         if provider_name == "claude":
             return cls._create_claude_provider()
         elif provider_name == "openai":
             return cls._create_openai_provider()
-        else:
-            raise ValueError(
-                f"Unknown AI provider: {provider_name}. "
-                f"Supported providers: 'claude', 'openai'"
-            )
+        raise ValueError(
+            f"Unknown AI provider: {provider_name}. "
+            f"Supported providers: 'claude', 'openai'"
+        )
 
     @classmethod
     def _create_claude_provider(cls) -> BaseAIProvider:
@@ -4,8 +4,9 @@ Defines the contract that all AI providers must implement
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-from pydantic import BaseModel, Field
+from typing import Dict, Any, List, NamedTuple, Optional, AsyncIterator, Iterator
+from pydantic import BaseModel, Field, ValidationError
+from .json_stream import JSONStreamEvent
 
 
 class TailoredExperience(BaseModel):
@@ -32,6 +33,67 @@ class TailoredResume(BaseModel):
     )
 
 
+class TailoredApplication(BaseModel):
+    """Tailored resume and cover letter produced together"""
+    tailored_resume: TailoredResume
+    cover_letter: str
+
+
+class Prompt(NamedTuple):
+    """
+    A prompt split by how often each part changes, most stable first.
+
+    Sent in this order, instructions and profile form a prefix that is the
+    same for every call a user makes (tailoring, cover letter, combined), so
+    the provider's prompt cache can serve it instead of reprocessing it.
+    """
+    # Task guides and formatting rules; the same for every call
+    instructions: str
+    # The candidate's master profile; the same across a user's generations
+    profile: str
+    # Job posting and the task for this call
+    request: str
+
+
+class ApplicationStreamEvent(BaseModel):
+    """
+    A part of a streamed tailoring, sent as soon as it is complete.
+
+    kind is 'summary' (data: str), 'experience' (data: TailoredExperience,
+    index: its position), 'cover_letter' (data: str) or, last, 'complete'
+    (data: the full TailoredApplication).
+    """
+    kind: str
+    data: Any
+    index: Optional[int] = None
+
+
+def application_stream_event(part: JSONStreamEvent) -> Optional[ApplicationStreamEvent]:
+    """Stream event for a completed part of the combined JSON response, if it is one the client shows"""
+    if part.key == 'tailored_summary' and part.index is None and isinstance(part.value, str):
+        return ApplicationStreamEvent(kind='summary', data=part.value)
+    if part.key == 'cover_letter' and part.index is None and isinstance(part.value, str):
+        return ApplicationStreamEvent(kind='cover_letter', data=part.value.strip())
+    if part.key == 'tailored_experience' and part.index is not None and isinstance(part.value, dict):
+        try:
+            return ApplicationStreamEvent(
+                kind='experience', data=TailoredExperience(**part.value), index=part.index
+            )
+        except ValidationError:
+            return None
+    return None
+
+
+def application_stream_events(application: TailoredApplication) -> Iterator[ApplicationStreamEvent]:
+    """The stream events for an application that is already complete"""
+    resume = application.tailored_resume
+    yield ApplicationStreamEvent(kind='summary', data=resume.tailored_summary)
+    for index, experience in enumerate(resume.tailored_experience):
+        yield ApplicationStreamEvent(kind='experience', data=experience, index=index)
+    yield ApplicationStreamEvent(kind='cover_letter', data=application.cover_letter)
+    yield ApplicationStreamEvent(kind='complete', data=application)
+
+
 class BaseAIProvider(ABC):
     """
     Abstract base class for AI providers.
@@ -40,6 +102,10 @@ class BaseAIProvider(ABC):
     class and implement the required methods.
     """
 
+    # Bump when a prompt or its parsing changes, so cached responses made
+    # with the old prompts are no longer used
+    PROMPT_VERSION = "2"
+
     def __init__(self, api_key: str, model: str = None):
         """
         Initialize AI provider.
@@ -104,6 +170,67 @@ class BaseAIProvider(ABC):
         """
         pass
 
+    async def tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredApplication:
+        """
+        Tailor the resume and write the cover letter.
+
+        Providers override this to produce both in a single model call, which
+        sends the job description once and saves a full round trip. This
+        default makes the two calls in turn.
+
+        Args:
+            master_profile: Complete user profile dictionary
+            job_description: Full text of the job posting
+            company_name: Name of the company
+            position: Job title/position
+
+        Returns:
+            TailoredApplication with the tailored resume and cover letter
+        """
+        tailored_resume = await self.tailor_resume(
+            master_profile, job_description, company_name, position
+        )
+        cover_letter = await self.generate_cover_letter(
+            master_profile, job_description, company_name, position, tailored_resume
+        )
+        return TailoredApplication(tailored_resume=tailored_resume, cover_letter=cover_letter)
+
+    async def stream_tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> AsyncIterator[ApplicationStreamEvent]:
+        """
+        Tailor the resume and write the cover letter, yielding each part as it completes.
+
+        Providers with a streaming API override this to yield the summary,
+        each experience and the cover letter while the response is still
+        being generated. This default yields them all once
+        tailor_resume_and_cover_letter returns.
+
+        Args:
+            master_profile: Complete user profile dictionary
+            job_description: Full text of the job posting
+            company_name: Name of the company
+            position: Job title/position
+
+        Yields:
+            ApplicationStreamEvent objects, ending with a 'complete' event
+        """
+        application = await self.tailor_resume_and_cover_letter(
+            master_profile, job_description, company_name, position
+        )
+        for event in application_stream_events(application):
+            yield event
+
     @abstractmethod
     async def health_check(self) -> bool:
         """
@@ -0,0 +1,395 @@
+"""
+AI Provider Resilience
+Retries with backoff, a circuit breaker per provider, and failover between providers
+
+A rate limit or a timeout from the AI service used to fail the whole
+generation, and the frontend would rerun the pipeline from scratch. Transient
+failures are now retried with jittered exponential backoff (waiting as long
+as the service asks via retry-after). When a provider keeps failing, its
+circuit opens and calls fail fast until it has had time to recover, and a
+fallback provider (AI_FALLBACK_PROVIDER) can answer in the meantime.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+
+import httpx
+
+from .ai_provider import (
+    BaseAIProvider, TailoredResume, TailoredApplication, ApplicationStreamEvent
+)
+from .ai_cache import CachedAIProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rate limits, timeouts, server errors and Anthropic's 529 "overloaded"
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+class AIServiceError(Exception):
+    """
+    Raised when the AI service fails a request.
+
+    retryable says whether the same request may succeed later (rate limits,
+    timeouts, server errors); retry_after is how long the service asked us
+    to wait, in seconds, if it said.
+    """
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(AIServiceError):
+    """Raised without calling the service while its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            f"AI service ({name}) is unavailable - please try again shortly",
+            retryable=True, retry_after=retry_after
+        )
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Delay asked for by a response, from retry-after-ms or retry-after
+    (seconds or an HTTP date), or None.
+    """
+    try:
+        if headers.get("retry-after-ms"):
+            return max(float(headers["retry-after-ms"]) / 1000, 0.0)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def status_error(response: httpx.Response, message: str) -> AIServiceError:
+    """Error for an unsuccessful API response, retryable by status code"""
+    return AIServiceError(
+        message,
+        retryable=response.status_code in RETRYABLE_STATUS_CODES,
+        retry_after=retry_after_seconds(response.headers)
+    )
+
+
+def transport_error(e: httpx.TransportError) -> AIServiceError:
+    """Error for a request that got no response (timeout, connection failure)"""
+    if isinstance(e, httpx.TimeoutException):
+        return AIServiceError("AI service timeout - please try again", retryable=True)
+    return AIServiceError(f"Failed to call AI service: {str(e)}", retryable=True)
+
+
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff"""
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float):
+        """
+        Initialize retry policy.
+
+        Args:
+            attempts: Total attempts per call, including the first
+            base_delay: Backoff ceiling before the first retry, in seconds
+            max_delay: Longest wait before a retry; a longer retry-after fails the call instead
+        """
+        self.attempts = max(attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: AIServiceError) -> Optional[float]:
+        """
+        Seconds to wait before retrying after failed attempt `attempt` (0-based),
+        or None if the call should fail now.
+        """
+        if not error.retryable or attempt + 1 >= self.attempts:
+            return None
+        if error.retry_after is not None:
+            return error.retry_after if error.retry_after <= self.max_delay else None
+        # Full jitter, so concurrent requests that failed together don't retry together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a provider is down.
+
+    Opens after `failure_threshold` consecutive retryable failures. While
+    open, calls are rejected without reaching the service; once
+    `reset_timeout` has passed, one call at a time is let through as a trial
+    (half-open), closing the circuit if it succeeds and reopening it if not.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.reset_timeout else "half_open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now"""
+        if self.opened_at is None:
+            return
+        waited = time.monotonic() - self.opened_at
+        if waited < self.reset_timeout:
+            raise CircuitOpenError(self.name, self.reset_timeout - waited)
+        # Half-open: this call is the trial; restarting the window keeps
+        # other calls out until it resolves (or another window passes)
+        self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"AI service ({self.name}) circuit closed")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"AI service ({self.name}) circuit opened after {self.failures} failures; "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+            self.opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """Runs one provider's API requests under its retry policy and circuit breaker"""
+
+    def __init__(self, name: str, retry_policy: RetryPolicy, circuit_breaker: CircuitBreaker):
+        self.name = name
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+
+    @classmethod
+    def from_env(cls, name: str) -> "ResilientCaller":
+        """
+        Configure from AI_RETRY_ATTEMPTS, AI_RETRY_BASE_DELAY, AI_RETRY_MAX_DELAY,
+        AI_CIRCUIT_FAILURE_THRESHOLD and AI_CIRCUIT_RESET_SECONDS.
+        """
+        return cls(
+            name,
+            RetryPolicy(
+                attempts=int(os.getenv("AI_RETRY_ATTEMPTS", "3")),
+                base_delay=float(os.getenv("AI_RETRY_BASE_DELAY", "0.5")),
+                max_delay=float(os.getenv("AI_RETRY_MAX_DELAY", "8")),
+            ),
+            CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("AI_CIRCUIT_RESET_SECONDS", "30")),
+            ),
+        )
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make a request, retrying transient failures.
+
+        Args:
+            request: Makes one attempt; raises AIServiceError when the service fails it
+
+        Returns:
+            The result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            try:
+                result = await request()
+            except AIServiceError as e:
+                await self._after_failure(attempt, e)
+                attempt += 1
+                continue
+            except Exception:
+                # The service answered; the answer just wasn't usable
+                self.circuit_breaker.record_success()
+                raise
+            self.circuit_breaker.record_success()
+            return result
+
+    async def stream(self, request: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """
+        Stream a response, retrying transient failures until the first item arrives.
+
+        Once an item has been yielded, a failure is raised as is: the caller
+        has already passed it on, so the response can't be restarted.
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            started = False
+            try:
+                async for item in request():
+                    started = True
+                    yield item
+            except AIServiceError as e:
+                if started:
+                    self._record(e)
+                    raise
+                await self._after_failure(attempt, e)
+                attempt += 1
+                continue
+            except Exception:
+                self.circuit_breaker.record_success()
+                raise
+            self.circuit_breaker.record_success()
+            return
+
+    def _record(self, error: AIServiceError) -> None:
+        if error.retryable:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    async def _after_failure(self, attempt: int, error: AIServiceError) -> None:
+        """Record a failed attempt and wait before the next, or re-raise if there is none"""
+        self._record(error)
+        delay = self.retry_policy.delay(attempt, error)
+        if delay is None:
+            raise error
+        logger.warning(
+            f"AI service ({self.name}) attempt {attempt + 1} failed: {str(error)}; retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+
+
+def _bypassing_cache(provider: BaseAIProvider) -> BaseAIProvider:
+    if isinstance(provider, CachedAIProvider):
+        return provider.bypassing_cache()
+    return provider
+
+
+def should_fail_over(error: Exception) -> bool:
+    """Whether another provider might succeed where this one failed"""
+    return isinstance(error, AIServiceError) and error.retryable
+
+
+class FailoverAIProvider(BaseAIProvider):
+    """
+    AI provider that falls back to a second provider when the first is unavailable.
+
+    Only transient failures (after the primary's own retries) and open
+    circuits fail over; errors the fallback would repeat, such as an invalid
+    API key or an unusable response, are raised as is. Response caching, if
+    any, belongs inside: each provider wrapped in its own CachedAIProvider,
+    so a fallback answer is never stored as the primary's.
+    """
+
+    def __init__(self, primary: BaseAIProvider, fallback: BaseAIProvider):
+        """
+        Pair two providers.
+
+        Args:
+            primary: Provider tried first
+            fallback: Provider used when the primary is unavailable
+        """
+        super().__init__(primary.api_key, primary.model)
+        self.primary = primary
+        self.fallback = fallback
+
+    def bypassing_cache(self) -> "FailoverAIProvider":
+        """A view of this pair for a fresh take (see CachedAIProvider.bypassing_cache)"""
+        return FailoverAIProvider(_bypassing_cache(self.primary), _bypassing_cache(self.fallback))
+
+    async def _with_failover(self, operation: str, call: Callable[[BaseAIProvider], Awaitable[T]]) -> T:
+        try:
+            return await call(self.primary)
+        except Exception as e:
+            if not should_fail_over(e):
+                raise
+            logger.warning(
+                f"{operation} failed on {self.primary.__class__.__name__} ({str(e)}); "
+                f"failing over to {self.fallback.__class__.__name__}"
+            )
+            return await call(self.fallback)
+
+    async def tailor_resume(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredResume:
+        return await self._with_failover("Resume tailoring", lambda provider: provider.tailor_resume(
+            master_profile, job_description, company_name, position
+        ))
+
+    async def generate_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str,
+        tailored_resume: TailoredResume
+    ) -> str:
+        return await self._with_failover("Cover letter generation", lambda provider: provider.generate_cover_letter(
+            master_profile, job_description, company_name, position, tailored_resume
+        ))
+
+    async def tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredApplication:
+        return await self._with_failover(
+            "Resume tailoring and cover letter",
+            lambda provider: provider.tailor_resume_and_cover_letter(
+                master_profile, job_description, company_name, position
+            )
+        )
+
+    async def stream_tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> AsyncIterator[ApplicationStreamEvent]:
+        started = False
+        try:
+            async for event in self.primary.stream_tailor_resume_and_cover_letter(
+                master_profile, job_description, company_name, position
+            ):
+                started = True
+                yield event
+            return
+        except Exception as e:
+            # Events already sent can't be taken back, so only fail over before the first
+            if started or not should_fail_over(e):
+                raise
+            logger.warning(
+                f"Streaming resume tailoring failed on {self.primary.__class__.__name__} ({str(e)}); "
+                f"failing over to {self.fallback.__class__.__name__}"
+            )
+
+        async for event in self.fallback.stream_tailor_resume_and_cover_letter(
+            master_profile, job_description, company_name, position
+        ):
+            yield event
+
+    async def health_check(self) -> bool:
+        if await self.primary.health_check():
+            return True
+        return await self.fallback.health_check()
@@ -0,0 +1,113 @@
+"""
+AI Token Usage
+Per-call token counts, including prompt tokens served from the provider's prompt cache
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenUsage(NamedTuple):
+    """
+    Token counts of one API call, normalized across providers.
+
+    prompt_tokens counts the whole prompt; cached_prompt_tokens is the part
+    read from the prompt cache and cache_write_tokens the part written to it
+    (Claude bills both differently from uncached input; OpenAI writes
+    implicitly and reports 0).
+    """
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    cache_write_tokens: int = 0
+    completion_tokens: int = 0
+
+    @classmethod
+    def from_claude(cls, usage: Dict[str, Any]) -> "TokenUsage":
+        """From a Claude usage object (input_tokens excludes cache reads and writes)"""
+        cached = usage.get("cache_read_input_tokens") or 0
+        written = usage.get("cache_creation_input_tokens") or 0
+        return cls(
+            (usage.get("input_tokens") or 0) + cached + written,
+            cached,
+            written,
+            usage.get("output_tokens") or 0,
+        )
+
+    @classmethod
+    def from_openai(cls, usage: Dict[str, Any]) -> "TokenUsage":
+        """From an OpenAI usage object (prompt_tokens includes cached tokens)"""
+        details = usage.get("prompt_tokens_details") or {}
+        return cls(
+            usage.get("prompt_tokens") or 0,
+            details.get("cached_tokens") or 0,
+            0,
+            usage.get("completion_tokens") or 0,
+        )
+
+
+class AIUsageMetrics:
+    """Thread-safe token counters by provider and operation"""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, operation: str, usage: TokenUsage) -> None:
+        """Add one call's usage and log it as a structured line"""
+        key = (provider, operation)
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            totals = self._tokens.setdefault(key, [0] * len(TokenUsage._fields))
+            for index, count in enumerate(usage):
+                totals[index] += count
+        logger.info(f"AI usage: {json.dumps({'provider': provider, 'operation': operation, **usage._asdict()})}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals grouped by provider, then operation, with the share of prompt tokens read from cache"""
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for (provider, operation), totals in sorted(self._tokens.items()):
+                usage = TokenUsage(*totals)
+                result.setdefault(provider, {})[operation] = {
+                    "calls": self._calls[(provider, operation)],
+                    **usage._asdict(),
+                    "cache_hit_ratio": (
+                        usage.cached_prompt_tokens / usage.prompt_tokens if usage.prompt_tokens else None
+                    ),
+                }
+            return result
+
+    def render_prometheus(self, prefix: str = "resume_vault_ai") -> str:
+        """Render the counters in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# TYPE {prefix}_calls_total counter")
+            for (provider, operation), count in sorted(self._calls.items()):
+                lines.append(f'{prefix}_calls_total{{provider="{provider}",operation="{operation}"}} {count}')
+
+            for index, field in enumerate(TokenUsage._fields):
+                metric = f"{prefix}_{field}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (provider, operation), totals in sorted(self._tokens.items()):
+                    lines.append(f'{metric}{{provider="{provider}",operation="{operation}"}} {totals[index]}')
+
+        return "\n".join(lines) + "\n"
+
+
+_ai_usage_metrics: Optional[AIUsageMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_ai_usage_metrics() -> AIUsageMetrics:
+    """Get the process-wide AI usage counters"""
+    global _ai_usage_metrics
+    if _ai_usage_metrics is None:
+        with _metrics_lock:
+            if _ai_usage_metrics is None:
+                _ai_usage_metrics = AIUsageMetrics()
+    return _ai_usage_metrics
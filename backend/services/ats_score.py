@@ -0,0 +1,38 @@
+"""
+ATS Score Estimates
+Heuristic ATS scores shown for generated resumes and cover letters
+"""
+
+from typing import Any, Dict
+
+
+def calculate_resume_ats_score(tailored_resume: Any, profile: Dict[str, Any]) -> int:
+    """Calculate estimated ATS score for resume"""
+    base_score = 60
+    keyword_count = len(tailored_resume.keyword_matches) if hasattr(tailored_resume, 'keyword_matches') else 0
+    experience_count = len(tailored_resume.tailored_experience) if hasattr(tailored_resume, 'tailored_experience') else 0
+
+    keyword_bonus = min(keyword_count * 2, 15)
+    experience_bonus = min(experience_count * 3, 15)
+
+    has_summary = bool(tailored_resume.tailored_summary) if hasattr(tailored_resume, 'tailored_summary') else False
+    summary_bonus = 5 if has_summary else 0
+
+    total_score = base_score + keyword_bonus + experience_bonus + summary_bonus
+    return min(total_score, 95)
+
+
+def calculate_cover_letter_ats_score(tailored_resume: Any, cover_letter: str) -> int:
+    """Calculate estimated ATS score for cover letter"""
+    base_score = 65
+    keyword_count = len(tailored_resume.keyword_matches[:8]) if hasattr(tailored_resume, 'keyword_matches') else 0
+    keyword_bonus = min(keyword_count * 2, 16)
+
+    has_content = len(cover_letter) > 100
+    content_bonus = 8 if has_content else 0
+
+    is_proper_length = 200 <= len(cover_letter) <= 600
+    length_bonus = 3 if is_proper_length else 0
+
+    total_score = base_score + keyword_bonus + content_bonus + length_bonus
+    return min(total_score, 92)
@@ -6,8 +6,14 @@ Uses Claude API for resume tailoring and cover letter generation
 import httpx
 import json
 import os
-from typing import Dict, Any
-from .ai_provider import BaseAIProvider, TailoredResume, TailoredExperience
+from typing import Dict, Any, AsyncIterator, Union
+from .ai_provider import (
+    BaseAIProvider, Prompt, TailoredResume, TailoredExperience, TailoredApplication,
+    ApplicationStreamEvent, application_stream_event
+)
+from .ai_resilience import AIServiceError, ResilientCaller, status_error, transport_error
+from .ai_usage import TokenUsage, get_ai_usage_metrics
+from .json_stream import JSONObjectStream
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +35,10 @@ class ClaudeProvider(BaseAIProvider):
         """
         super().__init__(api_key, model or self.DEFAULT_MODEL)
         timeout = float(os.getenv("AI_TIMEOUT", "60"))
+
+        # ANTHROPIC_BASE_URL points the provider elsewhere, e.g. at a local mock API server
+        base_url = os.getenv("ANTHROPIC_BASE_URL")
+        self.api_url = f"{base_url.rstrip('/')}/v1/messages" if base_url else self.BASE_URL
         
         # Create client with SSL verification disabled if needed (for development)
         # In production, you should fix SSL certificate issues properly
@@ -39,6 +49,7 @@ class ClaudeProvider(BaseAIProvider):
             verify=verify_ssl
         )
         self.max_tokens = int(os.getenv("AI_MAX_TOKENS", "4096"))
+        self.resilience = ResilientCaller.from_env("claude")
         
         if not verify_ssl:
             logger.warning("SSL verification is disabled - this should only be used in development!")
@@ -69,7 +80,7 @@ class ClaudeProvider(BaseAIProvider):
         )
 
         try:
-            response = await self._call_api(prompt)
+            response = await self._call_api(prompt, operation="tailoring")
             tailored = self._parse_tailoring_response(response)
             logger.info(f"Successfully tailored resume with {len(tailored.tailored_experience)} experiences")
             return tailored
@@ -105,7 +116,7 @@ class ClaudeProvider(BaseAIProvider):
         )
 
         try:
-            response = await self._call_api(prompt)
+            response = await self._call_api(prompt, operation="cover_letter")
             cover_letter = self._parse_text_response(response)
             logger.info("Successfully generated cover letter")
             return cover_letter
@@ -113,77 +124,109 @@ class ClaudeProvider(BaseAIProvider):
             logger.error(f"Error generating cover letter: {str(e)}", exc_info=True)
             raise
 
-    async def health_check(self) -> bool:
+    async def tailor_resume_and_cover_letter(
+        self,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
+        position: str
+    ) -> TailoredApplication:
         """
-        Verify API connectivity and credentials.
+        Tailor resume and write the cover letter in a single Claude call.
+
+        Args:
+            master_profile: Complete user profile dictionary
+            job_description: Full text of the job posting
+            company_name: Name of the company
+            position: Job title/position
 
         Returns:
-            True if API is accessible, False otherwise
+            TailoredApplication with the tailored resume and cover letter
         """
+        logger.info(f"Tailoring resume and cover letter for {company_name} - {position}")
+
+        prompt = self._build_tailoring_prompt(
+            master_profile, job_description, company_name, position, with_cover_letter=True
+        )
+
         try:
-            test_prompt = "Respond with 'OK' if you can read this message."
-            response = await self._call_api(test_prompt, max_tokens=10)
-            return response is not None
+            response = await self._call_api(prompt, operation="application")
+            application = self._parse_combined_response(response)
+            logger.info(
+                f"Successfully tailored resume with {len(application.tailored_resume.tailored_experience)} "
+                f"experiences and cover letter"
+            )
+            return application
         except Exception as e:
-            logger.error(f"Health check failed: {str(e)}")
-            return False
+            logger.error(f"Error tailoring resume and cover letter: {str(e)}", exc_info=True)
+            raise
 
-    def _build_tailoring_prompt(
+    async def stream_tailor_resume_and_cover_letter(
         self,
-        profile: Dict[str, Any],
-        jd: str,
-        company: str,
+        master_profile: Dict[str, Any],
+        job_description: str,
+        company_name: str,
         position: str
-    ) -> str:
-        """Construct detailed prompt for resume tailoring"""
-
-        # Extract profile data
-        personal_info = profile.get('personalInfo', {})
-        first_name = personal_info.get('firstName', '')
-        last_name = personal_info.get('lastName', '')
-        summary = profile.get('summary', '')
-        headline = profile.get('professionalHeadline', '')
-
-        # Format work experience
-        experiences = profile.get('workExperience', [])
-        experience_text = self._format_work_experiences(experiences)
-
-        # Format skills
-        skills = profile.get('skills', [])
-        skills_text = ', '.join([s.get('name', '') for s in skills]) if skills else 'Not specified'
+    ) -> AsyncIterator[ApplicationStreamEvent]:
+        """
+        Tailor resume and write the cover letter in a single streamed Claude call.
 
-        # Format education
-        education = profile.get('education', [])
-        education_text = self._format_education(education)
+        The JSON is parsed as it streams in, so the summary and each
+        experience are yielded as soon as Claude finishes writing them.
 
-        # Format certifications
-        certifications = profile.get('certifications', [])
-        cert_text = self._format_certifications(certifications)
-
-        return f"""You are an expert resume writer and ATS optimization specialist. Analyze this job description and tailor the candidate's resume content to maximize their chances of success.
+        Yields:
+            ApplicationStreamEvent objects, ending with a 'complete' event
+        """
+        logger.info(f"Streaming resume tailoring and cover letter for {company_name} - {position}")
 
-JOB POSTING:
-Company: {company}
-Position: {position}
-Description: {jd}
+        prompt = self._build_tailoring_prompt(
+            master_profile, job_description, company_name, position, with_cover_letter=True
+        )
 
-CANDIDATE PROFILE:
-Name: {first_name} {last_name}
-Professional Headline: {headline}
-Current Summary: {summary}
+        try:
+            parser = JSONObjectStream()
+            text = []
+            async for delta in self._stream_api(prompt, operation="application"):
+                text.append(delta)
+                for part in parser.feed(delta):
+                    event = application_stream_event(part)
+                    if event is not None:
+                        yield event
+
+            # Parse the whole text as a non-streamed response, so the result
+            # is exactly what tailor_resume_and_cover_letter would return
+            application = self._parse_combined_response({"content": [{"type": "text", "text": "".join(text)}]})
+            logger.info(
+                f"Successfully streamed resume with {len(application.tailored_resume.tailored_experience)} "
+                f"experiences and cover letter"
+            )
+            yield ApplicationStreamEvent(kind='complete', data=application)
+        except Exception as e:
+            logger.error(f"Error streaming resume tailoring: {str(e)}", exc_info=True)
+            raise
 
-Work Experience:
-{experience_text}
+    async def health_check(self) -> bool:
+        """
+        Verify API connectivity and credentials.
 
-Skills: {skills_text}
+        Returns:
+            True if API is accessible, False otherwise
+        """
+        try:
+            test_prompt = "Respond with 'OK' if you can read this message."
+            response = await self._call_api(test_prompt, max_tokens=10, operation="health_check")
+            return response is not None
+        except Exception as e:
+            logger.error(f"Health check failed: {str(e)}")
+            return False
 
-Education:
-{education_text}
+    # Static part of every prompt, sent as the system prompt. Nothing in it
+    # varies per call, so it is the start of the cached prefix.
+    INSTRUCTIONS = """You are an expert resume writer, ATS optimization specialist and cover letter writer. The user message gives you a candidate profile, then a job posting and the task to perform. Follow the guide below for that task.
 
-Certifications:
-{cert_text}
+RESUME TAILORING
+Analyze the job description and tailor the candidate's resume content to maximize their chances of success:
 
-TASK:
 1. PROFESSIONAL SUMMARY (3-4 sentences):
    - Rewrite to emphasize the most relevant qualifications for THIS specific role
    - Include 2-3 key achievements with metrics if possible
@@ -205,28 +248,74 @@ TASK:
 4. STRATEGIC RECOMMENDATIONS:
    Provide 2-3 specific, actionable suggestions to strengthen this application based on gaps or opportunities you've identified.
 
-CRITICAL TEXT FORMATTING RULES:
-- AVOID these LaTeX special characters in your output: ampersand, percent, dollar, hash, underscore, braces, tilde, caret, backslash
-- Use "and" instead of ampersand symbol
-- Use "percent" or write out percentages as "50 percent" instead of using percent symbol
-- Use regular quotes instead of special quote characters
-- Use plain hyphens for ranges (2020-2023) not em-dashes
-- Do NOT use any markup, markdown, or special formatting
-- Write in plain text only
-
 CRITICAL: Return ONLY valid JSON matching this exact structure (no markdown, no code blocks, just pure JSON):
-{{
+{
     "tailored_summary": "The rewritten professional summary optimized for this role",
     "tailored_experience": [
-        {{
+        {
             "jobTitle": "exact job title from candidate profile",
             "companyName": "exact company name from candidate profile",
             "tailored_bullets": ["bullet point 1", "bullet point 2", "bullet point 3"]
-        }}
+        }
     ],
     "keyword_matches": ["keyword1", "keyword2", "keyword3"],
     "recommendations": "Strategic recommendations as a single string with newlines for separation"
-}}"""
+}
+
+COVER LETTER
+Create a compelling, personalized cover letter for this job application. Write a professional cover letter (3-4 paragraphs) that:
+1. Opens with a strong hook that shows genuine interest in the role and company
+2. Highlights 2-3 most relevant achievements or experiences (be specific and quantitative)
+3. Demonstrates understanding of the company's needs and how the candidate can address them
+4. Closes with enthusiasm and a clear call to action
+5. Maintains a professional yet personable tone
+6. Keeps total length to 300-400 words
+
+CRITICAL FORMATTING REQUIREMENTS:
+- Use "Dear Hiring Manager," as the salutation
+- End with "Sincerely," followed by the candidate's ACTUAL name from the candidate profile
+- DO NOT use placeholders like "[Your Name]" - use the real name provided
+- DO NOT include any brackets, placeholders, or generic text
+
+Return ONLY the cover letter text, no JSON, no additional commentary.
+
+RESUME TAILORING WITH COVER LETTER
+Do the RESUME TAILORING task, then write a cover letter following the COVER LETTER guide that builds on the tailored summary and bullets. Return ONLY the JSON object described under RESUME TAILORING, with one more field after "recommendations":
+    "cover_letter": "The complete cover letter, paragraphs separated by blank lines"
+
+CRITICAL TEXT FORMATTING RULES (all tasks):
+- AVOID these LaTeX special characters in your output: ampersand, percent, dollar, hash, underscore, braces, tilde, caret, backslash
+- Use "and" instead of ampersand symbol
+- Use "percent" or write out percentages as "50 percent" instead of using percent symbol
+- Use regular quotes instead of special quote characters
+- Use plain hyphens for ranges (2020-2023) not em-dashes
+- Do NOT use any markup, markdown, or special formatting
+- Write in plain text only"""
+
+    def _build_tailoring_prompt(
+        self,
+        profile: Dict[str, Any],
+        jd: str,
+        company: str,
+        position: str,
+        with_cover_letter: bool = False
+    ) -> Prompt:
+        """
+        Construct detailed prompt for resume tailoring.
+
+        With with_cover_letter, the model also writes the cover letter and
+        returns it in the same JSON object (see _parse_combined_response).
+        """
+        if with_cover_letter:
+            task = "TASK: RESUME TAILORING WITH COVER LETTER. Return ONLY the JSON object, including cover_letter."
+        else:
+            task = "TASK: RESUME TAILORING. Return ONLY the JSON object."
+
+        return Prompt(
+            self.INSTRUCTIONS,
+            self._format_profile(profile),
+            f"{self._format_job_posting(jd, company, position)}\n\n{task}"
+        )
 
     def _build_cover_letter_prompt(
         self,
@@ -235,98 +324,224 @@ CRITICAL: Return ONLY valid JSON matching this exact structure (no markdown, no
         company: str,
         position: str,
         tailored_resume: TailoredResume
-    ) -> str:
+    ) -> Prompt:
         """Construct prompt for cover letter generation"""
 
+        # Get key achievements from tailored resume
+        key_points = tailored_resume.keyword_matches[:5] if tailored_resume.keyword_matches else []
+
+        return Prompt(
+            self.INSTRUCTIONS,
+            self._format_profile(profile),
+            f"""{self._format_job_posting(jd, company, position)}
+
+TAILORED FOR THIS ROLE:
+Tailored Summary: {tailored_resume.tailored_summary}
+Key Strengths: {', '.join(key_points)}
+
+TASK: COVER LETTER. Return ONLY the cover letter text."""
+        )
+
+    def _format_profile(self, profile: Dict[str, Any]) -> str:
+        """
+        The candidate profile block, the per-user part of the cached prefix.
+
+        Only depends on the profile, so it is byte-identical across all of a
+        user's calls until they edit the profile.
+        """
+
+        # Extract profile data
         personal_info = profile.get('personalInfo', {})
         first_name = personal_info.get('firstName', '')
         last_name = personal_info.get('lastName', '')
+        summary = profile.get('summary', '')
+        headline = profile.get('professionalHeadline', '')
 
-        # Get key achievements from tailored resume
-        key_points = tailored_resume.keyword_matches[:5] if tailored_resume.keyword_matches else []
+        # Format work experience
+        experiences = profile.get('workExperience', [])
+        experience_text = self._format_work_experiences(experiences)
 
-        return f"""You are an expert cover letter writer. Create a compelling, personalized cover letter for this job application.
+        # Format skills
+        skills = profile.get('skills', [])
+        skills_text = ', '.join([s.get('name', '') for s in skills]) if skills else 'Not specified'
 
-JOB POSTING:
-Company: {company}
-Position: {position}
-Description: {jd}
+        # Format education
+        education = profile.get('education', [])
+        education_text = self._format_education(education)
+
+        # Format certifications
+        certifications = profile.get('certifications', [])
+        cert_text = self._format_certifications(certifications)
 
-CANDIDATE:
+        return f"""CANDIDATE PROFILE:
 Name: {first_name} {last_name}
-Tailored Summary: {tailored_resume.tailored_summary}
-Key Strengths: {', '.join(key_points)}
+Professional Headline: {headline}
+Current Summary: {summary}
 
-INSTRUCTIONS:
-Write a professional cover letter (3-4 paragraphs) that:
-1. Opens with a strong hook that shows genuine interest in the role and company
-2. Highlights 2-3 most relevant achievements or experiences (be specific and quantitative)
-3. Demonstrates understanding of the company's needs and how the candidate can address them
-4. Closes with enthusiasm and a clear call to action
-5. Maintains a professional yet personable tone
-6. Keeps total length to 300-400 words
+Work Experience:
+{experience_text}
 
-CRITICAL FORMATTING REQUIREMENTS:
-- Use "Dear Hiring Manager," as the salutation
-- End with "Sincerely," followed by the candidate's ACTUAL name: {first_name} {last_name}
-- DO NOT use placeholders like "[Your Name]" - use the real name provided above
-- DO NOT include any brackets, placeholders, or generic text
+Skills: {skills_text}
 
-CRITICAL TEXT FORMATTING RULES:
-- AVOID these LaTeX special characters: ampersand, percent, dollar, hash, underscore, braces, tilde, caret, backslash
-- Use "and" instead of ampersand symbol
-- Use "percent" or write out percentages as "50 percent" instead of using percent symbol
-- Use regular quotes instead of special quote characters
-- Use plain hyphens for ranges (2020-2023) not em-dashes
-- Do NOT use any markup, markdown, or special formatting
-- Write in plain text only
+Education:
+{education_text}
+
+Certifications:
+{cert_text}"""
 
-Return ONLY the cover letter text, no JSON, no additional commentary."""
+    def _format_job_posting(self, jd: str, company: str, position: str) -> str:
+        return f"""JOB POSTING:
+Company: {company}
+Position: {position}
+Description: {jd}"""
 
-    async def _call_api(self, prompt: str, max_tokens: int = None) -> Dict[str, Any]:
+    async def _call_api(
+        self,
+        prompt: Union[str, Prompt],
+        max_tokens: int = None,
+        operation: str = "other"
+    ) -> Dict[str, Any]:
         """
-        Make API request to Claude.
+        Make API request to Claude, retrying transient failures.
 
         Args:
             prompt: The prompt to send
             max_tokens: Maximum tokens to generate (optional)
+            operation: What the call is for, to label its token usage
 
         Returns:
             API response as dictionary
         """
-        headers = {
+        payload = self._payload(prompt, max_tokens)
+        data = await self.resilience.call(lambda: self._post(payload))
+        self._record_usage(data.get("usage"), operation)
+        return data
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """One attempt at an API request"""
+        try:
+            response = await self.client.post(self.api_url, headers=self._headers(), json=payload)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e)
+        except httpx.TransportError as e:
+            raise transport_error(e)
+        except Exception as e:
+            raise Exception(f"Failed to call AI service: {str(e)}")
+
+    async def _stream_api(
+        self,
+        prompt: Union[str, Prompt],
+        max_tokens: int = None,
+        operation: str = "other"
+    ) -> AsyncIterator[str]:
+        """
+        Make a streaming API request to Claude, retrying transient failures
+        until the first text arrives.
+
+        Args:
+            prompt: The prompt to send
+            max_tokens: Maximum tokens to generate (optional)
+            operation: What the call is for, to label its token usage
+
+        Yields:
+            Text of the response as Claude generates it
+        """
+        payload = {**self._payload(prompt, max_tokens), "stream": True}
+        usage: Dict[str, Any] = {}
+
+        async for text in self.resilience.stream(lambda: self._post_stream(payload, usage)):
+            yield text
+
+        self._record_usage(usage, operation)
+
+    async def _post_stream(self, payload: Dict[str, Any], usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """One attempt at a streaming API request, gathering token counts into usage"""
+        try:
+            async with self.client.stream("POST", self.api_url, headers=self._headers(), json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                # Server-sent events; the text arrives in content_block_delta events
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    if event.get("type") == "content_block_delta":
+                        delta = event.get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            yield delta.get("text", "")
+                    elif event.get("type") == "message_start":
+                        # Input and cache token counts come first...
+                        usage.update(event.get("message", {}).get("usage") or {})
+                    elif event.get("type") == "message_delta":
+                        # ...the final output count last
+                        usage.update(event.get("usage") or {})
+                    elif event.get("type") == "error":
+                        error = event.get("error", {})
+                        raise AIServiceError(
+                            f"AI service error: {error.get('message', event)}",
+                            retryable=error.get("type") in ("overloaded_error", "api_error", "rate_limit_error")
+                        )
+        except AIServiceError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e)
+        except httpx.TransportError as e:
+            raise transport_error(e)
+        except Exception as e:
+            raise Exception(f"Failed to call AI service: {str(e)}")
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json"
         }
 
+    def _payload(self, prompt: Union[str, Prompt], max_tokens: int = None) -> Dict[str, Any]:
         payload = {
             "model": self.model,
             "max_tokens": max_tokens or self.max_tokens,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
         }
 
-        try:
-            response = await self.client.post(
-                self.BASE_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                raise Exception("AI service rate limit exceeded - please wait and retry")
-            elif e.response.status_code == 401:
-                raise Exception("AI service authentication failed - check ANTHROPIC_API_KEY")
-            else:
-                raise Exception(f"AI service error: {e.response.status_code} - {e.response.text}")
-        except httpx.TimeoutException:
-            raise Exception("AI service timeout - please try again")
-        except Exception as e:
-            raise Exception(f"Failed to call AI service: {str(e)}")
+        if isinstance(prompt, Prompt):
+            # Cache breakpoints after the instructions (shared by every call)
+            # and after the profile (shared by one user's calls), so both are
+            # read from the prompt cache while it is warm
+            payload["system"] = [
+                {"type": "text", "text": prompt.instructions, "cache_control": {"type": "ephemeral"}}
+            ]
+            payload["messages"] = [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt.profile, "cache_control": {"type": "ephemeral"}},
+                        {"type": "text", "text": prompt.request}
+                    ]
+                }
+            ]
+        else:
+            payload["messages"] = [
+                {"role": "user", "content": prompt}
+            ]
+        return payload
+
+    def _record_usage(self, usage: Dict[str, Any], operation: str) -> None:
+        if usage:
+            get_ai_usage_metrics().record("claude", operation, TokenUsage.from_claude(usage))
+
+    def _status_error(self, e: httpx.HTTPStatusError) -> AIServiceError:
+        """Error to raise for an unsuccessful API response"""
+        if e.response.status_code == 429:
+            message = "AI service rate limit exceeded - please wait and retry"
+        elif e.response.status_code == 401:
+            message = "AI service authentication failed - check ANTHROPIC_API_KEY"
+        else:
+            message = f"AI service error: {e.response.status_code} - {e.response.text}"
+        return status_error(e.response, message)
 
     def _parse_tailoring_response(self, response: Dict) -> TailoredResume:
         """
@@ -338,6 +553,32 @@ Return ONLY the cover letter text, no JSON, no additional commentary."""
         Returns:
             TailoredResume object
         """
+        return self._tailored_resume_from_data(self._parse_json_response(response))
+
+    def _parse_combined_response(self, response: Dict) -> TailoredApplication:
+        """
+        Extract tailored content and the cover letter from Claude's response
+        to the combined prompt.
+
+        Args:
+            response: Raw API response
+
+        Returns:
+            TailoredApplication object
+        """
+        data = self._parse_json_response(response)
+        cover_letter = data.get('cover_letter')
+        if not isinstance(cover_letter, str) or not cover_letter.strip():
+            logger.error(f"Response content: {response}")
+            raise Exception("Invalid response from AI service: missing cover letter")
+
+        return TailoredApplication(
+            tailored_resume=self._tailored_resume_from_data(data),
+            cover_letter=cover_letter.strip()
+        )
+
+    def _parse_json_response(self, response: Dict) -> Dict[str, Any]:
+        """Extract the JSON object from Claude's response"""
         try:
             content = response['content'][0]['text']
 
@@ -361,8 +602,17 @@ Return ONLY the cover letter text, no JSON, no additional commentary."""
             
             # Parse JSON with strict=False to be more lenient
             data = json.loads(content, strict=False)
+            if not isinstance(data, dict):
+                raise TypeError(f"expected a JSON object, got {type(data).__name__}")
+            return data
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Failed to parse AI response: {str(e)}")
+            logger.error(f"Response content: {response}")
+            raise Exception(f"Invalid response from AI service: {str(e)}")
 
-            # Convert to TailoredResume model
+    def _tailored_resume_from_data(self, data: Dict[str, Any]) -> TailoredResume:
+        """Convert the parsed JSON object to a TailoredResume"""
+        try:
             tailored_exp = [
                 TailoredExperience(**exp) for exp in data.get('tailored_experience', [])
             ]
@@ -373,9 +623,9 @@ Return ONLY the cover letter text, no JSON, no additional commentary."""
                 keyword_matches=data.get('keyword_matches', []),
                 recommendations=data.get('recommendations', '')
             )
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (KeyError, TypeError) as e:
             logger.error(f"Failed to parse AI response: {str(e)}")
-            logger.error(f"Response content: {response}")
+            logger.error(f"Response content: {data}")
             raise Exception(f"Invalid response from AI service: {str(e)}")
 
     def _parse_text_response(self, response: Dict) -> str:
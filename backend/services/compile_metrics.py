@@ -0,0 +1,176 @@
+"""
+Compile Telemetry
+Per-compile stage timings and pdflatex log statistics aggregated into histograms
+"""
+
+import re
+import json
+import bisect
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+BYTES_BUCKETS = (
+    16 * 1024, 64 * 1024, 128 * 1024, 256 * 1024, 512 * 1024,
+    1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2, 256 * 1024 ** 2
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Histogram name -> bucket upper bounds
+HISTOGRAMS = {
+    "queue_wait_seconds": SECONDS_BUCKETS,
+    "write_seconds": SECONDS_BUCKETS,
+    "pdflatex_wall_seconds": SECONDS_BUCKETS,
+    "pdflatex_cpu_seconds": SECONDS_BUCKETS,
+    "pdflatex_peak_rss_bytes": BYTES_BUCKETS,
+    "pdf_pages": COUNT_BUCKETS,
+    "pdf_bytes": BYTES_BUCKETS,
+    "overfull_boxes": COUNT_BUCKETS,
+    "underfull_boxes": COUNT_BUCKETS,
+    "font_warnings": COUNT_BUCKETS,
+}
+
+_OUTPUT_WRITTEN = re.compile(r"Output written on .*?\((\d+) pages?, (\d+) bytes\)", re.DOTALL)
+_OVERFULL = re.compile(r"^Overfull \\[hv]box", re.MULTILINE)
+_UNDERFULL = re.compile(r"^Underfull \\[hv]box", re.MULTILINE)
+_FONT_WARNING = re.compile(r"Font Warning|Missing character", re.MULTILINE)
+
+
+def parse_pdflatex_log(log: str) -> Dict[str, int]:
+    """
+    Extract page count and warning counts from a pdflatex log.
+
+    Returns:
+        Dictionary with pdf_pages, overfull_boxes, underfull_boxes, font_warnings
+    """
+    output = _OUTPUT_WRITTEN.search(log)
+    return {
+        "pdf_pages": int(output.group(1)) if output else 0,
+        "overfull_boxes": len(_OVERFULL.findall(log)),
+        "underfull_boxes": len(_UNDERFULL.findall(log)),
+        "font_warnings": len(_FONT_WARNING.findall(log)),
+    }
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th quantile (0 < q <= 1)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class CompileMetrics:
+    """
+    Thread-safe registry of compile histograms.
+
+    Every histogram is labelled: compile stages by the template they were
+    compiled from (its preamble hash), queue wait by priority class. That makes
+    a template change that slows compiles show up as its own series.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, label: str) -> None:
+        """Record value in histogram `name` for `label`"""
+        with self._lock:
+            histogram = self._histograms.get((name, label))
+            if histogram is None:
+                histogram = Histogram(HISTOGRAMS[name])
+                self._histograms[(name, label)] = histogram
+            histogram.observe(value)
+
+    def record_compile(self, label: str, sample: Dict[str, float]) -> None:
+        """Record one compile's telemetry sample and log it as a structured line"""
+        for name, value in sample.items():
+            if name in HISTOGRAMS and value is not None:
+                self.observe(name, value, label)
+        logger.info(f"Compile telemetry: {json.dumps({'template': label, **sample})}")
+
+    def record_failure(self, label: str) -> None:
+        with self._lock:
+            self._failures[label] = self._failures.get(label, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Histogram summaries grouped by name, then label"""
+        with self._lock:
+            result: Dict[str, Any] = {"failures": dict(self._failures)}
+            for (name, label), histogram in sorted(self._histograms.items()):
+                result.setdefault(name, {})[label] = histogram.snapshot()
+            return result
+
+    def render_prometheus(self, prefix: str = "resume_vault_latex") -> str:
+        """Render all histograms in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            by_name: Dict[str, List[Tuple[str, Histogram]]] = {}
+            for (name, label), histogram in sorted(self._histograms.items()):
+                by_name.setdefault(name, []).append((label, histogram))
+
+            for name, series in by_name.items():
+                metric = f"{prefix}_{name}"
+                label_name = "priority" if name == "queue_wait_seconds" else "template"
+                lines.append(f"# TYPE {metric} histogram")
+                for label, histogram in series:
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{metric}_bucket{{{label_name}="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{{label_name}="{label}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{label_name}="{label}"}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{label_name}="{label}"}} {histogram.count}')
+
+            lines.append(f"# TYPE {prefix}_failures_total counter")
+            for label, count in sorted(self._failures.items()):
+                lines.append(f'{prefix}_failures_total{{template="{label}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+_compile_metrics: Optional[CompileMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_compile_metrics() -> CompileMetrics:
+    """Get the process-wide compile metrics registry"""
+    global _compile_metrics
+    if _compile_metrics is None:
+        with _metrics_lock:
+            if _compile_metrics is None:
+                _compile_metrics = CompileMetrics()
+    return _compile_metrics
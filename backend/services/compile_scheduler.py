@@ -0,0 +1,239 @@
+"""
+Compile Scheduler
+Runs blocking pdflatex jobs on a worker pool sized to the available cores,
+ordered by priority class with per-user fairness inside each class
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .compile_metrics import get_compile_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LaTeXCompilerBusy(Exception):
+    """Raised when the compile wait queue is full"""
+
+
+class CompilePriority(IntEnum):
+    """Priority classes, lower values run first"""
+    INTERACTIVE = 0  # on-screen previews the user is waiting for
+    DOWNLOAD = 1     # explicit PDF downloads
+    BACKGROUND = 2   # pre-rendering, bulk export, format builds
+
+
+def available_cores() -> int:
+    """Number of CPUs this process may run on (respects container affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class CompileJob:
+    """A queued or running compile; await job.future for its result"""
+
+    def __init__(self, fn: Callable[[], Any], priority: CompilePriority, user_id: Optional[str]):
+        self.fn = fn
+        self.priority = priority
+        self.user_id = user_id or "anonymous"
+        self.enqueued_at = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Heap entry currently representing this job; replaced on promotion
+        self.entry: Optional[list] = None
+
+
+class CompileScheduler:
+    """
+    Priority scheduler for blocking compile jobs.
+
+    At most `workers` jobs run at once, each on its own executor thread that
+    waits for the pdflatex child process. Waiting jobs are ordered by priority
+    class, then by how many jobs the same user already has queued in that
+    class, then by arrival. A user queueing dozens of exports therefore only
+    delays other users by one job per turn, and never delays a higher class.
+    """
+
+    def __init__(self, workers: int, max_queued: int):
+        """
+        Initialize compile scheduler.
+
+        Args:
+            workers: Number of jobs that may run concurrently
+            max_queued: Maximum number of waiting jobs before submit() rejects
+        """
+        self.workers = workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdflatex")
+        self._queue: List[list] = []
+        self._queued = 0
+        self._running = 0
+        self._sequence = itertools.count()
+        self._queued_per_user: Dict[Tuple[CompilePriority, str], int] = {}
+        # Keeps running job tasks referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {
+            priority: {
+                "queued": 0,
+                "running": 0,
+                "completed": 0,
+                "failed": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+                "run_seconds_total": 0.0,
+                "run_seconds_max": 0.0
+            }
+            for priority in CompilePriority
+        }
+
+    def submit(
+        self,
+        fn: Callable[[], Any],
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> CompileJob:
+        """
+        Queue a blocking callable to run when a worker is free.
+
+        Args:
+            fn: Blocking callable, run on an executor thread
+            priority: Priority class of the job
+            user_id: Owner of the job, used for fairness within a class
+
+        Returns:
+            CompileJob whose future resolves to fn's result
+
+        Raises:
+            LaTeXCompilerBusy: If the wait queue is full
+        """
+        if self._running >= self.workers and self._queued >= self.max_queued:
+            logger.warning(f"LaTeX compile queue full ({self._queued} waiting)")
+            raise LaTeXCompilerBusy("PDF compiler is busy - please retry shortly")
+
+        job = CompileJob(fn, priority, user_id)
+        self._push(job)
+        self._queued += 1
+        self._stats[priority]["queued"] += 1
+        self._dispatch()
+        return job
+
+    def promote(self, job: CompileJob, priority: CompilePriority) -> None:
+        """Raise a waiting job to a more urgent class (e.g. a preview joins a pre-render)"""
+        if job.entry is None or priority >= job.priority:
+            return
+
+        self._release_rank(job)
+        self._stats[job.priority]["queued"] -= 1
+        job.entry[-1] = None  # leave the stale heap entry to be skipped
+        job.priority = priority
+        self._stats[priority]["queued"] += 1
+        self._push(job)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and run time per priority class"""
+        classes = {}
+        for priority, stats in self._stats.items():
+            finished = stats["completed"] + stats["failed"]
+            classes[priority.name.lower()] = {
+                **stats,
+                "wait_seconds_avg": stats["wait_seconds_total"] / finished if finished else 0.0,
+                "run_seconds_avg": stats["run_seconds_total"] / finished if finished else 0.0
+            }
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queued,
+            "max_queued": self.max_queued,
+            "classes": classes
+        }
+
+    def _push(self, job: CompileJob) -> None:
+        """Add job to the heap behind the user's other queued jobs in its class"""
+        key = (job.priority, job.user_id)
+        rank = self._queued_per_user.get(key, 0)
+        self._queued_per_user[key] = rank + 1
+        job.entry = [job.priority, rank, next(self._sequence), job]
+        heapq.heappush(self._queue, job.entry)
+
+    def _release_rank(self, job: CompileJob) -> None:
+        key = (job.priority, job.user_id)
+        remaining = self._queued_per_user.get(key, 1) - 1
+        if remaining:
+            self._queued_per_user[key] = remaining
+        else:
+            self._queued_per_user.pop(key, None)
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while workers are free"""
+        while self._running < self.workers and self._queue:
+            job = heapq.heappop(self._queue)[-1]
+            if job is None:
+                continue
+
+            job.entry = None
+            self._queued -= 1
+            self._release_rank(job)
+            self._stats[job.priority]["queued"] -= 1
+
+            if job.future.done():
+                # Cancelled while waiting
+                continue
+
+            self._running += 1
+            task = asyncio.get_running_loop().create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: CompileJob) -> None:
+        stats = self._stats[job.priority]
+        started_at = time.monotonic()
+        wait = started_at - job.enqueued_at
+        stats["wait_seconds_total"] += wait
+        stats["wait_seconds_max"] = max(stats["wait_seconds_max"], wait)
+        get_compile_metrics().observe("queue_wait_seconds", wait, job.priority.name.lower())
+        stats["running"] += 1
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, job.fn)
+        except Exception as e:
+            stats["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            stats["completed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            run = time.monotonic() - started_at
+            stats["run_seconds_total"] += run
+            stats["run_seconds_max"] = max(stats["run_seconds_max"], run)
+            stats["running"] -= 1
+            self._running -= 1
+            self._dispatch()
+
+
+_scheduler: Optional[CompileScheduler] = None
+
+
+def get_compile_scheduler() -> CompileScheduler:
+    """
+    Get the process-wide compile scheduler.
+
+    Sized by LATEX_MAX_CONCURRENT_COMPILES (default: available cores) and
+    LATEX_MAX_QUEUED_COMPILES (default: 20).
+    """
+    global _scheduler
+    if _scheduler is None:
+        workers = int(os.getenv("LATEX_MAX_CONCURRENT_COMPILES", str(available_cores())))
+        max_queued = int(os.getenv("LATEX_MAX_QUEUED_COMPILES", "20"))
+        _scheduler = CompileScheduler(workers=workers, max_queued=max_queued)
+        logger.info(f"Compile scheduler initialized ({workers} workers, queue {max_queued})")
+    return _scheduler
@@ -0,0 +1,80 @@
+"""
+Cover Letter LaTeX Generator Service
+Fills the cover letter template with the stored cover letter text
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .latex_escape import escape_latex_batch
+from .latex_generator import LaTeXResumeGenerator
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+class CoverLetterGenerator(LaTeXResumeGenerator):
+    """
+    Generate LaTeX cover letters.
+
+    Shares escaping and header formatting with the resume generator; the
+    template shares the resume template's preamble, so cover letters compile
+    against the same precompiled format.
+    """
+
+    TEMPLATE_ID = "cover_letter"
+
+    def generate_cover_letter_latex(
+        self,
+        profile: Dict[str, Any],
+        cover_letter_text: str,
+        company_name: str,
+        position: str,
+        date: Optional[datetime] = None
+    ) -> str:
+        """
+        Generate filled LaTeX cover letter.
+
+        Args:
+            profile: Master profile dictionary (for the header)
+            cover_letter_text: Plain-text letter; blank lines separate paragraphs
+            company_name: Company the letter is addressed to
+            position: Position applied for
+            date: Date printed on the letter (defaults to today). Pass a fixed
+                date, e.g. the version's creation time, to keep the output stable.
+
+        Returns:
+            Filled LaTeX source code as string
+        """
+        personal_info = profile.get('personalInfo', {})
+        full_name = f"{personal_info.get('firstName', '')} {personal_info.get('lastName', '')}"
+        date = date or datetime.utcnow()
+
+        latex_content = self.template.render({
+            'FULL_NAME': self._escape_latex(full_name),
+            'EMAIL': self._escape_latex(personal_info.get('email', '')),
+            'PHONE': self._escape_latex(personal_info.get('phone', '')),
+            'LINKEDIN': self._format_url(personal_info.get('linkedinUrl', '')),
+            'PORTFOLIO': self._format_url(personal_info.get('portfolioUrl', '')),
+            'DATE': f"{date:%B} {date.day}, {date.year}",
+            'COMPANY_NAME': self._escape_latex(company_name),
+            'POSITION': self._escape_latex(position),
+            'BODY': self._format_body(cover_letter_text),
+        })
+
+        return latex_content
+
+    def _format_body(self, text: str) -> str:
+        """Turn blank-line separated paragraphs into LaTeX paragraphs, keeping line breaks"""
+        paragraphs = []
+        for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+            lines = escape_latex_batch(line.strip() for line in paragraph.splitlines() if line.strip())
+            if lines:
+                paragraphs.append(' \\\\\n'.join(lines))
+
+        if not paragraphs:
+            return '% No cover letter content'
+        return '\n\n'.join(paragraphs)
@@ -0,0 +1,211 @@
+"""
+Incremental JSON Object Parser
+Reports the members of a JSON object as they complete while the text is still streaming in
+"""
+
+import re
+import json
+import logging
+from bisect import bisect_right
+from typing import Any, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Characters that end a run of plain string content
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Outside strings, whitespace is skipped in runs
+_NON_SPACE = re.compile(r'\S')
+
+
+class JSONStreamEvent(NamedTuple):
+    """
+    A completed part of the streamed object.
+
+    index is None for a top-level member (key, value); otherwise value is
+    element `index` of the top-level array under key.
+    """
+    key: str
+    value: Any
+    index: Optional[int] = None
+
+
+class JSONObjectStream:
+    """
+    Scan a JSON object fed in arbitrary chunks.
+
+    Only the structure is tracked while scanning (nesting depth, strings,
+    where the current top-level member and array element began), so each
+    character is looked at once. A member or array element is decoded when
+    its closing delimiter arrives. Text before the opening brace, such as a
+    markdown code fence, and anything after the closing brace is ignored.
+
+    Parts that fail to decode are skipped; the complete text should still be
+    parsed once at the end, which remains the authoritative result.
+    """
+
+    def __init__(self):
+        # Chunks still needed for decoding, and the offset of each in the
+        # text (from the opening brace); kept as a list so feeding doesn't
+        # copy everything received so far
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []
+        self._length = 0
+        # Set when a part ends, so earlier chunks may be droppable
+        self._ended = False
+        self._started = False
+        self.done = False
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        # Current top-level member
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        # Set while the member's value is an array, for its elements
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+
+    def feed(self, text: str) -> List[JSONStreamEvent]:
+        """
+        Add the next chunk of text.
+
+        Returns:
+            Members and array elements completed by this chunk, in document order
+        """
+        if self.done:
+            return []
+
+        if not self._started:
+            start = text.find("{")
+            if start == -1:
+                return []
+            text = text[start:]
+            self._started = True
+
+        base = self._length
+        self._chunks.append(text)
+        self._offsets.append(base)
+        self._length += len(text)
+
+        events: List[JSONStreamEvent] = []
+        i = 0
+        while i < len(text) and not self.done:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._end_string(base + i)
+                i += 1
+                continue
+
+            char = text[i]
+            if char.isspace():
+                match = _NON_SPACE.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+                char = text[i]
+            position = base + i
+            if char == '"':
+                self._begin_value(position)
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = position
+                self._in_string = True
+            elif char in "{[":
+                self._begin_value(position)
+                if self._depth == 1 and char == "[":
+                    self._array_key = self._key
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif char in "}]":
+                if self._depth == 2 and char == "]" and self._array_key is not None:
+                    self._end_item(position, events)
+                elif self._depth == 1:
+                    self._end_value(position, events)
+                    self.done = True
+                self._depth -= 1
+            elif char == ",":
+                if self._depth == 1:
+                    self._end_value(position, events)
+                    self._expect_key = True
+                elif self._depth == 2 and self._array_key is not None:
+                    self._end_item(position, events)
+            elif char == ":":
+                if self._depth == 1:
+                    self._expect_key = False
+            else:
+                # Start of a number, true, false or null
+                self._begin_value(position)
+            i += 1
+
+        if self._ended:
+            self._release()
+        return events
+
+    def _begin_value(self, i: int) -> None:
+        """Note where a member value or array element starts, if one is starting here"""
+        if self._depth == 1 and not self._expect_key and self._value_start is None:
+            self._value_start = i
+        elif self._depth == 2 and self._array_key is not None and self._item_start is None:
+            self._item_start = i
+
+    def _end_string(self, i: int) -> None:
+        if self._depth == 1 and self._expect_key and self._key_start is not None:
+            self._key = self._decode(self._key_start, i + 1)
+            self._key_start = None
+            self._ended = True
+
+    def _end_value(self, end: int, events: List[JSONStreamEvent]) -> None:
+        if self._key is not None and self._value_start is not None:
+            value = self._decode(self._value_start, end)
+            if value is not None:
+                events.append(JSONStreamEvent(self._key, value))
+        self._key = None
+        self._value_start = None
+        self._array_key = None
+        self._item_index = 0
+        self._ended = True
+
+    def _end_item(self, end: int, events: List[JSONStreamEvent]) -> None:
+        if self._item_start is not None:
+            value = self._decode(self._item_start, end)
+            if value is not None:
+                events.append(JSONStreamEvent(self._array_key, value, self._item_index))
+            self._item_index += 1
+        self._item_start = None
+        self._ended = True
+
+    def _decode(self, start: int, end: int) -> Any:
+        first = bisect_right(self._offsets, start) - 1
+        last = bisect_right(self._offsets, end - 1)
+        text = "".join(self._chunks[first:last])
+        skip = start - self._offsets[first]
+        try:
+            return json.loads(text[skip:skip + end - start], strict=False)
+        except ValueError as e:
+            logger.debug(f"Skipping undecodable streamed JSON part: {str(e)}")
+            return None
+
+    def _release(self) -> None:
+        """Drop chunks before the earliest part that may still need decoding"""
+        self._ended = False
+        starts = [start for start in (self._key_start, self._value_start, self._item_start) if start is not None]
+        keep_from = min(starts) if starts else self._length
+        drop = bisect_right(self._offsets, keep_from) - 1
+        if drop > 0:
+            del self._chunks[:drop]
+            del self._offsets[:drop]
@@ -0,0 +1,77 @@
+"""
+LaTeX Escaping
+Table-driven escaping of user text for insertion into LaTeX documents
+"""
+
+from typing import Iterable, List, Optional
+
+# What each special character becomes. The backslash maps to
+# \textbackslash\{\} (escaped braces): the original escaper replaced
+# backslashes first and then escaped the braces it had inserted, and stored
+# versions depend on that exact output.
+LATEX_ESCAPES = {
+    '\\': r'\textbackslash\{\}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\string~',
+    '^': r'\string^',
+}
+
+# The same mapping as ordered str.replace passes. Backslashes go first, so
+# the backslashes inserted by later passes are not escaped again, and the
+# brace passes then turn \textbackslash{} into \textbackslash\{\}.
+_REPLACEMENTS = (
+    ('\\', r'\textbackslash{}'),
+    ('{', r'\{'),
+    ('}', r'\}'),
+    ('&', r'\&'),
+    ('%', r'\%'),
+    ('$', r'\$'),
+    ('#', r'\#'),
+    ('_', r'\_'),
+    ('~', r'\string~'),
+    ('^', r'\string^'),
+)
+
+# Joins batch items; untouched by escaping, so the result splits cleanly
+_BATCH_SEPARATOR = "\0"
+
+
+def escape_latex(text: Optional[str]) -> str:
+    """
+    Escape special LaTeX characters.
+
+    Each pass is a C-level scan, and passes for characters the text doesn't
+    contain are skipped, so clean text is returned without being copied.
+    """
+    if not text:
+        return ''
+    for char, replacement in _REPLACEMENTS:
+        if char in text:
+            text = text.replace(char, replacement)
+    return text
+
+
+def escape_latex_batch(texts: Iterable[Optional[str]]) -> List[str]:
+    """
+    Escape many strings at once (e.g. all bullets of an experience).
+
+    The strings are joined, escaped as one text and split again, so the
+    escaping passes run once per batch instead of once per string.
+    Output is identical to [escape_latex(t) for t in texts].
+    """
+    texts = [text or '' for text in texts]
+    if not texts:
+        return []
+
+    joined = _BATCH_SEPARATOR.join(texts)
+    if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+        # A string contains the separator itself; escape one by one
+        return [escape_latex(text) for text in texts]
+
+    return escape_latex(joined).split(_BATCH_SEPARATOR)
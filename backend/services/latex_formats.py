@@ -0,0 +1,162 @@
+"""
+Precompiled LaTeX Preamble Formats
+Dumps each template's package-loading preamble into a pdflatex format file
+(via mylatexformat) so generated resumes skip loading packages on every compile
+"""
+
+import os
+import hashlib
+import logging
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LaTeXFormatStore:
+    """
+    Registry of preamble formats built for the LaTeX templates.
+
+    Templates mark the end of their dumpable preamble with ENDOFDUMP. Everything
+    before the marker (document class and packages) is dumped into a format;
+    the rest of the preamble still runs on every compile. Formats are keyed by
+    a hash of the dumped text, so a generated resume picks up the right format
+    without knowing which template it came from, and an edited template simply
+    stops matching its old format.
+    """
+
+    ENDOFDUMP = r"\csname endofdump\endcsname"
+    BUILD_TIMEOUT = 120
+
+    def __init__(self, format_dir: str):
+        """
+        Initialize format store.
+
+        Args:
+            format_dir: Directory where .fmt files are written
+        """
+        self.format_dir = Path(format_dir)
+        self._formats: Dict[str, str] = {}
+
+    @classmethod
+    def preamble_key(cls, latex_source: str) -> Optional[str]:
+        """Hash of the dumpable preamble, or None if the source has no marker"""
+        end = latex_source.find(cls.ENDOFDUMP)
+        if end == -1:
+            return None
+        return hashlib.sha256(latex_source[:end].encode('utf-8')).hexdigest()[:16]
+
+    def lookup(self, latex_source: str) -> Optional[str]:
+        """Return the format name to compile latex_source with, if one was built"""
+        key = self.preamble_key(latex_source)
+        if key is None:
+            return None
+        return self._formats.get(key)
+
+    def texformats_env(self) -> Dict[str, str]:
+        """Environment that lets pdflatex find formats in format_dir"""
+        # Trailing separator keeps kpathsea's default search path
+        return {**os.environ, "TEXFORMATS": f"{self.format_dir}{os.pathsep}"}
+
+    def build(self, pdflatex_path: str, template_path: str) -> Optional[str]:
+        """
+        Dump the preamble of a template into a format file (blocking).
+
+        Args:
+            pdflatex_path: Path to pdflatex executable
+            template_path: Path to LaTeX template containing ENDOFDUMP
+
+        Returns:
+            Format name, or None if the template has no marker or the build failed
+        """
+        source = Path(template_path).read_text(encoding='utf-8')
+        key = self.preamble_key(source)
+        if key is None:
+            logger.info(f"Template {template_path} has no endofdump marker, skipping format")
+            return None
+
+        name = f"rv_{key}"
+        self.format_dir.mkdir(parents=True, exist_ok=True)
+
+        if not (self.format_dir / f"{name}.fmt").exists():
+            try:
+                result = subprocess.run(
+                    [
+                        pdflatex_path,
+                        '-ini',
+                        '-interaction=nonstopmode',
+                        '-halt-on-error',
+                        f'-jobname={name}',
+                        '&pdflatex',
+                        'mylatexformat.ltx',
+                        str(Path(template_path).resolve())
+                    ],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.BUILD_TIMEOUT,
+                    cwd=str(self.format_dir)
+                )
+            except subprocess.TimeoutExpired:
+                logger.error(f"Building format for {template_path} timed out")
+                return None
+
+            if not (self.format_dir / f"{name}.fmt").exists():
+                tail = '\n'.join(result.stdout.split('\n')[-10:])
+                logger.error(f"Building format for {template_path} failed:\n{tail}")
+                return None
+
+        if not self._smoke_test(pdflatex_path, name, source):
+            logger.error(f"Format {name} failed its smoke test, compiling {template_path} without it")
+            return None
+
+        self._formats[key] = name
+        logger.info(f"Preamble format {name} ready for {os.path.basename(template_path)}")
+        return name
+
+    def _smoke_test(self, pdflatex_path: str, name: str, source: str) -> bool:
+        """Compile the template preamble with an empty body against the format"""
+        body_start = source.find(r"\begin{document}")
+        if body_start == -1:
+            return False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tex_file = Path(temp_dir) / "smoke.tex"
+            tex_file.write_text(
+                source[:body_start] + "\\begin{document}\\mbox{}\\end{document}\n",
+                encoding='utf-8'
+            )
+            try:
+                subprocess.run(
+                    [
+                        pdflatex_path,
+                        f'-fmt={name}',
+                        '-interaction=nonstopmode',
+                        '-halt-on-error',
+                        str(tex_file)
+                    ],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.BUILD_TIMEOUT,
+                    cwd=temp_dir,
+                    env=self.texformats_env()
+                )
+            except subprocess.TimeoutExpired:
+                return False
+            return (Path(temp_dir) / "smoke.pdf").exists()
+
+
+_format_store: Optional[LaTeXFormatStore] = None
+
+
+def get_format_store() -> LaTeXFormatStore:
+    """Get the process-wide format store (location set by LATEX_FORMAT_DIR)"""
+    global _format_store
+    if _format_store is None:
+        format_dir = os.getenv(
+            "LATEX_FORMAT_DIR",
+            os.path.join(tempfile.gettempdir(), "resume_vault_formats")
+        )
+        _format_store = LaTeXFormatStore(format_dir)
+    return _format_store
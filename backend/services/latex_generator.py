@@ -3,9 +3,17 @@ LaTeX Resume Generator Service
 Fills LaTeX template with tailored resume content
 """
 
-import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, TextIO
+
+from .latex_escape import escape_latex, escape_latex_batch
+from .latex_template import CompiledTemplate
+from .profile_fragments import FRAGMENTS_VERSION, stored_fragments
+from .resume_sections import (
+    CertificationEntry, EducationEntry, ExperienceEntry, HeaderSection,
+    experience_entries, profile_only_sections, summary_text
+)
+from .template_registry import DEFAULT_RESUME_TEMPLATE, TemplateNotFound, get_template_registry
 
 logger = logging.getLogger(__name__)
 
@@ -13,19 +21,50 @@ logger = logging.getLogger(__name__)
 class LaTeXResumeGenerator:
     """Generate LaTeX resume from template and profile data"""
 
-    def __init__(self, template_path: str = None):
+    # Template used when none is given; subclasses lay out other templates
+    TEMPLATE_ID = DEFAULT_RESUME_TEMPLATE
+
+    # How experience blocks start and are joined, and the empty section
+    EXPERIENCE_BLOCK_START = "    \\resumeSubheading\n"
+    EXPERIENCE_SEPARATOR = "\n"
+    NO_EXPERIENCE = "    % No work experience listed"
+
+    def __init__(self, template_id: str = None):
         """
         Initialize LaTeX generator.
 
         Args:
-            template_path: Path to LaTeX template file
+            template_id: Registry id of the LaTeX template (file name without .tex)
+
+        Raises:
+            TemplateNotFound: If the template doesn't exist
+        """
+        self.template_id = template_id or self.TEMPLATE_ID
+        registry = get_template_registry()
+        # Fails early for unknown ids; the compiled template is preloaded
+        registry.get(self.template_id)
+        self.template_path = str(registry.path(self.template_id))
+        logger.info(f"LaTeX generator initialized with template: {self.template_id}")
+
+    @classmethod
+    def for_template(cls, template_id: str = None) -> "LaTeXResumeGenerator":
         """
-        if template_path is None:
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            template_path = os.path.join(current_dir, 'template', 'template1.tex')
+        Get a generator for a resume template id, using the formatters written
+        for that template's macros (template1's for templates without their own).
 
-        self.template_path = template_path
-        logger.info(f"LaTeX generator initialized with template: {template_path}")
+        Raises:
+            TemplateNotFound: If the template doesn't exist or isn't a resume template
+        """
+        template_id = template_id or DEFAULT_RESUME_TEMPLATE
+        generator = RESUME_GENERATORS.get(template_id, LaTeXResumeGenerator)(template_id)
+        if "EXPERIENCES" not in generator.template.placeholders:
+            raise TemplateNotFound(f"Not a resume template: {template_id}")
+        return generator
+
+    @property
+    def template(self) -> CompiledTemplate:
+        """Current compiled template (picks up reloads of the template file)"""
+        return get_template_registry().get(self.template_id)
 
     def generate_latex(
         self,
@@ -44,82 +83,148 @@ class LaTeXResumeGenerator:
         """
         logger.info("Generating LaTeX resume")
 
-        with open(self.template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
-
-        personal_info = profile.get('personalInfo', {})
-        work_experience = profile.get('workExperience', [])
-        education = profile.get('education', [])
-        skills = profile.get('skills', [])
-        certifications = profile.get('certifications', [])
+        latex_content = self.template.render(self._template_values(profile, tailored_content))
 
-        summary = tailored_content.get('tailored_summary', '') if tailored_content else profile.get('professionalSummary', '')
+        logger.info("Successfully generated LaTeX resume")
+        return latex_content
 
-        experiences = work_experience
-        if tailored_content and 'tailored_experience' in tailored_content:
-            tailored_exp = tailored_content['tailored_experience']
-            for i, exp in enumerate(experiences):
-                if i < len(tailored_exp):
-                    if isinstance(tailored_exp[i], dict):
-                        experiences[i] = {**exp, **tailored_exp[i]}
+    def iter_latex(
+        self,
+        profile: Dict[str, Any],
+        tailored_content: Dict[str, Any] = None
+    ) -> Iterator[str]:
+        """
+        Generate the same LaTeX as generate_latex, as a stream of chunks.
 
-        latex_content = template
+        The chunks are the template's literal text and the rendered sections,
+        in document order; joined they equal generate_latex's output. Use it
+        to write the source straight into a file, a socket or the compiler
+        (LaTeXLocalCompiler.compile_chunks_to_pdf) without building the full
+        string first.
 
-        # Header
-        full_name = f"{personal_info.get('firstName', '')} {personal_info.get('lastName', '')}"
-        location = f"{personal_info.get('location', {}).get('city', '')}, {personal_info.get('location', {}).get('country', '')}"
-        
-        latex_content = latex_content.replace('{{FULL_NAME}}', self._escape_latex(full_name))
-        latex_content = latex_content.replace('{{LOCATION}}', self._escape_latex(location))
-        latex_content = latex_content.replace('{{EMAIL}}', self._escape_latex(personal_info.get('email', '')))
-        latex_content = latex_content.replace('{{PHONE}}', self._escape_latex(personal_info.get('phone', '')))
-        latex_content = latex_content.replace('{{LINKEDIN}}', self._format_url(personal_info.get('linkedinUrl', '')))
-        latex_content = latex_content.replace('{{PORTFOLIO}}', self._format_url(personal_info.get('portfolioUrl', '')))
+        Args:
+            profile: Master profile dictionary
+            tailored_content: AI-tailored resume content (optional)
 
-        # Summary
-        latex_content = latex_content.replace('{{PROFESSIONAL_SUMMARY}}', self._escape_latex(summary))
+        Yields:
+            Consecutive pieces of the LaTeX source
+        """
+        return self.template.iter_render(self._template_values(profile, tailored_content))
 
-        # Skills
-        latex_content = latex_content.replace('{{SKILLS}}', self._format_skills(skills))
+    def write_latex(
+        self,
+        profile: Dict[str, Any],
+        stream: TextIO,
+        tailored_content: Dict[str, Any] = None
+    ) -> int:
+        """
+        Write the filled LaTeX resume to a text stream chunk by chunk.
 
-        # Experiences
-        latex_content = latex_content.replace('{{EXPERIENCES}}', self._format_experiences(experiences))
+        Returns:
+            Number of characters written
+        """
+        written = 0
+        for chunk in self.iter_latex(profile, tailored_content):
+            written += stream.write(chunk)
+        return written
 
-        # Education
-        latex_content = latex_content.replace('{{EDUCATION}}', self._format_education(education))
+    def _template_values(
+        self,
+        profile: Dict[str, Any],
+        tailored_content: Dict[str, Any] = None
+    ) -> Dict[str, str]:
+        """Build the LaTeX for every template placeholder (see ResumeSections)"""
+        header = HeaderSection.from_profile(profile)
+        experiences = experience_entries(profile.get('workExperience', []), tailored_content)
+
+        # Untailored sections are rendered when the profile is saved
+        fragments = stored_fragments(profile, self.template_id) or self.profile_fragment_values(profile)
+
+        return {
+            'FULL_NAME': self._escape_latex(header.full_name),
+            'LOCATION': self._escape_latex(header.location),
+            'EMAIL': self._escape_latex(header.email),
+            'PHONE': self._escape_latex(header.phone),
+            'LINKEDIN': self._format_url(header.linkedin_url),
+            'PORTFOLIO': self._format_url(header.portfolio_url),
+            'PROFESSIONAL_SUMMARY': self._escape_latex(summary_text(profile, tailored_content)),
+            'EXPERIENCES': self._format_experiences(experiences),
+            **fragments,
+        }
 
-        # Certifications
-        latex_content = latex_content.replace('{{CERTIFICATIONS}}', self._format_certifications(certifications))
+    def regenerate_latex(
+        self,
+        profile: Dict[str, Any],
+        tailored_content: Dict[str, Any],
+        previous_version: Dict[str, Any]
+    ) -> str:
+        """
+        Re-render a stored version after edits to its tailored content.
 
-        logger.info("Successfully generated LaTeX resume")
-        return latex_content
+        Only the summary and the experience blocks whose tailored entry
+        changed are rendered; everything else is spliced from the stored
+        source. Falls back to generate_latex when the stored source can't be
+        reused: a different template, a profile saved since the version was
+        rendered, or a source that doesn't parse against the template.
 
-    def _escape_latex(self, text: str) -> str:
-        """Escape special LaTeX characters using simple replacement"""
-        if not text:
-            return ''
+        Args:
+            profile: Master profile dictionary
+            tailored_content: Edited tailored content
+            previous_version: Stored version (latexContent, tailoredData,
+                templateId, profileUpdatedAt)
 
-        # CRITICAL: Backslash must be escaped FIRST before other characters
-        # Otherwise, the backslashes we add for escaping will themselves get escaped
-        text = text.replace('\\', r'\textbackslash{}')
-
-        # Now escape other special characters
-        replacements = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\string~',
-            '^': r'\string^',
+        Returns:
+            Filled LaTeX source code as string
+        """
+        previous_latex = previous_version.get("latexContent", "")
+        reusable = (
+            bool(tailored_content)
+            and previous_version.get("templateId", DEFAULT_RESUME_TEMPLATE) == self.template_id
+            and previous_version.get("profileUpdatedAt") is not None
+            and previous_version.get("profileUpdatedAt") == profile.get("updatedAt")
+        )
+        values = self.template.parse(previous_latex) if reusable else None
+        work_experience = profile.get('workExperience', [])
+        previous_blocks = self._split_experience_blocks(values.get('EXPERIENCES', '')) if values else None
+
+        if previous_blocks is None or len(previous_blocks) != len(work_experience):
+            logger.info("Stored LaTeX not reusable, regenerating the whole resume")
+            return self.generate_latex(profile, tailored_content)
+
+        previous_tailored = previous_version.get("tailoredData") or {}
+        old_entries = previous_tailored.get('tailored_experience') or []
+        new_entries = tailored_content.get('tailored_experience') or []
+
+        blocks = list(previous_blocks)
+        changed = 0
+        for i, experience in enumerate(experience_entries(work_experience, tailored_content)):
+            old_entry = old_entries[i] if i < len(old_entries) else None
+            new_entry = new_entries[i] if i < len(new_entries) else None
+            if old_entry != new_entry:
+                blocks[i] = self._format_experience(experience)
+                changed += 1
+        if work_experience:
+            values['EXPERIENCES'] = self.EXPERIENCE_SEPARATOR.join(blocks)
+
+        summary = tailored_content.get('tailored_summary', '')
+        if summary != previous_tailored.get('tailored_summary', ''):
+            values['PROFESSIONAL_SUMMARY'] = self._escape_latex(summary)
+
+        logger.info(f"Re-rendered {changed} of {len(blocks)} experience blocks")
+        return self.template.render(values)
+
+    def profile_fragment_values(self, profile: Dict[str, Any]) -> Dict[str, str]:
+        """Render the sections that only depend on the master profile, not the job"""
+        sections = profile_only_sections(profile)
+        return {
+            'SKILLS': self._format_skills(sections['skills']),
+            'EDUCATION': self._format_education(sections['education']),
+            'CERTIFICATIONS': self._format_certifications(sections['certifications']),
         }
 
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+    def _escape_latex(self, text: str) -> str:
+        """Escape special LaTeX characters (see latex_escape)"""
+        return escape_latex(text)
 
     def _format_url(self, url: str) -> str:
         """Format URL for LaTeX hyperlink - returns just the URL, not wrapped in href"""
@@ -128,47 +233,60 @@ class LaTeXResumeGenerator:
         # Just return the URL itself, the template will handle the href wrapping
         return self._escape_latex(url)
 
-    def _format_skills(self, skills: List) -> str:
+    def _format_skills(self, skills: List[str]) -> str:
         """Format skills section for template1"""
         if not skills:
             return '\\textbf{Skills}{: No skills listed}'
         
         # Group skills by category if available, otherwise list all
-        skill_names = [self._escape_latex(s.get('name', '')) for s in skills]
+        skill_names = escape_latex_batch(skills)
         skills_text = ', '.join(skill_names)
         
         return f"\\textbf{{Skills}}{{: {skills_text}}}"
 
-    def _format_experiences(self, experiences: List) -> str:
-        """Format work experience section for template1"""
+    def _format_experiences(self, experiences: List[ExperienceEntry]) -> str:
+        """Format work experience section"""
         if not experiences:
-            return '    % No work experience listed'
-
-        exp_blocks = []
-
-        for exp in experiences:
-            job_title = self._escape_latex(exp.get('jobTitle', ''))
-            company = self._escape_latex(exp.get('companyName', ''))
-            location = self._escape_latex(exp.get('location', ''))
-            start_date = exp.get('startDate', '')
-            end_date = exp.get('endDate', 'Present')
-            date_range = f"{start_date} -- {end_date}" if start_date else end_date
-
-            bullets = exp.get('tailored_bullets', exp.get('responsibilities', []))
+            return self.NO_EXPERIENCE
+
+        return self.EXPERIENCE_SEPARATOR.join(self._format_experience(exp) for exp in experiences)
+
+    def _format_experience(self, experience: ExperienceEntry) -> str:
+        """Format one work experience block for template1"""
+        job_title = self._escape_latex(experience.job_title)
+        company = self._escape_latex(experience.company)
+        location = self._escape_latex(experience.location)
+        items = "".join(
+            f"        \\resumeItem{{{bullet}}}\n" for bullet in escape_latex_batch(experience.bullets)
+        )
+
+        # Use template1's resumeSubheading format
+        return (
+            f"    \\resumeSubheading\n"
+            f"      {{{job_title}}}{{{experience.date_range}}}\n"
+            f"      {{{company}}}{{{location}}}\n"
+            f"      \\resumeItemListStart\n"
+            f"{items}"
+            f"      \\resumeItemListEnd\n"
+        )
+
+    def _split_experience_blocks(self, section: str) -> Optional[List[str]]:
+        """
+        Split a rendered experience section back into its blocks.
 
-            # Use template1's resumeSubheading format
-            block = f"    \\resumeSubheading\n"
-            block += f"      {{{job_title}}}{{{date_range}}}\n"
-            block += f"      {{{company}}}{{{location}}}\n"
-            block += f"      \\resumeItemListStart\n"
-            for bullet in bullets:
-                block += f"        \\resumeItem{{{self._escape_latex(bullet)}}}\n"
-            block += f"      \\resumeItemListEnd\n"
-            exp_blocks.append(block)
+        Every block starts with EXPERIENCE_BLOCK_START, which contains a
+        control sequence and so can't occur in escaped profile text.
+        """
+        if section == self.NO_EXPERIENCE:
+            return []
+        if not section.startswith(self.EXPERIENCE_BLOCK_START):
+            return None
 
-        return '\n'.join(exp_blocks)
+        boundary = self.EXPERIENCE_SEPARATOR + self.EXPERIENCE_BLOCK_START
+        parts = section[len(self.EXPERIENCE_BLOCK_START):].split(boundary)
+        return [self.EXPERIENCE_BLOCK_START + part for part in parts]
 
-    def _format_education(self, education: List) -> str:
+    def _format_education(self, education: List[EducationEntry]) -> str:
         """Format education section for template1"""
         if not education:
             return '    % No education listed'
@@ -176,13 +294,11 @@ class LaTeXResumeGenerator:
         edu_blocks = []
 
         for edu in education:
-            degree = self._escape_latex(edu.get('degree', ''))
-            field = self._escape_latex(edu.get('fieldOfStudy', ''))
-            school = self._escape_latex(edu.get('institution', ''))
-            location = self._escape_latex(edu.get('location', ''))
-            start_year = edu.get('startYear', '')
-            end_year = edu.get('endYear', '')
-            date_range = f"{start_year} -- {end_year}" if start_year and end_year else end_year
+            degree = self._escape_latex(edu.degree)
+            field = self._escape_latex(edu.field_of_study)
+            school = self._escape_latex(edu.institution)
+            location = self._escape_latex(edu.location)
+            date_range = edu.date_range
 
             # Combine degree and field
             degree_text = f"{degree} in {field}" if field else degree
@@ -195,16 +311,16 @@ class LaTeXResumeGenerator:
 
         return '\n'.join(edu_blocks)
 
-    def _format_certifications(self, certifications: List) -> str:
+    def _format_certifications(self, certifications: List[CertificationEntry]) -> str:
         """Format certifications section for template1"""
         if not certifications:
             return '\\textbf{Certifications}{: No certifications listed}'
 
         cert_list = []
         for cert in certifications:
-            name = self._escape_latex(cert.get('name', ''))
-            org = self._escape_latex(cert.get('issuingOrganization', ''))
-            year = cert.get('issueYear', '')
+            name = self._escape_latex(cert.name)
+            org = self._escape_latex(cert.organization)
+            year = cert.year
             
             cert_text = f"{name} ({org})"
             if year:
@@ -213,3 +329,112 @@ class LaTeXResumeGenerator:
 
         return '\\textbf{Certifications}{: ' + ', '.join(cert_list) + '}'
 
+
+
+class Template2ResumeGenerator(LaTeXResumeGenerator):
+    """Generate resumes with template2's onecolentry/twocolentry/highlights layout"""
+
+    TEMPLATE_ID = "template2"
+
+    EXPERIENCE_BLOCK_START = "\\begin{twocolentry}"
+    NO_EXPERIENCE = "% No work experience listed"
+
+    def _format_skills(self, skills: List[str]) -> str:
+        """Format skills section for template2"""
+        if not skills:
+            return '\\textbf{Skills:} No skills listed'
+
+        skill_names = escape_latex_batch(skills)
+        return '\\textbf{Skills:} ' + ', '.join(skill_names)
+
+    def _format_experience(self, experience: ExperienceEntry) -> str:
+        """Format one work experience block for template2"""
+        job_title = self._escape_latex(experience.job_title)
+        company = self._escape_latex(experience.company)
+        location = self._escape_latex(experience.location)
+        date_range = experience.date_range
+        bullets = experience.bullets
+        heading = f"{company} -- {location}" if location else company
+
+        # Title and dates side by side, bullets below
+        block = f"\\begin{{twocolentry}}{{\n    {date_range}\n}}\n"
+        block += f"    \\textbf{{{job_title}}}, {heading}\n"
+        block += f"\\end{{twocolentry}}\n"
+        if bullets:
+            block += f"\n\\vspace{{0.10 cm}}\n"
+            block += f"\\begin{{onecolentry}}\n"
+            block += f"    \\begin{{highlights}}\n"
+            for bullet in escape_latex_batch(bullets):
+                block += f"        \\item {bullet}\n"
+            block += f"    \\end{{highlights}}\n"
+            block += f"\\end{{onecolentry}}\n"
+        block += f"\n\\vspace{{0.2 cm}}\n"
+        return block
+
+    def _format_education(self, education: List[EducationEntry]) -> str:
+        """Format education section for template2"""
+        if not education:
+            return '% No education listed'
+
+        edu_blocks = []
+
+        for edu in education:
+            degree = self._escape_latex(edu.degree)
+            field = self._escape_latex(edu.field_of_study)
+            school = self._escape_latex(edu.institution)
+            location = self._escape_latex(edu.location)
+            date_range = edu.date_range
+
+            degree_text = f"{degree} in {field}" if field else degree
+            heading = f"{school} -- {location}" if location else school
+
+            block = f"\\begin{{twocolentry}}{{\n    {date_range}\n}}\n"
+            block += f"    \\textbf{{{heading}}}, {degree_text}\n"
+            block += f"\\end{{twocolentry}}\n"
+            edu_blocks.append(block)
+
+        return '\n\\vspace{0.2 cm}\n\n'.join(edu_blocks)
+
+    def _format_certifications(self, certifications: List[CertificationEntry]) -> str:
+        """Format certifications section for template2"""
+        if not certifications:
+            return '\\begin{onecolentry}\nNo certifications listed\n\\end{onecolentry}'
+
+        cert_list = []
+        for cert in certifications:
+            name = self._escape_latex(cert.name)
+            org = self._escape_latex(cert.organization)
+            year = cert.year
+
+            cert_text = f"\\textbf{{{name}}} ({org})"
+            if year:
+                cert_text += f" -- {year}"
+            cert_list.append(cert_text)
+
+        return '\\begin{onecolentry}\n' + ', '.join(cert_list) + '\n\\end{onecolentry}'
+
+
+# Generators with formatters for a template's own macros, by template id
+RESUME_GENERATORS = {
+    LaTeXResumeGenerator.TEMPLATE_ID: LaTeXResumeGenerator,
+    Template2ResumeGenerator.TEMPLATE_ID: Template2ResumeGenerator,
+}
+
+
+def build_profile_fragments(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render the profile-only sections for every resume template.
+
+    Stored on the master profile under latexFragments with the fragments
+    version and the profile's updatedAt (see stored_fragments). Always
+    rendered from the profile: fragments already on the document are never
+    carried over, since they are only as trustworthy as every past write to it.
+    """
+    return {
+        "version": FRAGMENTS_VERSION,
+        "profileUpdatedAt": profile.get("updatedAt"),
+        "templates": {
+            template_id: LaTeXResumeGenerator.for_template(template_id).profile_fragment_values(profile)
+            for template_id in get_template_registry().resume_template_ids()
+        }
+    }
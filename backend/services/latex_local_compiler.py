@@ -3,18 +3,60 @@ Local LaTeX Compiler Service
 Compiles LaTeX source to PDF using local pdflatex installation
 """
 
+import asyncio
+import functools
+import hashlib
 import subprocess
-import tempfile
+import threading
+import time
+import sys
 import os
 import logging
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, List, Dict, Sequence, Tuple, Union
+from .latex_formats import LaTeXFormatStore, get_format_store
+from .compile_metrics import get_compile_metrics, parse_pdflatex_log
+from .compile_scheduler import CompilePriority, CompileJob, LaTeXCompilerBusy, get_compile_scheduler
+from .latex_workspace import get_workspace_pool
+from .latex_validator import validate_latex
 
 logger = logging.getLogger(__name__)
 
+# A LaTeX document: the complete source, or its chunks in order (as produced
+# by LaTeXResumeGenerator.iter_latex)
+LaTeXDocument = Union[str, Sequence[str]]
+
+# Sources are encoded for hashing and writing in slices of this many
+# characters, so no full encoded copy of a document is made
+ENCODE_SLICE_CHARS = 64 * 1024
+
+
+def _as_chunks(document: LaTeXDocument) -> Sequence[str]:
+    """The chunks of a document (a complete source is a single chunk)"""
+    return (document,) if isinstance(document, str) else document
+
+
+def _encoded_slices(document: LaTeXDocument) -> Iterator[bytes]:
+    """UTF-8 encoding of a document in bounded slices"""
+    for chunk in _as_chunks(document):
+        for start in range(0, len(chunk), ENCODE_SLICE_CHARS):
+            yield chunk[start:start + ENCODE_SLICE_CHARS].encode('utf-8')
+
 
 class LaTeXLocalCompiler:
     """Compile LaTeX using local pdflatex installation"""
 
+    COMPILE_TIMEOUT = int(os.getenv("LATEX_COMPILE_TIMEOUT", "60"))
+
+    # Bump when compile flags or the TeX installation change, so cached PDFs
+    # produced by the old pipeline are not served
+    COMPILER_VERSION = "pdflatex-1"
+
+    # Compiles in progress by cache key, shared by concurrent identical requests:
+    # the job compiling the source and the source's index in that job.
+    # Process-wide because the router creates a compiler per request.
+    _inflight: Dict[str, Tuple[CompileJob, int]] = {}
+
     def __init__(self, pdflatex_path: str = None):
         """
         Initialize LaTeX compiler
@@ -42,73 +84,335 @@ class LaTeXLocalCompiler:
         self.pdflatex_path = pdflatex_path
         logger.info(f"LaTeX local compiler initialized (pdflatex: {pdflatex_path})")
 
-    async def compile_to_pdf(self, latex_source: str) -> bytes:
+    @classmethod
+    def cache_key(cls, latex_source: LaTeXDocument) -> str:
+        """
+        Content hash identifying the PDF a LaTeX source compiles to.
+
+        The generated source embeds the whole template, so template changes
+        are covered by hashing the source together with the compiler version.
+        A chunked document hashes the same as its joined source.
+        """
+        digest = hashlib.sha256()
+        digest.update(cls.COMPILER_VERSION.encode('utf-8'))
+        digest.update(b'\0')
+        for piece in _encoded_slices(latex_source):
+            digest.update(piece)
+        return digest.hexdigest()
+
+    async def build_formats(self, template_paths: List[str]) -> None:
+        """
+        Precompile the preamble of each template into a pdflatex format.
+
+        Generated resumes whose preamble matches a built format are compiled
+        against it instead of loading every package from scratch.
+
+        Args:
+            template_paths: Paths to LaTeX templates
+        """
+        format_store = get_format_store()
+        scheduler = get_compile_scheduler()
+        for template_path in template_paths:
+            try:
+                job = scheduler.submit(
+                    functools.partial(format_store.build, self.pdflatex_path, template_path),
+                    priority=CompilePriority.BACKGROUND
+                )
+                await job.future
+            except Exception as e:
+                logger.error(f"Failed to build format for {template_path}: {str(e)}")
+
+    async def compile_to_pdf(
+        self,
+        latex_source: str,
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> bytes:
         """
         Compile LaTeX source to PDF using local pdflatex.
 
+        The blocking pdflatex run is queued on the shared compile scheduler so
+        the event loop stays responsive and concurrent compiles are capped.
+        Concurrent calls for an identical source share a single compile and its
+        result (or error); a more urgent caller promotes the shared job.
+        Structurally broken sources are rejected before pdflatex is started.
+
         Args:
             latex_source: LaTeX source code as string
+            priority: Priority class of the request
+            user_id: Requesting user, for fairness between users
 
         Returns:
             PDF file as bytes
 
         Raises:
+            LaTeXValidationError: If the source fails pre-flight validation
+            LaTeXCompilerBusy: If the compile queue is full
             Exception: If compilation fails
         """
+        pdfs = await self.compile_documents_to_pdf([latex_source], priority=priority, user_id=user_id)
+        return pdfs[0]
+
+    async def compile_chunks_to_pdf(
+        self,
+        chunks: Iterable[str],
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> bytes:
+        """
+        Compile a LaTeX document given as chunks (e.g. from
+        LaTeXResumeGenerator.iter_latex) without joining it into one string.
+
+        The chunks are hashed and written into the compile workspace one by
+        one. Only pre-flight validation sees the joined source, and that copy
+        is dropped before pdflatex runs, so the full source and the PDF are
+        never held at the same time. Otherwise behaves like compile_to_pdf.
+
+        Args:
+            chunks: Consecutive pieces of the LaTeX source
+            priority: Priority class of the request
+            user_id: Requesting user, for fairness between users
+
+        Returns:
+            PDF file as bytes
+        """
+        pdfs = await self.compile_documents_to_pdf([tuple(chunks)], priority=priority, user_id=user_id)
+        return pdfs[0]
+
+    async def compile_documents_to_pdf(
+        self,
+        latex_sources: List[LaTeXDocument],
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> List[bytes]:
+        """
+        Compile several LaTeX documents (e.g. a resume and its cover letter)
+        as one scheduled job.
+
+        The documents are compiled one after another by a single worker in a
+        single workspace, so a packet costs one queue slot and one workspace
+        instead of one per document. Documents already being compiled by
+        another request are joined rather than compiled again, and each
+        document's compile is joinable by later single-document requests.
+
+        Args:
+            latex_sources: LaTeX sources or chunk sequences, in the order the
+                PDFs are returned
+            priority: Priority class of the request
+            user_id: Requesting user, for fairness between users
+
+        Returns:
+            PDF files as bytes, one per source
+
+        Raises:
+            LaTeXValidationError: If a new source fails pre-flight validation
+            LaTeXCompilerBusy: If the compile queue is full
+            Exception: If compilation of any document fails
+        """
+        cls = type(self)
+        scheduler = get_compile_scheduler()
+        cache_keys = [self.cache_key(source) for source in latex_sources]
+
+        new_sources: Dict[str, LaTeXDocument] = {}
+        for cache_key, latex_source in zip(cache_keys, latex_sources):
+            if cache_key in cls._inflight:
+                logger.info(f"Joining in-flight compile {cache_key[:12]}")
+                scheduler.promote(cls._inflight[cache_key][0], priority)
+            elif cache_key not in new_sources:
+                validate_latex("".join(_as_chunks(latex_source)))
+                new_sources[cache_key] = latex_source
+
+        if new_sources:
+            # Create the workspaces here rather than racing on executor threads
+            get_workspace_pool()
+            job = scheduler.submit(
+                functools.partial(self._compile_blocking, list(new_sources.values())),
+                priority=priority,
+                user_id=user_id
+            )
+            for index, cache_key in enumerate(new_sources):
+                cls._inflight[cache_key] = (job, index)
+            job.future.add_done_callback(
+                lambda _: [cls._inflight.pop(key, None) for key in new_sources]
+            )
+
+        # Resolve every entry before awaiting; finished jobs leave _inflight
+        entries = [cls._inflight[cache_key] for cache_key in cache_keys]
+
+        pdfs = []
+        for job, index in entries:
+            # Shield so one caller disconnecting doesn't cancel the others' compile
+            result = (await asyncio.shield(job.future))[index]
+            if isinstance(result, Exception):
+                raise result
+            pdfs.append(result)
+        return pdfs
+
+    def _compile_blocking(self, latex_sources: List[LaTeXDocument]) -> List[Union[bytes, Exception]]:
+        """
+        Compile documents one after another in one workspace (called on the
+        compile executor).
+
+        Returns:
+            Per source, the PDF bytes or the exception its compile raised, so a
+            failing document doesn't fail requests joined to the others
+        """
+        results: List[Union[bytes, Exception]] = []
+        # Borrow a recycled (RAM-backed where possible) scratch directory
+        with get_workspace_pool().workspace() as temp_path:
+            for index, latex_source in enumerate(latex_sources):
+                try:
+                    # Distinct job names keep one document's output from
+                    # being mistaken for another's
+                    results.append(self._compile_document(latex_source, temp_path, f"document_{index}"))
+                except Exception as e:
+                    results.append(e)
+        return results
+
+    def _compile_document(self, latex_source: LaTeXDocument, temp_path: Path, jobname: str) -> bytes:
+        """Run pdflatex synchronously on one document, as temp_path/<jobname>.tex"""
         logger.info("Compiling LaTeX to PDF using local pdflatex")
+        metrics = get_compile_metrics()
+        preamble = self._preamble(latex_source)
+        template_label = LaTeXFormatStore.preamble_key(preamble) or "unknown"
 
-        # Create a temporary directory for compilation
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            tex_file = temp_path / "resume.tex"
-            pdf_file = temp_path / "resume.pdf"
+        tex_file = temp_path / f"{jobname}.tex"
+        pdf_file = temp_path / f"{jobname}.pdf"
+        log_file = temp_path / f"{jobname}.log"
 
-            # Write LaTeX source to file
-            tex_file.write_text(latex_source, encoding='utf-8')
-            logger.info(f"Wrote LaTeX source to {tex_file}")
+        # Write LaTeX source to file, slice by slice
+        write_start = time.perf_counter()
+        with open(tex_file, 'wb') as f:
+            for piece in _encoded_slices(latex_source):
+                f.write(piece)
+        write_seconds = time.perf_counter() - write_start
+        logger.info(f"Wrote LaTeX source to {tex_file}")
 
-            try:
-                # Run pdflatex
-                # -interaction=nonstopmode: Don't stop for errors
-                # -halt-on-error: But do halt if there's an error
-                # -output-directory: Where to put output files
-                result = subprocess.run(
-                    [
-                        self.pdflatex_path,
-                        '-interaction=nonstopmode',
-                        '-halt-on-error',
-                        '-output-directory', str(temp_path),
-                        str(tex_file)
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=60,  # 60 second timeout
-                    cwd=temp_dir
-                )
+        # Run pdflatex
+        # -interaction=nonstopmode: Don't stop for errors
+        # -halt-on-error: But do halt if there's an error
+        # -output-directory: Where to put output files
+        command = [
+            self.pdflatex_path,
+            '-interaction=nonstopmode',
+            '-halt-on-error',
+            '-output-directory', str(temp_path),
+            str(tex_file)
+        ]
+        env = None
 
-                # Check if PDF was generated
-                if pdf_file.exists():
-                    pdf_bytes = pdf_file.read_bytes()
-                    logger.info(f"Successfully compiled LaTeX to PDF ({len(pdf_bytes)} bytes)")
-                    return pdf_bytes
-                else:
-                    # Compilation failed
-                    error_msg = self._extract_error(result.stdout, result.stderr)
-                    logger.error(f"LaTeX compilation failed: {error_msg}")
-                    raise Exception(f"LaTeX compilation failed: {error_msg}")
-
-            except subprocess.TimeoutExpired:
-                error_msg = "LaTeX compilation timed out (60s)"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            except subprocess.CalledProcessError as e:
-                error_msg = f"pdflatex error: {e.stderr}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            except Exception as e:
-                error_msg = f"LaTeX compilation error: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                raise Exception(error_msg)
+        # Skip package loading when the preamble was precompiled
+        format_store = get_format_store()
+        format_name = format_store.lookup(preamble)
+        if format_name:
+            command.insert(1, f'-fmt={format_name}')
+            env = format_store.texformats_env()
+            logger.info(f"Using precompiled preamble format {format_name}")
+
+        try:
+            run_start = time.perf_counter()
+            output, rusage = self._run_pdflatex(command, temp_path, env)
+            wall_seconds = time.perf_counter() - run_start
+
+            # Check if PDF was generated
+            if pdf_file.exists():
+                pdf_bytes = pdf_file.read_bytes()
+                log = log_file.read_text(encoding='utf-8', errors='replace') if log_file.exists() else output
+                metrics.record_compile(template_label, {
+                    "write_seconds": write_seconds,
+                    "pdflatex_wall_seconds": wall_seconds,
+                    "pdflatex_cpu_seconds": rusage.ru_utime + rusage.ru_stime,
+                    "pdflatex_peak_rss_bytes": self._peak_rss_bytes(rusage),
+                    "pdf_bytes": len(pdf_bytes),
+                    "precompiled_format": bool(format_name),
+                    **parse_pdflatex_log(log)
+                })
+                logger.info(f"Successfully compiled LaTeX to PDF ({len(pdf_bytes)} bytes)")
+                return pdf_bytes
+            else:
+                # Compilation failed
+                metrics.record_failure(template_label)
+                error_msg = self._extract_error(output, "")
+                logger.error(f"LaTeX compilation failed: {error_msg}")
+                raise Exception(f"LaTeX compilation failed: {error_msg}")
+
+        except subprocess.TimeoutExpired:
+            metrics.record_failure(template_label)
+            error_msg = f"LaTeX compilation timed out ({self.COMPILE_TIMEOUT}s)"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except subprocess.CalledProcessError as e:
+            error_msg = f"pdflatex error: {e.stderr}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except Exception as e:
+            error_msg = f"LaTeX compilation error: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise Exception(error_msg)
+
+    @staticmethod
+    def _preamble(latex_source: LaTeXDocument) -> str:
+        """
+        Leading part of a document that contains its format dump marker (or
+        the whole document if there is none), for format lookup.
+        """
+        if isinstance(latex_source, str):
+            return latex_source
+        head = []
+        for chunk in latex_source:
+            head.append(chunk)
+            if LaTeXFormatStore.ENDOFDUMP in chunk:
+                break
+        return "".join(head)
+
+    def _run_pdflatex(self, command: List[str], cwd: Path, env: Optional[Dict[str, str]]):
+        """
+        Run pdflatex and reap it with wait4 to get its own resource usage.
+
+        Output goes to a file in the workspace rather than a pipe, so the child
+        can never block on a full pipe while we wait for it.
+
+        Returns:
+            Tuple of (combined stdout/stderr text, resource usage of the child)
+
+        Raises:
+            subprocess.TimeoutExpired: If pdflatex ran longer than COMPILE_TIMEOUT
+        """
+        output_file = cwd / "pdflatex.out"
+        with open(output_file, 'wb') as output:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+                cwd=str(cwd),
+                env=env
+            )
+
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(self.COMPILE_TIMEOUT, kill)
+        timer.start()
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        finally:
+            timer.cancel()
+        # Already reaped; stop Popen from waiting on the pid again
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, self.COMPILE_TIMEOUT)
+
+        return output_file.read_text(encoding='utf-8', errors='replace'), rusage
+
+    @staticmethod
+    def _peak_rss_bytes(rusage) -> int:
+        """ru_maxrss is reported in kilobytes on Linux and in bytes on macOS"""
+        return rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024
 
     def _extract_error(self, stdout: str, stderr: str) -> str:
         """Extract meaningful error message from pdflatex output"""
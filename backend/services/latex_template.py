@@ -0,0 +1,136 @@
+"""
+Compiled LaTeX Templates
+Templates parsed once into literal chunks and placeholder slots, rendered with a single join
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# {{NAME}} placeholders; a leading brace (as in \underline{{{EMAIL}}}) stays literal
+PLACEHOLDER = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template pre-split into a render plan.
+
+    The source is split once into alternating literal chunks and placeholder
+    slots. Rendering copies the plan, drops the values into the slots and
+    joins, so the document is built in one pass instead of one full scan and
+    copy per placeholder.
+    """
+
+    def __init__(self, source: str, path: Optional[str] = None):
+        """
+        Compile template source.
+
+        Args:
+            source: Template text with {{NAME}} placeholders
+            path: File the template was loaded from, for logging
+        """
+        self.source = source
+        self.path = path
+        # literals[i] precedes slots[i]; literals has one more entry than slots
+        self.literals: List[str] = []
+        self.slots: List[str] = []
+
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.literals.append(source[position:])
+
+        # Interleaved parts with the placeholder text in each slot, so values
+        # that aren't supplied render unchanged
+        self._parts: List[str] = [self.literals[0]]
+        self._slot_indexes: List[Tuple[int, str]] = []
+        for name, literal in zip(self.slots, self.literals[1:]):
+            self._slot_indexes.append((len(self._parts), name))
+            self._parts.append(f"{{{{{name}}}}}")
+            self._parts.append(literal)
+
+    @classmethod
+    def from_file(cls, path: str) -> "CompiledTemplate":
+        """Read and compile a template file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), path=path)
+
+    @property
+    def placeholders(self) -> frozenset:
+        """Names of the placeholders the template uses"""
+        return frozenset(self.slots)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Fill the placeholders.
+
+        Args:
+            values: Placeholder name -> LaTeX to insert (inserted verbatim)
+
+        Returns:
+            Filled document
+        """
+        parts = self._parts.copy()
+        for index, name in self._slot_indexes:
+            value = values.get(name)
+            if value is not None:
+                parts[index] = value
+        return "".join(parts)
+
+    def iter_render(self, values: Dict[str, str]) -> Iterator[str]:
+        """
+        Fill the placeholders, yielding the document in chunks.
+
+        Yields the template's literal chunks and the values in document order
+        without joining them, so the document can be written to a file or
+        socket without ever existing as one string.
+        """
+        for index, part in enumerate(self._parts):
+            if index % 2:
+                # Odd parts are the slots
+                value = values.get(self.slots[index // 2])
+                if value is not None:
+                    part = value
+            if part:
+                yield part
+
+    def parse(self, rendered: str) -> Optional[Dict[str, str]]:
+        """
+        Recover the placeholder values from a document rendered from this template.
+
+        Each value runs up to the next occurrence of the literal that follows
+        its slot. The result is only returned if rendering it reproduces the
+        document exactly and repeated placeholders agree.
+
+        Returns:
+            Placeholder name -> value, or None if the document doesn't match
+        """
+        if not rendered.startswith(self.literals[0]):
+            return None
+
+        values: Dict[str, str] = {}
+        position = len(self.literals[0])
+        last_slot = len(self.slots) - 1
+        for index, (name, literal) in enumerate(zip(self.slots, self.literals[1:])):
+            if index == last_slot:
+                # The final literal is the document's suffix
+                end = len(rendered) - len(literal)
+                if end < position or not rendered.endswith(literal):
+                    return None
+            elif not literal:
+                # Adjacent placeholders can't be told apart
+                return None
+            else:
+                end = rendered.find(literal, position)
+                if end == -1:
+                    return None
+
+            value = rendered[position:end]
+            if values.setdefault(name, value) != value:
+                return None
+            position = end + len(literal)
+
+        if self.render(values) != rendered:
+            return None
+        return values
@@ -0,0 +1,184 @@
+"""
+LaTeX Pre-flight Validator
+Catches malformed generated LaTeX in-process before a pdflatex run is spent on it
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+
+class LaTeXValidationError(Exception):
+    """Raised when LaTeX source is structurally invalid"""
+
+    def __init__(self, message: str, line: int, column: int):
+        self.line = line
+        self.column = column
+        super().__init__(f"{message} (line {line}, column {column})")
+
+
+# Commands the templates and generators rely on from LaTeX itself or from
+# packages loaded in the preamble. Commands and environments the preamble
+# defines are accepted automatically; commands it merely uses (\usepackage,
+# \input, \def...) are not, so user text can't smuggle them into the body.
+KNOWN_COMMANDS = frozenset({
+    "begin", "end", "item", "section", "subsection", "subsubsection", "paragraph",
+    "textbf", "textit", "texttt", "textsc", "textsf", "textrm", "textup", "textmd",
+    "textnormal", "emph", "underline", "textcolor", "color",
+    "tiny", "scriptsize", "footnotesize", "small", "normalsize", "large", "Large",
+    "LARGE", "huge", "Huge", "bfseries", "itshape", "scshape", "rmfamily",
+    "sffamily", "ttfamily", "mdseries", "upshape", "fontsize", "selectfont",
+    "vspace", "hspace", "vfill", "hfill", "smallskip", "medskip", "bigskip",
+    "newline", "linebreak", "pagebreak", "newpage", "clearpage", "par", "noindent",
+    "centering", "raggedright", "raggedleft", "quad", "qquad", "hrule", "rule",
+    "mbox", "makebox", "parbox", "href", "url", "string", "textbackslash",
+    "textasciitilde", "textasciicircum", "textbar", "textless", "textgreater",
+    "textendash", "textemdash", "ldots", "dots", "today", "LaTeX", "TeX",
+    "label", "ref", "footnote", "hline", "cline", "multicolumn", "extracolsep",
+    "fill", "textwidth", "linewidth", "baselineskip", "linespread",
+})
+
+# Environments in which & is an alignment character rather than an error
+ALIGNMENT_ENVIRONMENTS = frozenset({
+    "tabular", "tabular*", "tabularx", "array", "align", "align*", "matrix",
+})
+
+_TOKEN = re.compile(r"\\([A-Za-z@]+)\*?|\\.|%[^\n]*|[{}#&$_^~]", re.DOTALL)
+_ENV_NAME = re.compile(r"\s*\{([^{}]*)\}")
+_DEFINITION = re.compile(
+    r"\\(?:newcommand|renewcommand|providecommand|def|let)\*?\s*\{?\\([A-Za-z@]+)"
+)
+_ENVIRONMENT_DEFINITION = re.compile(r"\\(?:new|renew)environment\*?\s*\{([^{}]*)\}")
+_DOCUMENT_START = r"\begin{document}"
+
+
+def _position(source: str, offset: int) -> Tuple[int, int]:
+    """1-based line and column of an offset"""
+    line = source.count("\n", 0, offset) + 1
+    column = offset - (source.rfind("\n", 0, offset) + 1) + 1
+    return line, column
+
+
+def _fail(source: str, offset: int, message: str) -> None:
+    line, column = _position(source, offset)
+    raise LaTeXValidationError(message, line, column)
+
+
+@lru_cache(maxsize=16)
+def _check_preamble(preamble: str) -> FrozenSet[str]:
+    """
+    Check brace balance of a preamble and return the commands it defines,
+    with KNOWN_COMMANDS.
+
+    Generated documents share their template's preamble, so the result is
+    cached and only the document body is scanned per call.
+    """
+    braces: List[int] = []
+    for match in _TOKEN.finditer(preamble):
+        token = match.group(0)
+        if token == "{":
+            braces.append(match.start())
+        elif token == "}":
+            if not braces:
+                _fail(preamble, match.start(), "Unbalanced closing brace")
+            braces.pop()
+    if braces:
+        _fail(preamble, braces[-1], "Unclosed brace")
+
+    commands = set(_DEFINITION.findall(preamble))
+    for environment in _ENVIRONMENT_DEFINITION.findall(preamble):
+        commands.add(environment)
+        commands.add(f"end{environment}")
+    return KNOWN_COMMANDS | commands
+
+
+def validate_latex(source: str) -> None:
+    """
+    Check generated LaTeX for errors pdflatex would otherwise report seconds later.
+
+    Checks brace balance over the whole source and, inside the document body,
+    environment nesting, math shifts, unknown control sequences and unescaped
+    special characters (#, & outside alignments, _ and ^ outside math). The
+    preamble only gets the brace check, since macro definitions legitimately
+    contain #, & and unbalanced environments.
+
+    Args:
+        source: Complete LaTeX document
+
+    Raises:
+        LaTeXValidationError: With the line and column of the first problem
+    """
+    body_start = source.find(_DOCUMENT_START)
+    if body_start == -1:
+        _fail(source, 0, r"Missing \begin{document}")
+
+    known = _check_preamble(source[:body_start])
+
+    braces: List[int] = []
+    environments: List[Tuple[str, int]] = []
+    math_start = -1
+    skip_next_char = False
+
+    for match in _TOKEN.finditer(source, body_start):
+        offset = match.start()
+        token = match.group(0)
+
+        if skip_next_char:
+            # \string<char> prints the character verbatim
+            skip_next_char = False
+            if len(token) == 1 and token not in "{}%":
+                continue
+
+        if token[0] == "%":
+            continue
+
+        if token == "{":
+            braces.append(offset)
+            continue
+        if token == "}":
+            if not braces:
+                _fail(source, offset, "Unbalanced closing brace")
+            braces.pop()
+            continue
+
+        command = match.group(1)
+        if command is not None:
+            if command == "string":
+                skip_next_char = True
+            elif command in ("begin", "end"):
+                name_match = _ENV_NAME.match(source, match.end())
+                if name_match is None:
+                    _fail(source, offset, f"\\{command} without an environment name")
+                name = name_match.group(1)
+                if command == "begin":
+                    environments.append((name, offset))
+                elif not environments:
+                    _fail(source, offset, f"\\end{{{name}}} without matching \\begin")
+                elif environments[-1][0] != name:
+                    _fail(
+                        source, offset,
+                        f"\\end{{{name}}} does not match \\begin{{{environments[-1][0]}}}"
+                    )
+                else:
+                    environments.pop()
+            elif command not in known:
+                _fail(source, offset, f"Unknown control sequence \\{command}")
+            continue
+
+        if token == "$":
+            math_start = offset if math_start == -1 else -1
+        elif token == "#":
+            _fail(source, offset, "Unescaped # in document body")
+        elif token == "&":
+            if not any(env in ALIGNMENT_ENVIRONMENTS for env, _ in environments):
+                _fail(source, offset, "Unescaped & outside an alignment")
+        elif token in "_^" and len(token) == 1 and math_start == -1:
+            _fail(source, offset, f"Unescaped {token} outside math mode")
+
+    if braces:
+        _fail(source, braces[-1], "Unclosed brace")
+    if environments:
+        name, offset = environments[-1]
+        _fail(source, offset, f"\\begin{{{name}}} is never closed")
+    if math_start != -1:
+        _fail(source, math_start, "Unclosed math shift $")
@@ -0,0 +1,130 @@
+"""
+LaTeX Compile Workspaces
+Fixed set of reusable scratch directories for pdflatex, on tmpfs when available
+"""
+
+import os
+import queue
+import shutil
+import logging
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .compile_scheduler import get_compile_scheduler
+
+logger = logging.getLogger(__name__)
+
+# RAM-backed filesystem on Linux; avoids the VM's slow root volume
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def default_workspace_root() -> Path:
+    """Scratch root: LATEX_WORKSPACE_DIR, else /dev/shm if writable, else the temp dir"""
+    configured = os.getenv("LATEX_WORKSPACE_DIR")
+    if configured:
+        return Path(configured)
+
+    if os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK):
+        return Path(SHARED_MEMORY_DIR) / f"resume_vault_{os.getpid()}"
+
+    return Path(tempfile.gettempdir()) / f"resume_vault_{os.getpid()}"
+
+
+class WorkspacePool:
+    """
+    Pool of pre-created compile directories.
+
+    One directory per compile worker is created up front and recycled: it is
+    emptied when released instead of being deleted and recreated. If the pool
+    is ever exhausted a one-off directory is created and removed after use.
+    Acquire and release are thread-safe, as compiles run on executor threads.
+    """
+
+    def __init__(self, root: Path, size: int):
+        """
+        Initialize workspace pool.
+
+        Args:
+            root: Directory under which workspaces are created
+            size: Number of reusable workspaces
+        """
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._available: "queue.SimpleQueue[Path]" = queue.SimpleQueue()
+        self._pooled = set()
+
+        for index in range(size):
+            workspace = self.root / f"worker_{index}"
+            if workspace.exists():
+                shutil.rmtree(workspace, ignore_errors=True)
+            workspace.mkdir()
+            self._pooled.add(workspace)
+            self._available.put(workspace)
+
+        logger.info(f"Created {size} LaTeX workspaces under {self.root}")
+
+    @contextmanager
+    def workspace(self) -> Iterator[Path]:
+        """Borrow an empty workspace directory for the duration of a compile"""
+        path = self._acquire()
+        try:
+            yield path
+        finally:
+            self._release(path)
+
+    def _acquire(self) -> Path:
+        try:
+            return self._available.get_nowait()
+        except queue.Empty:
+            logger.warning("LaTeX workspace pool exhausted, using a one-off directory")
+            return Path(tempfile.mkdtemp(prefix="overflow_", dir=self.root))
+
+    def _release(self, path: Path) -> None:
+        if path not in self._pooled:
+            shutil.rmtree(path, ignore_errors=True)
+            return
+
+        try:
+            self._clear(path)
+        except OSError as e:
+            # Don't hand out a directory in an unknown state; replace it
+            logger.error(f"Failed to clean workspace {path}, recreating it: {str(e)}")
+            shutil.rmtree(path, ignore_errors=True)
+            path.mkdir(parents=True, exist_ok=True)
+
+        self._available.put(path)
+
+    def close(self) -> None:
+        """Remove the workspace root (tmpfs space is RAM)"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def _clear(path: Path) -> None:
+        """Remove everything inside path without following symlinks"""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+
+
+_workspace_pool: Optional[WorkspacePool] = None
+
+
+def get_workspace_pool() -> WorkspacePool:
+    """Get the process-wide workspace pool, one workspace per compile worker"""
+    global _workspace_pool
+    if _workspace_pool is None:
+        _workspace_pool = WorkspacePool(default_workspace_root(), get_compile_scheduler().workers)
+    return _workspace_pool
+
+
+def close_workspace_pool() -> None:
+    """Remove the process-wide workspaces, if they were created"""
+    global _workspace_pool
+    if _workspace_pool is not None:
+        _workspace_pool.close()
+        _workspace_pool = None
@@ -0,0 +1,84 @@
+"""
+Compiled PDF Cache
+Size-bounded in-memory LRU cache for compiled PDFs, keyed by source hash
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class PDFCache:
+    """LRU cache of compiled PDF bytes bounded by total size"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize PDF cache.
+
+        Args:
+            max_bytes: Maximum total size of cached PDFs in bytes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        # Entries may be written from compile executor threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PDF for key (marking it most recently used), or None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store PDF for key, evicting least recently used entries to fit"""
+        if len(data) > self.max_bytes:
+            logger.warning(f"PDF of {len(data)} bytes exceeds cache size, not caching")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._entries[key] = data
+            self._size += len(data)
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+
+_pdf_cache: Optional[PDFCache] = None
+
+
+def get_pdf_cache() -> PDFCache:
+    """Get the process-wide PDF cache (size set by PDF_CACHE_MAX_MB)"""
+    global _pdf_cache
+    if _pdf_cache is None:
+        max_mb = float(os.getenv("PDF_CACHE_MAX_MB", "64"))
+        _pdf_cache = PDFCache(max_bytes=int(max_mb * 1024 * 1024))
+        logger.info(f"PDF cache initialized ({max_mb} MB)")
+    return _pdf_cache
@@ -0,0 +1,123 @@
+"""
+Background PDF Pre-rendering
+Compiles newly stored resume versions ahead of the first download
+"""
+
+import os
+import asyncio
+import logging
+from typing import List, Set, Optional
+
+from .latex_local_compiler import LaTeXDocument, LaTeXLocalCompiler
+from .compile_scheduler import CompilePriority
+from .pdf_cache import PDFCache, get_pdf_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PDFPrerenderer:
+    """
+    Schedules background compiles into the PDF cache and serves PDFs from it.
+
+    A download that arrives while the background compile for the same source
+    is still running joins that compile (see LaTeXLocalCompiler.compile_to_pdf)
+    instead of starting another one.
+    """
+
+    def __init__(self, cache: PDFCache, enabled: bool = True):
+        """
+        Initialize pre-renderer.
+
+        Args:
+            cache: Cache that receives the compiled PDFs
+            enabled: Whether schedule() starts background compiles
+        """
+        self.cache = cache
+        self.enabled = enabled
+        # Keeps pending render tasks referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, *latex_sources: str, user_id: Optional[str] = None) -> None:
+        """
+        Start compiling the given sources in the background unless cached.
+
+        Sources scheduled together (a resume and its cover letter) are
+        compiled as one job. Must be called from within the event loop.
+        Returns immediately.
+        """
+        if not self.enabled:
+            return
+
+        missing = [
+            source for source in latex_sources
+            if source and self.cache.get(LaTeXLocalCompiler.cache_key(source)) is None
+        ]
+        if not missing:
+            return
+
+        task = asyncio.create_task(self._render(missing, user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Scheduled background render of {len(missing)} PDF(s)")
+
+    async def get_pdf(
+        self,
+        latex_source: LaTeXDocument,
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> bytes:
+        """
+        Get the PDF for latex_source from the cache, or compile it on demand
+        (joining a background compile of the same source if one is running).
+
+        latex_source may also be a sequence of chunks (e.g. a materialized
+        LaTeXResumeGenerator.iter_latex), which is hashed and compiled
+        without being joined.
+        """
+        pdfs = await self.get_pdfs([latex_source], priority=priority, user_id=user_id)
+        return pdfs[0]
+
+    async def get_pdfs(
+        self,
+        latex_sources: List[LaTeXDocument],
+        priority: CompilePriority = CompilePriority.DOWNLOAD,
+        user_id: Optional[str] = None
+    ) -> List[bytes]:
+        """
+        Get PDFs for several sources (e.g. an application packet), compiling
+        the uncached ones together as a single job.
+        """
+        cache_keys = [LaTeXLocalCompiler.cache_key(source) for source in latex_sources]
+        pdfs: List[Optional[bytes]] = [self.cache.get(cache_key) for cache_key in cache_keys]
+
+        missing = [index for index, pdf_bytes in enumerate(pdfs) if pdf_bytes is None]
+        if missing:
+            compiler = LaTeXLocalCompiler()
+            compiled = await compiler.compile_documents_to_pdf(
+                [latex_sources[index] for index in missing], priority=priority, user_id=user_id
+            )
+            for index, pdf_bytes in zip(missing, compiled):
+                self.cache.put(cache_keys[index], pdf_bytes)
+                pdfs[index] = pdf_bytes
+
+        return pdfs
+
+    async def _render(self, latex_sources: List[str], user_id: Optional[str]) -> None:
+        """Compile into the cache; failures are logged and left to on-demand compile"""
+        try:
+            await self.get_pdfs(latex_sources, priority=CompilePriority.BACKGROUND, user_id=user_id)
+            logger.info(f"Background render of {len(latex_sources)} PDF(s) finished")
+        except Exception as e:
+            logger.warning(f"Background PDF render failed: {str(e)}")
+
+
+_prerenderer: Optional[PDFPrerenderer] = None
+
+
+def get_pdf_prerenderer() -> PDFPrerenderer:
+    """Get the process-wide pre-renderer (toggled by PDF_PRERENDER_ENABLED)"""
+    global _prerenderer
+    if _prerenderer is None:
+        enabled = os.getenv("PDF_PRERENDER_ENABLED", "true").lower() != "false"
+        _prerenderer = PDFPrerenderer(get_pdf_cache(), enabled=enabled)
+    return _prerenderer
@@ -0,0 +1,169 @@
+"""
+PDF Page Rasterizer
+Renders compiled resume pages to PNG previews and thumbnails with pdftoppm
+"""
+
+import os
+import shutil
+import asyncio
+import hashlib
+import functools
+import subprocess
+import logging
+from typing import Dict, Optional
+
+from .compile_scheduler import CompilePriority, CompileJob, get_compile_scheduler
+from .latex_workspace import get_workspace_pool
+from .pdf_cache import PDFCache
+
+logger = logging.getLogger(__name__)
+
+# Full-page preview and list/grid thumbnail resolutions
+PREVIEW_DPI = int(os.getenv("PREVIEW_DPI", "110"))
+THUMBNAIL_DPI = int(os.getenv("THUMBNAIL_DPI", "36"))
+MAX_DPI = 300
+
+
+class PageNotFound(Exception):
+    """Raised when the requested page is beyond the end of the PDF"""
+
+
+class PDFRasterizer:
+    """
+    Rasterizes PDF pages to PNG, once per (PDF, page, DPI).
+
+    Images are cached by a hash of the PDF's own cache key together with the
+    page and resolution, so an image is rendered once per resume version and
+    the same key doubles as its ETag. Rendering runs on the compile scheduler
+    like pdflatex, and concurrent requests for the same image share one run.
+    """
+
+    RASTERIZE_TIMEOUT = int(os.getenv("PDF_RASTERIZE_TIMEOUT", "20"))
+
+    # Bump when rasterizer flags change so stale images are not served
+    RASTERIZER_VERSION = "pdftoppm-1"
+
+    def __init__(self, cache: PDFCache, pdftoppm_path: Optional[str] = None):
+        """
+        Initialize rasterizer.
+
+        Args:
+            cache: Cache that receives the rendered PNGs
+            pdftoppm_path: Path to pdftoppm executable (auto-detected if not provided)
+        """
+        self.cache = cache
+        self.pdftoppm_path = pdftoppm_path or shutil.which("pdftoppm") or "/usr/bin/pdftoppm"
+        # Renders in progress by image key
+        self._inflight: Dict[str, CompileJob] = {}
+
+    @classmethod
+    def image_key(cls, pdf_key: str, page: int, dpi: int) -> str:
+        """Content hash identifying one rendered page of a PDF"""
+        digest = hashlib.sha256()
+        digest.update(f"{cls.RASTERIZER_VERSION}\0{pdf_key}\0{page}\0{dpi}".encode('utf-8'))
+        return digest.hexdigest()
+
+    async def render_png(
+        self,
+        pdf_key: str,
+        pdf_bytes: bytes,
+        page: int,
+        dpi: int,
+        priority: CompilePriority = CompilePriority.INTERACTIVE,
+        user_id: Optional[str] = None
+    ) -> bytes:
+        """
+        Get page `page` (1-based) of a PDF as PNG, rendering it if not cached.
+
+        Args:
+            pdf_key: Cache key of the PDF (LaTeXLocalCompiler.cache_key of its source)
+            pdf_bytes: The PDF itself
+            page: 1-based page number
+            dpi: Output resolution
+            priority: Priority class of the request
+            user_id: Requesting user, for fairness between users
+
+        Returns:
+            PNG file as bytes
+
+        Raises:
+            PageNotFound: If the PDF has fewer than `page` pages
+            LaTeXCompilerBusy: If the compile queue is full
+            Exception: If rendering fails
+        """
+        key = self.image_key(pdf_key, page, dpi)
+
+        png_bytes = self.cache.get(key)
+        if png_bytes is not None:
+            return png_bytes
+
+        scheduler = get_compile_scheduler()
+        job = self._inflight.get(key)
+        if job is None:
+            get_workspace_pool()
+            job = scheduler.submit(
+                functools.partial(self._rasterize_blocking, pdf_bytes, page, dpi),
+                priority=priority,
+                user_id=user_id
+            )
+            self._inflight[key] = job
+            job.future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            scheduler.promote(job, priority)
+
+        png_bytes = await asyncio.shield(job.future)
+        self.cache.put(key, png_bytes)
+        return png_bytes
+
+    def _rasterize_blocking(self, pdf_bytes: bytes, page: int, dpi: int) -> bytes:
+        """Run pdftoppm synchronously (called on the compile executor)"""
+        with get_workspace_pool().workspace() as temp_path:
+            pdf_file = temp_path / "input.pdf"
+            pdf_file.write_bytes(pdf_bytes)
+            output_prefix = temp_path / "page"
+
+            command = [
+                self.pdftoppm_path,
+                '-png',
+                '-r', str(dpi),
+                '-f', str(page),
+                '-l', str(page),
+                '-singlefile',
+                str(pdf_file),
+                str(output_prefix)
+            ]
+
+            try:
+                result = subprocess.run(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    timeout=self.RASTERIZE_TIMEOUT
+                )
+            except subprocess.TimeoutExpired:
+                raise Exception(f"PDF rasterization timed out ({self.RASTERIZE_TIMEOUT}s)")
+
+            png_file = temp_path / "page.png"
+            if png_file.exists():
+                png_bytes = png_file.read_bytes()
+                logger.info(f"Rasterized PDF page {page} at {dpi} DPI ({len(png_bytes)} bytes)")
+                return png_bytes
+
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            # pdftoppm exits non-zero and writes nothing for an out-of-range page
+            if "Wrong page range" in stderr or "first page" in stderr.lower():
+                raise PageNotFound(f"Page {page} does not exist")
+            raise Exception(f"PDF rasterization failed: {stderr.strip() or result.returncode}")
+
+
+_rasterizer: Optional[PDFRasterizer] = None
+
+
+def get_pdf_rasterizer() -> PDFRasterizer:
+    """Get the process-wide rasterizer (image cache size set by PREVIEW_CACHE_MAX_MB)"""
+    global _rasterizer
+    if _rasterizer is None:
+        max_mb = float(os.getenv("PREVIEW_CACHE_MAX_MB", "32"))
+        _rasterizer = PDFRasterizer(PDFCache(max_bytes=int(max_mb * 1024 * 1024)))
+        logger.info(f"PDF rasterizer initialized (image cache {max_mb} MB)")
+    return _rasterizer
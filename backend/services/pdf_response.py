@@ -0,0 +1,126 @@
+"""
+PDF HTTP Responses
+Streams stored or cached PDFs with conditional request and byte-range support
+"""
+
+import re
+from typing import Dict, Iterator, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+_BYTE_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header lies entirely outside the content"""
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against a strong ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range into inclusive (start, end) offsets.
+
+    Returns None when the whole body should be sent: no header, a header we
+    don't understand, or a multi-range request (servers may ignore those).
+
+    Raises:
+        RangeNotSatisfiable: If the range starts beyond the end of the content
+    """
+    if not range_header:
+        return None
+
+    match = _BYTE_RANGE.match(range_header)
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def _iter_chunks(view: memoryview) -> Iterator[memoryview]:
+    """Yield slices of the buffer without copying it"""
+    for offset in range(0, len(view), CHUNK_SIZE):
+        yield view[offset:offset + CHUNK_SIZE]
+
+
+def build_pdf_response(
+    pdf_bytes: bytes,
+    etag: str,
+    headers: Dict[str, str],
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None
+) -> Response:
+    """
+    Stream a PDF, honoring Range/If-Range.
+
+    The body is sent as memoryview slices of the cached bytes, so serving a
+    download (or part of one) never makes another full copy of the PDF.
+
+    Args:
+        pdf_bytes: Complete PDF
+        etag: Strong ETag of the PDF
+        headers: Extra headers (Content-Disposition, Cache-Control, ...)
+        range_header: Value of the Range request header
+        if_range: Value of the If-Range request header
+
+    Returns:
+        200, 206 or 416 response
+    """
+    size = len(pdf_bytes)
+    response_headers = {**headers, "ETag": etag, "Accept-Ranges": "bytes"}
+
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=416,
+            headers={**response_headers, "Content-Range": f"bytes */{size}"}
+        )
+
+    view = memoryview(pdf_bytes)
+    if byte_range is None:
+        return StreamingResponse(
+            _iter_chunks(view),
+            media_type="application/pdf",
+            headers={**response_headers, "Content-Length": str(size)}
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        _iter_chunks(view[start:end + 1]),
+        status_code=206,
+        media_type="application/pdf",
+        headers={
+            **response_headers,
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1)
+        }
+    )
@@ -0,0 +1,38 @@
+"""
+Profile LaTeX Fragments
+LaTeX for the untailored profile sections, rendered when the profile is saved
+"""
+
+from typing import Any, Dict, Optional
+
+# Field on the master profile document holding the fragments
+FRAGMENTS_FIELD = "latexFragments"
+
+# Bump when the skills/education/certifications formatters change, so
+# fragments stored by the old code are ignored until re-rendered (2: fragments
+# stored before update keys were checked could carry client-supplied LaTeX)
+FRAGMENTS_VERSION = "2"
+
+
+def stored_fragments(profile: Dict[str, Any], template_id: str) -> Optional[Dict[str, str]]:
+    """
+    Fragments stored on the profile for a template, if still current.
+
+    updatedAt is the invalidation key: fragments are stamped with the
+    profile's updatedAt when stored, and every profile write sets a new one,
+    so a mismatch means the profile changed since they were rendered. That
+    is one comparison per generation, where hashing the skills, education
+    and certifications would cost more than rendering them. Fragments of
+    another FRAGMENTS_VERSION are stale too.
+
+    Returns:
+        Placeholder name -> LaTeX, or None if missing or stale
+    """
+    fragments = profile.get(FRAGMENTS_FIELD)
+    if not isinstance(fragments, dict):
+        return None
+    if fragments.get("version") != FRAGMENTS_VERSION:
+        return None
+    if fragments.get("profileUpdatedAt") is None or fragments.get("profileUpdatedAt") != profile.get("updatedAt"):
+        return None
+    return fragments.get("templates", {}).get(template_id)
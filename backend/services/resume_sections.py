@@ -0,0 +1,186 @@
+"""
+Resume Section Model
+The resume content laid out by every renderer: the LaTeX generators and the HTML preview
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+def _date_range(start: str, end: str, separator: str) -> str:
+    """Dates as "start<separator>end", or just end without a start"""
+    return f"{start}{separator}{end}" if start else end
+
+
+class HeaderSection(NamedTuple):
+    """Name and contact line"""
+    full_name: str
+    location: str
+    email: str
+    phone: str
+    linkedin_url: str
+    portfolio_url: str
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, Any]) -> "HeaderSection":
+        personal_info = profile.get('personalInfo', {})
+        location = personal_info.get('location', {})
+        return cls(
+            f"{personal_info.get('firstName', '')} {personal_info.get('lastName', '')}",
+            f"{location.get('city', '')}, {location.get('country', '')}",
+            personal_info.get('email') or '',
+            personal_info.get('phone') or '',
+            personal_info.get('linkedinUrl') or '',
+            personal_info.get('portfolioUrl') or '',
+        )
+
+
+class ExperienceEntry(NamedTuple):
+    """One position, with its (tailored) bullets"""
+    job_title: str
+    company: str
+    location: str
+    start_date: str
+    end_date: str
+    # As stored (not copied); renderers treat missing bullets as empty
+    bullets: List[str]
+
+    @property
+    def date_range(self) -> str:
+        """Dates with a TeX en dash ("--")"""
+        return f"{self.start_date} -- {self.end_date}" if self.start_date else self.end_date
+
+    def dates(self, separator: str) -> str:
+        return _date_range(self.start_date, self.end_date, separator)
+
+    @classmethod
+    def from_dict(cls, exp: Dict[str, Any]) -> "ExperienceEntry":
+        """Build from a profile experience merged with its tailored entry"""
+        return cls(
+            exp.get('jobTitle') or '',
+            exp.get('companyName') or '',
+            exp.get('location') or '',
+            exp.get('startDate') or '',
+            exp.get('endDate', 'Present') or '',
+            exp.get('tailored_bullets', exp.get('responsibilities', [])),
+        )
+
+
+class EducationEntry(NamedTuple):
+    """One degree"""
+    institution: str
+    location: str
+    degree: str
+    field_of_study: str
+    # Only set when the end year is too; a lone start year isn't shown
+    start_year: str
+    end_year: str
+
+    @property
+    def degree_text(self) -> str:
+        return f"{self.degree} in {self.field_of_study}" if self.field_of_study else self.degree
+
+    @property
+    def date_range(self) -> str:
+        """Years with a TeX en dash ("--")"""
+        return self.dates(" -- ")
+
+    def dates(self, separator: str) -> str:
+        return _date_range(self.start_year, self.end_year, separator)
+
+    @classmethod
+    def from_dict(cls, edu: Dict[str, Any]) -> "EducationEntry":
+        start_year = edu.get('startYear') or ''
+        end_year = edu.get('endYear') or ''
+        return cls(
+            edu.get('institution') or '',
+            edu.get('location') or '',
+            edu.get('degree') or '',
+            edu.get('fieldOfStudy') or '',
+            start_year if end_year else '',
+            end_year,
+        )
+
+
+class CertificationEntry(NamedTuple):
+    """One certification"""
+    name: str
+    organization: str
+    year: str
+
+    @classmethod
+    def from_dict(cls, cert: Dict[str, Any]) -> "CertificationEntry":
+        return cls(
+            cert.get('name') or '',
+            cert.get('issuingOrganization') or '',
+            cert.get('issueYear') or '',
+        )
+
+
+class ResumeSections(NamedTuple):
+    """
+    Everything a resume shows, in display order, as plain (unescaped) text.
+
+    Built once from the master profile and the tailored content; renderers
+    only decide markup, so the LaTeX output and the HTML preview can't
+    disagree about what goes where. Tuples rather than pydantic models, since
+    they are built on every generation.
+    """
+    header: HeaderSection
+    summary: str
+    experiences: List[ExperienceEntry]
+    education: List[EducationEntry]
+    skills: List[str]
+    certifications: List[CertificationEntry]
+
+    @classmethod
+    def from_profile(
+        cls,
+        profile: Dict[str, Any],
+        tailored_content: Optional[Dict[str, Any]] = None
+    ) -> "ResumeSections":
+        """
+        Lay out a profile, overlaid with tailored content if given.
+
+        Args:
+            profile: Master profile dictionary
+            tailored_content: AI-tailored resume content (optional)
+        """
+        return cls(
+            HeaderSection.from_profile(profile),
+            summary_text(profile, tailored_content),
+            experience_entries(profile.get('workExperience', []), tailored_content),
+            **profile_only_sections(profile),
+        )
+
+
+def summary_text(profile: Dict[str, Any], tailored_content: Optional[Dict[str, Any]]) -> str:
+    """The tailored summary, or the profile's own without tailored content"""
+    if tailored_content:
+        return tailored_content.get('tailored_summary') or ''
+    return profile.get('professionalSummary') or ''
+
+
+def merge_experiences(work_experience: List, tailored_content: Optional[Dict[str, Any]]) -> List:
+    """Overlay tailored entries onto the profile's experiences, by position"""
+    experiences = list(work_experience)
+    if tailored_content and 'tailored_experience' in tailored_content:
+        tailored_exp = tailored_content['tailored_experience']
+        for i, exp in enumerate(experiences):
+            if i < len(tailored_exp):
+                if isinstance(tailored_exp[i], dict):
+                    experiences[i] = {**exp, **tailored_exp[i]}
+    return experiences
+
+
+def experience_entries(work_experience: List, tailored_content: Optional[Dict[str, Any]]) -> List[ExperienceEntry]:
+    """Experience entries of a profile, overlaid with tailored content"""
+    return [ExperienceEntry.from_dict(exp) for exp in merge_experiences(work_experience, tailored_content)]
+
+
+def profile_only_sections(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """The sections that don't depend on the job: education, skills, certifications"""
+    return {
+        'education': [EducationEntry.from_dict(edu) for edu in profile.get('education', [])],
+        'skills': [skill.get('name') or '' for skill in profile.get('skills', [])],
+        'certifications': [CertificationEntry.from_dict(cert) for cert in profile.get('certifications', [])],
+    }
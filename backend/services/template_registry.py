@@ -0,0 +1,158 @@
+"""
+LaTeX Template Registry
+Discovers, preloads and hot-reloads the templates under backend/template
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .latex_template import CompiledTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "template"
+DEFAULT_RESUME_TEMPLATE = "template1"
+
+# Template ids are file stems; anything else could escape the template dir
+_TEMPLATE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class TemplateNotFound(Exception):
+    """Raised when no template exists for an id"""
+
+
+class _Entry:
+    """A loaded template and the file state it was loaded from"""
+
+    def __init__(self, path: Path, template: CompiledTemplate, mtime_ns: int, size: int, digest: str):
+        self.path = path
+        self.template = template
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.checked_at = time.monotonic()
+
+
+class TemplateRegistry:
+    """
+    Compiled templates by id (the file name without .tex).
+
+    All templates are parsed up front by preload(). Afterwards get() serves
+    the in-memory template and stats its file at most once per
+    `check_interval` seconds; the file is only reread when its mtime or size
+    changed, and only recompiled when its content hash changed. Requests
+    therefore never read template files from disk.
+    """
+
+    def __init__(self, template_dir: Path, check_interval: float = 2.0):
+        """
+        Initialize template registry.
+
+        Args:
+            template_dir: Directory containing the .tex templates
+            check_interval: Minimum seconds between change checks of a template
+        """
+        self.template_dir = Path(template_dir)
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def preload(self) -> List[str]:
+        """Discover and compile every template in the directory; returns their ids"""
+        for path in sorted(self.template_dir.glob("*.tex")):
+            try:
+                self.get(path.stem)
+            except Exception as e:
+                logger.error(f"Failed to load template {path}: {str(e)}")
+        return self.template_ids()
+
+    def template_ids(self) -> List[str]:
+        """Ids of the loaded templates"""
+        return sorted(self._entries)
+
+    def resume_template_ids(self) -> List[str]:
+        """Ids of loaded templates that lay out a resume (have an EXPERIENCES slot)"""
+        return sorted(
+            template_id for template_id, entry in self._entries.items()
+            if "EXPERIENCES" in entry.template.placeholders
+        )
+
+    def path(self, template_id: str) -> Path:
+        """File a template id maps to"""
+        if not _TEMPLATE_ID.match(template_id):
+            raise TemplateNotFound(f"Invalid template id: {template_id}")
+        return self.template_dir / f"{template_id}.tex"
+
+    def get(self, template_id: str) -> CompiledTemplate:
+        """
+        Get the compiled template for an id, reloading it if the file changed.
+
+        Raises:
+            TemplateNotFound: If there is no such template
+        """
+        entry = self._entries.get(template_id)
+        if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return entry.template
+
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+                return entry.template
+            return self._refresh(template_id, entry).template
+
+    def _refresh(self, template_id: str, entry: Optional[_Entry]) -> _Entry:
+        """(Re)load a template if its file changed since entry was loaded"""
+        path = self.path(template_id)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            if entry is not None:
+                # Keep serving the last good version rather than failing requests
+                logger.warning(f"Template {path} disappeared, keeping the loaded version")
+                entry.checked_at = time.monotonic()
+                return entry
+            raise TemplateNotFound(f"Template not found: {template_id}")
+
+        if entry is not None and (stat.st_mtime_ns, stat.st_size) == (entry.mtime_ns, entry.size):
+            entry.checked_at = time.monotonic()
+            return entry
+
+        source = path.read_text(encoding='utf-8')
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+        if entry is not None and digest == entry.digest:
+            # Touched but unchanged; keep the compiled plan
+            template = entry.template
+        else:
+            template = CompiledTemplate(source, path=str(path))
+            action = "Reloaded" if entry is not None else "Loaded"
+            logger.info(f"{action} LaTeX template {template_id} ({len(template.slots)} placeholders)")
+
+        entry = _Entry(path, template, stat.st_mtime_ns, stat.st_size, digest)
+        self._entries[template_id] = entry
+        return entry
+
+
+_registry: Optional[TemplateRegistry] = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """
+    Get the process-wide template registry.
+
+    Reads templates from LATEX_TEMPLATE_DIR (default: backend/template) and
+    checks them for changes at most every TEMPLATE_RELOAD_INTERVAL seconds
+    (default: 2).
+    """
+    global _registry
+    if _registry is None:
+        template_dir = Path(os.getenv("LATEX_TEMPLATE_DIR", str(DEFAULT_TEMPLATE_DIR)))
+        check_interval = float(os.getenv("TEMPLATE_RELOAD_INTERVAL", "2"))
+        _registry = TemplateRegistry(template_dir, check_interval=check_interval)
+    return _registry